@@ -0,0 +1,6 @@
+from codemods.manifest import run_script
+
+# Coalesce and briefly cache API GETs in apiClient.ts, and route the
+# dashboard's own fetch wrapper through the same cache; logging out clears it.
+# The patches themselves are declared in patches.toml.
+run_script('add_api_cache.py')
@@ -0,0 +1,40 @@
+import argparse
+import contextlib
+import sys
+
+from codemods.cache import Cache
+from codemods.manifest import MANIFEST_PATH, build_plan, execute_plan, iter_plan, load_manifest, report, select
+from codemods.preflight import run_preflight
+from codemods.runner import stream_diffs
+
+# Apply every patch in patches.toml (or only those of the given scripts),
+# reading and writing each target file once. With --preflight, only check
+# that every patch anchor is still found and exit non-zero if any is missing.
+# With --dry-run, stream a unified diff of every change to stdout and the
+# change statistics to stderr without writing anything.
+
+parser = argparse.ArgumentParser(description='Apply the patches declared in the patch manifest.')
+parser.add_argument('scripts', nargs='*', help='only apply patches from these scripts, e.g. compact_cards.py')
+parser.add_argument('--manifest', default=MANIFEST_PATH)
+parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+parser.add_argument('--cache-dir', default=None, help='cache directory (default: $CODEMODS_CACHE_DIR or .codemods-cache)')
+parser.add_argument('--no-cache', action='store_true', help='transform every file even if it was seen before')
+parser.add_argument('--dry-run', action='store_true', help='print a unified diff instead of writing')
+parser.add_argument('--preflight', action='store_true', help='check every anchor without changing any file')
+args = parser.parse_args()
+
+patches = select(load_manifest(args.manifest), args.scripts)
+plan = build_plan(patches)
+print(f"{len(patches)} patches over {len(plan)} files", file=sys.stderr if args.dry_run else sys.stdout)
+
+cache = None if args.no_cache else Cache(args.cache_dir)
+if args.preflight:
+    sys.exit(1 if run_preflight(plan, jobs=args.jobs, cache=cache) else 0)
+
+if args.dry_run:
+    outcomes = stream_diffs(iter_plan(plan, write=False, jobs=args.jobs, cache=cache, diff=True))
+    with contextlib.redirect_stdout(sys.stderr):
+        report(patches, outcomes, dry_run=True)
+    sys.exit(0)
+
+report(patches, execute_plan(plan, jobs=args.jobs, cache=cache))
@@ -0,0 +1,12 @@
+# Shared helpers for the patch scripts in the repository root.
+#
+# The scripts are run from the repository root (e.g. `python compact_cards.py`),
+# so this package is importable without any install step.
+
+from .rewrite import Rewriter, compile_sequential, rewrite
+
+__all__ = [
+    'Rewriter',
+    'compile_sequential',
+    'rewrite',
+]
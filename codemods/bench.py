@@ -0,0 +1,456 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from .cache import Cache
+from .index import build_index
+from .manifest import MANIFEST_PATH, build_plan, execute_plan, load_manifest, select, transform
+from .preflight import ANCHOR_FIELDS, check
+from .rewrite import Rewriter, rewrite
+from .runner import unified_diff
+from .structural import delete_block
+from .tsx import bracket_pairs, tokenize
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Benchmarks for the codemod engine.
+#
+#   python -m codemods.bench [--quick] [--only SUBSTRING] [--output FILE]
+#
+# Fixtures are synthetic TSX generated from a seed, shaped like the real hot
+# targets: hook density and the share of JSX elements with a style object are
+# measured from ProjectBoard.tsx and EventModal.tsx when they exist.
+#
+#   script:*   each script's patches over fixtures the size of those files and
+#              over a 100k-line one, with the script's anchors seeded in so
+#              its steps have work to do
+#   engine:*   the shared primitives (rewrite, tokenizer, index, preflight,
+#              diff) on the 100k-line fixture
+#   tree:*     a whole run over a 10k-file tree, with a cold and a warm cache
+#
+# --quick shrinks the 100k-line fixture and the 10k-file tree tenfold.
+#
+# Each benchmark runs in a forked child so its peak RSS is its own. Results
+# are appended to a JSON-lines file, one record per benchmark, for tracking
+# regressions between commits.
+
+RESULTS_PATH = 'bench-results.jsonl'
+
+# name -> (path of the real file it imitates, lines)
+SHAPES = {
+    'ProjectBoard': ('src/pages/Projects/board/ProjectBoard.tsx', 1282),
+    'EventModal': ('src/pages/Dashboard/components/calendar/EventModal.tsx', 4143),
+}
+LARGE_LINES = 100_000
+TREE_FILES = 10_000
+
+# Used when the real file is not there to be measured
+DEFAULT_PROFILE = {'hooks_per_line': 0.02, 'style_ratio': 0.6}
+
+_CLASSES = [
+    'flex items-center gap-2', 'text-[13px] text-[#6B7280]', 'px-3 py-1.5 rounded-md',
+    'w-full border border-[#E5E7EB]', 'grid grid-cols-2 gap-4', 'text-[11px] font-medium text-[#0066FF]',
+    'hover:bg-[#F9FAFB] transition-colors', 'absolute top-4 right-4', 'max-w-7xl mx-auto px-8 py-6',
+]
+_TAGS = ['div', 'span', 'button', 'p', 'label', 'input', 'section', 'Badge', 'Tooltip', 'Icon']
+_STYLE_KEYS = [
+    ("display", "'flex'"), ("alignItems", "'center'"), ("gap", "'8px'"), ("padding", "'6px 12px'"),
+    ("fontSize", "'13px'"), ("color", "'#6B7280'"), ("background", "isActive ? '#F0F9FF' : 'white'"),
+    ("borderRadius", "'6px'"), ("border", "'1px solid #E5E7EB'"), ("cursor", "'pointer'"),
+]
+
+
+def profile(path):
+    # Densities of the file at `path`, or the defaults when it is missing
+    try:
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return dict(DEFAULT_PROFILE)
+
+    lines = max(1, text.count('\n'))
+    index = build_index(text)
+    hooks = sum(len(nodes) for (scope, kind, _), nodes in index.nodes.items() if scope is None and kind.startswith('use'))
+    elements = sum(len(nodes) for (scope, kind, _), nodes in index.nodes.items() if scope is None and kind == 'jsx')
+    return {
+        'hooks_per_line': hooks / lines,
+        'style_ratio': min(1.0, text.count('style={{') / max(1, elements)),
+    }
+
+
+class _Writer:
+    def __init__(self, rng, shape):
+        self.rng = rng
+        self.shape = shape
+        self.lines = []
+
+    def emit(self, depth, text):
+        self.lines.append('  ' * depth + text)
+
+    def element(self, depth, budget):
+        # One JSX element with children; returns the lines it used
+        rng = self.rng
+        start = len(self.lines)
+        tag = rng.choice(_TAGS)
+        if rng.random() < self.shape['style_ratio']:
+            self.emit(depth, f'<{tag}')
+            self.emit(depth + 1, 'style={{')
+            for key, value in rng.sample(_STYLE_KEYS, rng.randint(2, 6)):
+                self.emit(depth + 2, f'{key}: {value},')
+            self.emit(depth + 1, '}}')
+            self.emit(depth + 1, f"onClick={{() => handle{rng.randint(0, 9)}('{{id}}')}}")
+            self.emit(depth, '>')
+        else:
+            self.emit(depth, f'<{tag} className="{rng.choice(_CLASSES)}">')
+
+        remaining = budget - (len(self.lines) - start) - 1
+        while remaining > 0:
+            roll = rng.random()
+            if roll < 0.4 and remaining > 4 and depth < 12:
+                remaining -= self.element(depth + 1, min(remaining, rng.randint(3, 30)))
+            elif roll < 0.5 and remaining > 6 and depth < 12:
+                self.emit(depth + 1, '{items.map((item) => (')
+                used = self.element(depth + 2, min(remaining - 2, rng.randint(3, 12)))
+                self.emit(depth + 1, '))}')
+                remaining -= used + 2
+            elif roll < 0.6 and remaining > 5 and depth < 12:
+                self.emit(depth + 1, f'{{show{rng.randint(0, 9)} && (')
+                used = self.element(depth + 2, min(remaining - 2, rng.randint(3, 10)))
+                self.emit(depth + 1, ')}')
+                remaining -= used + 2
+            else:
+                self.emit(depth + 1, rng.choice([
+                    '{item.title}', 'Drag tasks here to get started', '{`${count} of ${total}`}',
+                    "{label || 'Untitled'}", '{/* braces in text: { } */}',
+                ]))
+                remaining -= 1
+        self.emit(depth, f'</{tag}>')
+        return len(self.lines) - start
+
+    def component(self, name, size):
+        rng = self.rng
+        start = len(self.lines)
+        props = [f'prop{index}' for index in range(rng.randint(3, 12))]
+        self.emit(0, f'interface {name}Props {{')
+        for prop in props:
+            self.emit(1, f'{prop}{"?" if rng.random() < 0.3 else ""}: {rng.choice(["string", "number", "boolean", "(id: string) => void"])};')
+        self.emit(0, '}')
+        self.emit(0, '')
+        self.emit(0, f'export function {name}({{ {", ".join(props)} }}: {name}Props) {{')
+
+        for index in range(max(1, round(size * self.shape['hooks_per_line']))):
+            self.emit(1, f"const [value{index}, setValue{index}] = useState<string | null>(null);")
+        self.emit(1, 'useEffect(() => {')
+        self.emit(2, "const saved = localStorage.getItem(`board-${projectName}`);")
+        self.emit(2, 'if (saved) { setValue0(JSON.parse(saved)); }')
+        self.emit(1, '}, [projectName]);')
+        self.emit(0, '')
+        for index in range(rng.randint(1, 4)):
+            self.emit(1, f'const handle{index} = (id: string) => {{')
+            self.emit(2, "if (!id) return;")
+            self.emit(2, f"const pattern = /[{{}}]+/g;")
+            self.emit(2, f"setValue0(id.replace(pattern, '') + '}}');")
+            self.emit(1, '};')
+            self.emit(0, '')
+
+        self.emit(1, 'return (')
+        while len(self.lines) - start < size - 3:
+            self.element(2, min(size - 3 - (len(self.lines) - start), rng.randint(10, 80)))
+        self.emit(1, ');')
+        self.emit(0, '}')
+        self.emit(0, '')
+        return len(self.lines) - start
+
+
+def synthetic_tsx(lines, seed=0, shape=None):
+    # Seeded synthetic TSX of roughly `lines` lines
+    rng = random.Random(seed)
+    writer = _Writer(rng, shape or DEFAULT_PROFILE)
+    writer.emit(0, "import React, { useState, useEffect, useRef } from 'react';")
+    writer.emit(0, "import { Plus, MoreVertical, X } from 'lucide-react';")
+    writer.emit(0, "import { Button } from '../ui/button';")
+    writer.emit(0, '')
+    number = 0
+    while len(writer.lines) < lines:
+        writer.component(f'Component{number}', min(lines - len(writer.lines) + 8, rng.randint(80, 600)))
+        number += 1
+    return '\n'.join(writer.lines) + '\n'
+
+
+def anchors_of(patches):
+    anchors = []
+    for patch in patches:
+        for step in patch['step']:
+            anchors.extend(step[field] for field in ANCHOR_FIELDS if step.get(field))
+    return list(dict.fromkeys(anchors))
+
+
+def seed_anchors(text, anchors, every=1000):
+    # Insert every anchor once per `every` lines, between top-level blocks
+    lines = text.split('\n')
+    pieces = []
+    for start in range(0, len(lines), every):
+        chunk = lines[start:start + every]
+        pieces.append('\n'.join(chunk))
+        pieces.extend(anchors)
+    return '\n'.join(pieces)
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _best_of(repeat, function):
+    best = None
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def _timed(name, repeat, setup, size_bytes=None, files=1, lines=None):
+    # Build the benchmark with setup() -> (function, size_bytes, lines[,
+    # teardown]), time it, then run the teardown if there is one
+    function, measured_bytes, measured_lines, *teardown = setup()
+    try:
+        seconds, _ = _best_of(repeat, function)
+    finally:
+        for done in teardown:
+            done()
+    size_bytes = measured_bytes if size_bytes is None else size_bytes
+    return {
+        'benchmark': name,
+        'files': files,
+        'lines': measured_lines if lines is None else lines,
+        'bytes': size_bytes,
+        'seconds': round(seconds, 6),
+        'mb_per_s': round(size_bytes / seconds / 1e6, 3) if seconds else None,
+        'files_per_s': round(files / seconds, 1) if seconds else None,
+    }
+
+
+# Benchmark definitions. Each returns a list of (name, setup, kwargs) where
+# setup() runs in the child and returns (function, bytes, lines), plus a
+# teardown function when it leaves something to clean up.
+
+def _script_benchmarks(patches, shapes, large_lines):
+    sizes = [(name, lines, shapes[name]) for name, (_, lines) in SHAPES.items()]
+    sizes.append(('large', large_lines, shapes['EventModal']))
+    benchmarks = []
+    for script in dict.fromkeys(patch['script'] for patch in patches):
+        script_patches = select(patches, [script])
+        for label, lines, shape in sizes:
+            def setup(script_patches=script_patches, lines=lines, shape=shape):
+                text = seed_anchors(synthetic_tsx(lines, seed=lines, shape=shape), anchors_of(script_patches))
+                return (lambda: transform(text, script_patches)), len(text.encode('utf-8')), text.count('\n')
+            benchmarks.append((f'script:{script}:{label}', setup, {}))
+    return benchmarks
+
+
+def _engine_benchmarks(patches, shapes, large_lines):
+    pairs = [
+        (step['old'], step['new']) for patch in patches for step in patch['step']
+        if step['op'] == 'replace' and 'unless' not in step
+    ]
+    anchors = anchors_of(patches)
+
+    def fixture():
+        text = seed_anchors(synthetic_tsx(large_lines, seed=1, shape=shapes['EventModal']), anchors, every=5000)
+        return text, len(text.encode('utf-8')), text.count('\n')
+
+    def chained(text):
+        for old, new in pairs:
+            text = text.replace(old, new)
+        return text
+
+    def edited(text):
+        lines = text.split('\n')
+        for index in range(0, len(lines), 50):
+            lines[index] = lines[index].replace('div', 'section')
+        return '\n'.join(lines)
+
+    def make(body):
+        def setup():
+            text, size, lines = fixture()
+            return body(text), size, lines
+        return setup
+
+    return [
+        ('engine:rewrite', make(lambda text: lambda: rewrite(text, pairs)), {}),
+        ('engine:str_replace_chain', make(lambda text: lambda: chained(text)), {}),
+        ('engine:rewriter_count', make(lambda text: (lambda rewriter: lambda: rewriter.count(text))(
+            Rewriter([(anchor, '') for anchor in anchors]))), {}),
+        ('engine:tokenize', make(lambda text: lambda: sum(1 for _ in tokenize(text))), {}),
+        ('engine:bracket_pairs', make(lambda text: lambda: bracket_pairs(text)), {}),
+        ('engine:build_index', make(lambda text: lambda: build_index(text)), {}),
+        ('engine:delete_block', make(lambda text: lambda: delete_block(text, '  const handle0 = (id: string) =>', trailing=';')), {}),
+        ('engine:preflight_check', make(lambda text: lambda: check(text, patches)), {}),
+        ('engine:unified_diff', make(lambda text: (lambda after: lambda: unified_diff('fixture.tsx', text, after))(edited(text))), {}),
+    ]
+
+
+def _write_tree(root, files, shapes):
+    # A tree of `files` small components; one in ten has a versioned import
+    # for fix_imports to strip. Returns the total size in bytes.
+    total = 0
+    shape_names = list(shapes)
+    for number in range(files):
+        directory = os.path.join(root, 'src', 'pages', f'area{number % 40}')
+        os.makedirs(directory, exist_ok=True)
+        text = synthetic_tsx(120 + (number * 37) % 400, seed=number, shape=shapes[shape_names[number % len(shape_names)]])
+        if number % 10 == 0:
+            text = "import { Slot } from '@radix-ui/react-slot@1.1.2';\n" + text
+        path = os.path.join(directory, f'Component{number}.tsx')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        total += len(text.encode('utf-8'))
+    return total
+
+
+def _tree_benchmarks(patches, shapes, tree_files, jobs):
+    tree_patches = [patch for patch in patches if patch['id'] == 'fix_imports'] or patches[-1:]
+
+    def run(warm):
+        def setup():
+            root = tempfile.mkdtemp(prefix='codemods-bench-')
+            try:
+                size = _write_tree(root, tree_files, shapes)
+                plan = build_plan(tree_patches, root)
+                cache = Cache(os.path.join(root, '.cache')) if warm else None
+                if warm:
+                    execute_plan(plan, root, write=False, jobs=jobs, cache=cache)
+            except BaseException:
+                shutil.rmtree(root, ignore_errors=True)
+                raise
+
+            def body():
+                try:
+                    return execute_plan(plan, root, write=False, jobs=jobs, cache=cache)
+                finally:
+                    if not warm:
+                        shutil.rmtree(os.path.join(root, '.cache'), ignore_errors=True)
+            return body, size, None, lambda: shutil.rmtree(root, ignore_errors=True)
+        return setup
+
+    return [
+        (f'tree:{tree_files}:cold', run(False), {'files': tree_files}),
+        (f'tree:{tree_files}:warm_cache', run(True), {'files': tree_files}),
+    ]
+
+
+def _run_child(connection, name, setup, kwargs, repeat):
+    try:
+        record = _timed(name, repeat, setup, **kwargs)
+        record['peak_rss_kb'] = _peak_rss_kb()
+        connection.send(record)
+    except Exception as e:
+        connection.send({'benchmark': name, 'error': f'{type(e).__name__}: {e}'})
+    finally:
+        connection.close()
+
+
+def run_benchmark(name, setup, kwargs, repeat, fork=True):
+    if fork and 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_run_child, args=(sender, name, setup, kwargs, repeat))
+        process.start()
+        sender.close()
+        try:
+            record = receiver.recv()
+        except EOFError:
+            record = {'benchmark': name, 'error': f'benchmark process exited with {process.exitcode}'}
+        process.join()
+        return record
+
+    record = _timed(name, repeat, setup, **kwargs)
+    # Without fork this is the peak of the whole run so far
+    record['peak_rss_kb'] = _peak_rss_kb()
+    return record
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the codemod engine on synthetic TSX fixtures.')
+    parser.add_argument('--output', default=RESULTS_PATH, help=f'JSON-lines file to append to (default: {RESULTS_PATH})')
+    parser.add_argument('--manifest', default=MANIFEST_PATH)
+    parser.add_argument('--only', action='append', default=[], help='run benchmarks whose name contains this (repeatable)')
+    parser.add_argument('--quick', action='store_true', help='10k-line and 1k-file fixtures instead of 100k and 10k')
+    parser.add_argument('--repeat', type=int, default=3, help='time each benchmark this many times and keep the best')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes for the tree benchmarks')
+    parser.add_argument('--no-fork', action='store_true', help='run everything in this process')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    args = parser.parse_args(argv)
+
+    patches = load_manifest(args.manifest)
+    shapes = {name: profile(path) for name, (path, _) in SHAPES.items()}
+    large_lines = LARGE_LINES // 10 if args.quick else LARGE_LINES
+    tree_files = TREE_FILES // 10 if args.quick else TREE_FILES
+
+    benchmarks = (
+        _engine_benchmarks(patches, shapes, large_lines)
+        + _script_benchmarks(patches, shapes, large_lines)
+        + _tree_benchmarks(patches, shapes, tree_files, args.jobs)
+    )
+    if args.only:
+        benchmarks = [benchmark for benchmark in benchmarks if any(part in benchmark[0] for part in args.only)]
+    if args.list:
+        for name, _, _ in benchmarks:
+            print(name)
+        return 0
+
+    context = {
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'quick': args.quick,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+    failed = 0
+    with open(args.output, 'a', encoding='utf-8') as out:
+        for name, setup, kwargs in benchmarks:
+            record = run_benchmark(name, setup, kwargs, args.repeat, fork=not args.no_fork)
+            record.update(context)
+            out.write(json.dumps(record) + '\n')
+            out.flush()
+
+            if 'error' in record:
+                failed += 1
+                print(f"{name:<55} ERROR {record['error']}")
+            else:
+                print(f"{name:<55} {record['seconds']:>9.4f}s {record['mb_per_s']:>9.2f} MB/s "
+                      f"{record['files_per_s']:>10.1f} files/s {record['peak_rss_kb'] or 0:>8} KB")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,297 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+
+# The ProjectBoard localStorage format, for checking and sizing payloads.
+#
+# ProjectBoard.tsx (emitted by the add_localstorage patch) has stored a
+# board three ways:
+#
+#   legacy   one key per field: workdeck_board_<project>_columns holding the
+#            columns with full task objects, plus _labels, _views, _cardSize
+#   v1       everything under workdeck_board_v1_<project>, tasks still full
+#   v2       workdeck_board_<project>: columns list their task ids in order
+#            and tasks sit in one dictionary keyed by id, without the
+#            fields derived on load (`id` is the key; `color` is the
+#            column's unless it differs)
+#
+# encode() and decode() mirror the TypeScript, and serialize() writes what
+# JSON.stringify would. The tool reads fixtures that are either a
+# localStorage dump (an object of key -> string value, e.g. from
+# `JSON.stringify({...localStorage})`) or a single stored payload, migrates
+# every board found to format 2, checks that decoding gives back the same
+# board, and reports each format's size and parse time.
+#
+#   python -m codemods.boardformat fixtures/board.json
+#   python -m codemods.boardformat dump.json --out compact/
+
+STORAGE_PREFIX = 'workdeck_board_'
+STORAGE_VERSION = 2
+V1_PREFIX = STORAGE_PREFIX + 'v1_'
+LEGACY_FIELDS = ('columns', 'labels', 'views', 'cardSize')
+
+# localStorage allows about 5 MB per origin, counted in UTF-16 code units
+QUOTA = 5 * 1024 * 1024
+
+# Derived on load, so format 2 leaves them out
+DERIVED_TASK_FIELDS = ('id', 'color')
+
+
+class FormatError(Exception):
+    pass
+
+
+@dataclass
+class Measurement:
+    name: str
+    source_format: str
+    tasks: int
+    sizes: dict = field(default_factory=dict)          # format -> bytes
+    parse_ms: dict = field(default_factory=dict)       # format -> median JSON parse time
+    problems: list = field(default_factory=list)
+
+
+def serialize(value):
+    # JSON.stringify(value): no whitespace, non-ASCII kept as is
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+
+
+def encode(board):
+    # Format 2 payload of an expanded board (columns with full tasks); tasks
+    # are keyed by id alone, so an id in two columns is an error (ProjectBoard
+    # saves such a board in format 1)
+    columns = []
+    tasks = {}
+    listed = {}
+    for column in board.get('columns', []):
+        entry = {key: value for key, value in column.items() if key != 'tasks'}
+        entry['taskIds'] = []
+        for task in column.get('tasks', []):
+            if task['id'] in listed:
+                raise FormatError(f"task {task['id']!r} is in columns {listed[task['id']]!r} and {column.get('id')!r}")
+            listed[task['id']] = column.get('id')
+            stored = {key: value for key, value in task.items() if key not in DERIVED_TASK_FIELDS}
+            # Like JSON.stringify, leave out a color that is unset
+            if task.get('color') is not None and task['color'] != column.get('color'):
+                stored['color'] = task['color']
+            entry['taskIds'].append(task['id'])
+            tasks[task['id']] = stored
+        columns.append(entry)
+    views = [view for view in board.get('views', []) if not view.get('isSystem')]
+    return {
+        'version': STORAGE_VERSION,
+        'columns': columns,
+        'tasks': tasks,
+        'labels': board.get('labels', []),
+        'views': views,
+        'cardSize': board.get('cardSize'),
+    }
+
+
+def decode(stored):
+    # The expanded board of a format 2 payload
+    tasks = stored.get('tasks', {})
+    columns = []
+    for entry in stored.get('columns', []):
+        column = {key: value for key, value in entry.items() if key != 'taskIds'}
+        column['tasks'] = [
+            {**tasks[task_id], 'id': task_id, 'color': tasks[task_id].get('color', column.get('color'))}
+            for task_id in entry.get('taskIds', []) if task_id in tasks
+        ]
+        columns.append(column)
+    board = {key: value for key, value in stored.items() if key not in ('version', 'tasks')}
+    board['columns'] = columns
+    return board
+
+
+def validate(stored):
+    # Problems with a format 2 payload, as messages
+    problems = []
+    if stored.get('version') != STORAGE_VERSION:
+        problems.append(f"version is {stored.get('version')!r}, not {STORAGE_VERSION}")
+    tasks = stored.get('tasks', {})
+    listed = {}
+    for column in stored.get('columns', []):
+        for key in ('id', 'name', 'color', 'taskIds'):
+            if key not in column:
+                problems.append(f"column {column.get('id', '?')!r} has no {key}")
+        for task_id in column.get('taskIds', []):
+            if task_id in listed:
+                problems.append(f'task {task_id!r} is in columns {listed[task_id]!r} and {column.get("id")!r}')
+            listed[task_id] = column.get('id')
+            if task_id not in tasks:
+                problems.append(f'task {task_id!r} in column {column.get("id")!r} is missing from tasks')
+    for task_id in tasks.keys() - listed.keys():
+        problems.append(f'task {task_id!r} is in no column')
+    for task_id, task in tasks.items():
+        if 'id' in task:
+            problems.append(f'task {task_id!r} stores its id')
+    return problems
+
+
+def _expanded(board):
+    # A board as format 2 would restore it: custom views only, and every
+    # task with its id and color, the column's when it has none
+    views = [view for view in board.get('views', []) if not view.get('isSystem')]
+    columns = [
+        {**column, 'tasks': [{**task, 'color': column.get('color') if task.get('color') is None else task['color']}
+                             for task in column.get('tasks', [])]}
+        for column in board.get('columns', [])
+    ]
+    return {**board, 'columns': columns, 'views': views, 'labels': board.get('labels', []), 'cardSize': board.get('cardSize')}
+
+
+def migrate(payload):
+    # (expanded board, source format) of a stored payload: a format 1 or 2
+    # object, or a legacy fields dict {'columns': [...], 'labels': ...}
+    if not isinstance(payload, dict):
+        raise FormatError('expected a JSON object')
+    version = payload.get('version')
+    if version == STORAGE_VERSION:
+        return decode(payload), 'v2'
+    if version == 1:
+        return {key: value for key, value in payload.items() if key != 'version'}, 'v1'
+    if version is None and set(payload) & set(LEGACY_FIELDS):
+        return {key: payload[key] for key in LEGACY_FIELDS if key in payload}, 'legacy'
+    raise FormatError(f'unknown board format (version {version!r})')
+
+
+def boards_in_dump(dump):
+    # {project: (payload, source format, original bytes)} from a localStorage
+    # dump; the newest format wins when a project has several
+    found = {}
+    legacy = {}
+    for key, value in dump.items():
+        if not isinstance(key, str) or not key.startswith(STORAGE_PREFIX) or not isinstance(value, str):
+            continue
+        size = len(value.encode('utf-8'))
+        rest = key[len(STORAGE_PREFIX):]
+        for legacy_field in LEGACY_FIELDS:
+            if rest.endswith('_' + legacy_field):
+                project = rest[:-len(legacy_field) - 1]
+                fields, total = legacy.get(project, ({}, 0))
+                fields[legacy_field] = value if legacy_field == 'cardSize' else json.loads(value)
+                legacy[project] = (fields, total + size)
+                break
+        else:
+            if key.startswith(V1_PREFIX):
+                project, rank = key[len(V1_PREFIX):], 1
+            else:
+                project, rank = rest, 2
+            if project not in found or found[project][2] < rank:
+                found[project] = (json.loads(value), size, rank)
+    boards = {project: (payload, size) for project, (payload, size, _) in found.items()}
+    for project, (fields, size) in legacy.items():
+        boards.setdefault(project, (fields, size))
+    return boards
+
+
+def _parse_ms(text, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        json.loads(text)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def measure(name, payload, original_size=None, repeat=5):
+    # Migrate one stored payload to format 2 and check it round-trips
+    board, source = migrate(payload)
+    stored = encode(board)
+    measurement = Measurement(name, source, len(stored['tasks']))
+    # Format 2 input is checked as given; decoding drops what it can't place
+    measurement.problems = validate(payload if source == 'v2' else stored)
+    if _expanded(decode(stored)) != _expanded(board):
+        measurement.problems.append('decoding the format 2 payload does not give back the board')
+
+    texts = {
+        'v1': serialize({'version': 1, **{key: board.get(key) for key in LEGACY_FIELDS}}),
+        'v2': serialize(stored),
+    }
+    if source == 'legacy':
+        texts['legacy'] = serialize(board.get('columns', []))
+    for label, text in texts.items():
+        measurement.sizes[label] = len(text.encode('utf-8'))
+        measurement.parse_ms[label] = _parse_ms(text, repeat)
+    if original_size is not None:
+        measurement.sizes[source] = original_size
+    return measurement, stored
+
+
+def load_fixture(path):
+    # [(name, payload, original bytes)] of a fixture file
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    data = json.loads(text)
+    base = os.path.splitext(os.path.basename(path))[0]
+    if isinstance(data, dict) and any(isinstance(key, str) and key.startswith(STORAGE_PREFIX) for key in data):
+        return [(f'{base}:{project}', payload, size) for project, (payload, size) in sorted(boards_in_dump(data).items())]
+    if isinstance(data, list):
+        # A bare legacy columns value
+        return [(base, {'columns': data}, len(text.encode('utf-8')))]
+    return [(base, data, len(text.encode('utf-8')))]
+
+
+def _kb(size):
+    return f'{size / 1024:.1f} KB'
+
+
+def report(measurements):
+    for m in measurements:
+        sizes = '  '.join(f'{label} {_kb(size)} ({m.parse_ms[label]:.2f} ms)' if label in m.parse_ms else f'{label} {_kb(size)}'
+                          for label, size in m.sizes.items())
+        saved = 1 - m.sizes['v2'] / m.sizes[m.source_format] if m.sizes.get(m.source_format) else 0
+        status = 'ok' if not m.problems else f'{len(m.problems)} problems'
+        print(f"  {m.name}: {m.tasks} tasks, from {m.source_format}  {sizes}  -{saved:.0%}  "
+              f"{m.sizes['v2'] * 2 / QUOTA:.1%} of quota  {status}")
+        for problem in m.problems[:10]:
+            print(f'      {problem}')
+        if len(m.problems) > 10:
+            print(f'      ... {len(m.problems) - 10} more')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Validate ProjectBoard localStorage payloads and measure the compact format.')
+    parser.add_argument('paths', nargs='+', metavar='FILE', help='localStorage dump or stored board payload (JSON)')
+    parser.add_argument('--out', metavar='DIR', help='write each board in format 2 to DIR/<name>.json')
+    parser.add_argument('--repeat', type=int, default=5, help='parse timings to take the median of (default: 5)')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    measurements = []
+    failed = False
+    for path in args.paths:
+        try:
+            fixtures = load_fixture(path)
+        except (OSError, ValueError) as e:
+            print(f'{path}: {e}', file=sys.stderr)
+            failed = True
+            continue
+        for name, payload, size in fixtures:
+            try:
+                measurement, stored = measure(name, payload, size, args.repeat)
+            except (FormatError, KeyError, TypeError, AttributeError) as e:
+                print(f'{name}: {e.__class__.__name__}: {e}', file=sys.stderr)
+                failed = True
+                continue
+            measurements.append(measurement)
+            if args.out:
+                os.makedirs(args.out, exist_ok=True)
+                with open(os.path.join(args.out, name.replace(':', '_') + '.json'), 'w', encoding='utf-8') as f:
+                    f.write(serialize(stored))
+
+    if args.json:
+        json.dump([asdict(m) for m in measurements], sys.stdout, indent=1)
+        print()
+    else:
+        report(measurements)
+    return 1 if failed or any(m.problems for m in measurements) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
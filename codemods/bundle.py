@@ -0,0 +1,340 @@
+import argparse
+import base64
+import gzip
+import json
+import os
+import re
+import sys
+from collections import Counter
+from urllib.parse import unquote
+
+from .graph import package_name
+
+# What `vite build` ships, attributed back to the source.
+#
+# Each .js/.css file under dist/ is split along its source map (build with
+# `vite build --sourcemap`): the bytes from one mapping segment to the next
+# belong to that segment's source, and bytes before a line's first segment
+# or in segments without a source are (unmapped). Sources are reported as
+#
+#   src/pages/Finance/Spending/SpendingApp.tsx     app modules, root-relative
+#   node_modules/recharts                          one entry per npm package
+#   (dist)/assets/index.css                        files without a source map
+#
+# Dist file names lose their content hash ("index-B1x2Y3z4.js" reads
+# "index.js") so a report can be compared with one from another build.
+# Minified bytes are raw, not gzipped; each chunk also records its gzip size
+# since that is what a browser downloads.
+#
+# The text report is a treemap: the source paths are folded into a tree of
+# directories and printed largest first, down to --depth levels, with
+# entries under --min-percent of the total collapsed. --save writes the
+# JSON report and --compare prints what changed against a saved one.
+#
+#   python -m codemods.bundle                        treemap of dist/
+#   python -m codemods.bundle --save bundle.json
+#   python -m codemods.bundle --compare bundle.json
+
+DIST = 'dist'
+NODE_MODULES = 'node_modules'
+UNMAPPED = '(unmapped)'
+NO_MAP = '(dist)'
+REPORT_VERSION = 1
+
+_MAPPED = ('.js', '.mjs', '.css')
+_SOURCE_MAPPING_URL = re.compile(r'[#@]\s*sourceMappingURL=(\S+?)\s*(?:\*/)?\s*$')
+_HASH = re.compile(r'-[\w-]{8}(?=\.\w+$)')
+_BASE64 = {char: value for value, char in enumerate('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/')}
+
+
+def _vlq(segment):
+    values = []
+    value = shift = 0
+    for char in segment:
+        digit = _BASE64[char]
+        value += (digit & 31) << shift
+        if digit & 32:
+            shift += 5
+        else:
+            values.append(-(value >> 1) if value & 1 else value >> 1)
+            value = shift = 0
+    return values
+
+
+def decode_mappings(mappings):
+    # [[(generated column, source index or None)]] per generated line
+    lines = []
+    source = 0
+    for line in mappings.split(';'):
+        column = 0
+        segments = []
+        for segment in line.split(','):
+            if not segment:
+                continue
+            values = _vlq(segment)
+            column += values[0]
+            if len(values) >= 4:
+                source += values[1]
+                segments.append((column, source))
+            else:
+                segments.append((column, None))
+        lines.append(segments)
+    return lines
+
+
+def _size(text):
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def _code_points(line):
+    # Source map columns count UTF-16 units: the code point index of each
+    # column of a line with characters outside the BMP, else None
+    if line.isascii() or all(ord(char) <= 0xFFFF for char in line):
+        return None
+    offsets = []
+    for position, char in enumerate(line):
+        offsets.append(position)
+        if ord(char) > 0xFFFF:
+            offsets.append(position + 1)
+    offsets.append(len(line))
+    return offsets
+
+
+def attribute(code, source_map):
+    # {source index or None: bytes} of a generated file
+    sizes = Counter()
+    mapping = decode_mappings(source_map.get('mappings', ''))
+    lines = code.split('\n')
+    for number, line in enumerate(lines):
+        newline = 1 if number < len(lines) - 1 else 0
+        segments = mapping[number] if number < len(mapping) else ()
+        offsets = _code_points(line) if segments else None
+        cursor = 0
+        current = None
+        for column, source in segments:
+            if offsets is not None:
+                column = offsets[min(column, len(offsets) - 1)]
+            if column > cursor:
+                sizes[current] += _size(line[cursor:column])
+                cursor = column
+            current = source
+        sizes[current] += _size(line[cursor:]) + newline
+    return sizes
+
+
+def source_key(source, map_directory, source_root, root):
+    # Report key of a source map `sources` entry
+    path = unquote(source.split('?')[0])
+    if NODE_MODULES + '/' in path:
+        return f'{NODE_MODULES}/{package_name(path.rsplit(NODE_MODULES + "/", 1)[1])}'
+    if '\0' in path or ':' in path.split('/')[0] or not path:
+        return path.replace('\0', '') or UNMAPPED
+    full = os.path.normpath(os.path.join(map_directory, source_root, path))
+    relative = os.path.relpath(full, root).replace(os.sep, '/')
+    return path if relative.startswith('../') else relative
+
+
+def strip_hash(name):
+    return _HASH.sub('', name)
+
+
+def _load_map(path, code):
+    # The source map of a generated file: its sourceMappingURL (a data: URL
+    # or a path next to it), else `<file>.map`; None when there is none
+    tail = code[-512:].rstrip().rsplit('\n', 1)[-1]
+    match = _SOURCE_MAPPING_URL.search(tail)
+    location = path + '.map'
+    if match:
+        url = match[1]
+        if url.startswith('data:'):
+            header, _, data = url.partition(',')
+            data = base64.b64decode(data) if header.endswith(';base64') else unquote(data).encode('utf-8')
+            return json.loads(data), os.path.dirname(path)
+        location = os.path.join(os.path.dirname(path), unquote(url))
+    try:
+        with open(location, encoding='utf-8') as f:
+            return json.load(f), os.path.dirname(location)
+    except (OSError, ValueError):
+        return None, None
+
+
+def analyze(dist=DIST, root='.'):
+    # The JSON-ready report of every file under `dist`
+    chunks = []
+    totals = Counter()
+    for folder, directories, filenames in os.walk(dist):
+        directories.sort()
+        for filename in sorted(filenames):
+            if filename.endswith('.map'):
+                continue
+            path = os.path.join(folder, filename)
+            name = os.path.relpath(path, dist).replace(os.sep, '/')
+            with open(path, 'rb') as f:
+                data = f.read()
+            sources = Counter()
+            source_map = None
+            if filename.endswith(_MAPPED):
+                code = data.decode('utf-8', errors='replace')
+                source_map, map_directory = _load_map(path, code)
+            if source_map is not None and 'sections' not in source_map:
+                names = source_map.get('sources', [])
+                for index, size in attribute(code, source_map).items():
+                    key = UNMAPPED if index is None or index >= len(names) else source_key(
+                        names[index], map_directory, source_map.get('sourceRoot', ''), root)
+                    sources[key] += size
+            else:
+                sources[f'{NO_MAP}/{strip_hash(name)}'] = len(data)
+            totals.update(sources)
+            chunks.append({
+                'file': name,
+                'name': strip_hash(name),
+                'size': len(data),
+                'gzip': len(gzip.compress(data, 9)) if filename.endswith(_MAPPED + ('.html', '.svg', '.json')) else len(data),
+                'mapped': source_map is not None,
+                'sources': dict(sources.most_common()),
+            })
+    return {
+        'version': REPORT_VERSION,
+        'size': sum(chunk['size'] for chunk in chunks),
+        'gzip': sum(chunk['gzip'] for chunk in chunks),
+        'chunks': chunks,
+        'sources': dict(totals.most_common()),
+    }
+
+
+# Treemap
+
+def tree(sources):
+    # Nested {'size', 'children'} nodes from '/'-separated keys; packages
+    # and parenthesised groups stay whole under their first segment
+    top = {'size': 0, 'children': {}}
+    for key, size in sources.items():
+        if key.startswith(NODE_MODULES + '/'):
+            parts = [NODE_MODULES, key[len(NODE_MODULES) + 1:]]
+        else:
+            parts = key.split('/')
+        node = top
+        node['size'] += size
+        for part in parts:
+            node = node['children'].setdefault(part, {'size': 0, 'children': {}})
+            node['size'] += size
+    return top
+
+
+def _human(size):
+    size = float(size)
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024 or unit == 'MB':
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+
+
+def print_tree(node, total, depth=3, min_percent=1.0, indent=''):
+    smaller = []
+    for name, child in sorted(node['children'].items(), key=lambda item: -item[1]['size']):
+        percent = child['size'] * 100 / total if total else 0
+        if percent < min_percent:
+            smaller.append(child['size'])
+            continue
+        print(f"  {_human(child['size']):>10} {percent:5.1f}%  {indent}{name}")
+        if depth > 1 and child['children']:
+            print_tree(child, total, depth - 1, min_percent, indent + '  ')
+    if smaller:
+        print(f"  {_human(sum(smaller)):>10} {sum(smaller) * 100 / total:5.1f}%  {indent}... {len(smaller)} smaller")
+
+
+def report(result, depth=3, min_percent=1.0, top=10):
+    print('Chunks:')
+    for chunk in sorted(result['chunks'], key=lambda chunk: -chunk['size'])[:top]:
+        mapped = '' if chunk['mapped'] else '  (no source map)'
+        print(f"  {_human(chunk['size']):>10} {_human(chunk['gzip']):>10} gz  {chunk['file']}{mapped}")
+    if len(result['chunks']) > top:
+        print(f"  ... {len(result['chunks']) - top} more files")
+    print('Sources:')
+    print_tree(tree(result['sources']), result['size'], depth, min_percent)
+    print(f"{_human(result['size'])} in {len(result['chunks'])} files, {_human(result['gzip'])} gzipped")
+    if not any(chunk['mapped'] for chunk in result['chunks']):
+        print('no source maps found; build with `vite build --sourcemap` to attribute bytes to sources')
+
+
+# Comparing reports
+
+def compare(old, new):
+    # (chunk rows, source rows): (name, old bytes, new bytes) for everything
+    # that changed, largest change first
+    def rows(before, after):
+        changed = [
+            (name, before.get(name, 0), after.get(name, 0))
+            for name in before.keys() | after.keys() if before.get(name, 0) != after.get(name, 0)
+        ]
+        return sorted(changed, key=lambda row: (-abs(row[2] - row[1]), row[0]))
+
+    def by_name(result):
+        sizes = Counter()
+        for chunk in result['chunks']:
+            sizes[chunk['name']] += chunk['size']
+        return sizes
+
+    return rows(by_name(old), by_name(new)), rows(old['sources'], new['sources'])
+
+
+def _delta(old, new):
+    if not old:
+        return 'new'
+    if not new:
+        return 'removed'
+    return f'{(new - old) * 100 / old:+.1f}%'
+
+
+def print_comparison(old, new, top=20):
+    chunks, sources = compare(old, new)
+    print(f"Total: {_human(old['size'])} -> {_human(new['size'])} ({_human(new['size'] - old['size'])}), "
+          f"gzip {_human(old['gzip'])} -> {_human(new['gzip'])}")
+    for title, rows in (('Chunks', chunks), ('Sources', sources)):
+        print(f'{title}: {len(rows)} changed')
+        for name, before, after in rows[:top]:
+            print(f"  {'+' if after > before else '-'}{_human(abs(after - before)):>10}  {_delta(before, after):>8}  {name}")
+        if len(rows) > top:
+            print(f'  ... {len(rows) - top} more')
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        result = json.load(f)
+    if result.get('version') != REPORT_VERSION:
+        raise SystemExit(f'{path}: not a bundle report (version {result.get("version")!r})')
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Attribute the bytes of a Vite build to source modules and packages.')
+    parser.add_argument('dist', nargs='?', default=DIST)
+    parser.add_argument('--root', default='.', help='project root the src/ paths are relative to')
+    parser.add_argument('--depth', type=int, default=3, help='treemap levels to print (default: 3)')
+    parser.add_argument('--min-percent', type=float, default=1.0, help='collapse entries below this share (default: 1)')
+    parser.add_argument('--top', type=int, default=10, help='chunks to list, or changes with --compare')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--save', metavar='FILE', help='also write the JSON report to FILE')
+    parser.add_argument('--compare', metavar='FILE', help='print the changes since a saved report')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.dist):
+        raise SystemExit(f'{args.dist} does not exist; run `vite build --sourcemap` first')
+    result = analyze(args.dist, args.root)
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=1)
+            f.write('\n')
+
+    if args.json:
+        json.dump(result, sys.stdout, indent=1)
+        print()
+    elif args.compare:
+        print_comparison(load_report(args.compare), result, args.top)
+    else:
+        report(result, args.depth, args.min_percent, args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+
+# Incremental cache for codemod runs.
+#
+# Entries are keyed by (transform fingerprint, content hash) and remember
+# either the transformed output or that the transform left the file alone,
+# plus the transform's detail (e.g. per-step hit counts). Re-running the same
+# transforms over an unchanged tree then costs one hash per file.
+#
+# The directory defaults to .codemods-cache/ in the working directory;
+# CODEMODS_CACHE_DIR overrides it so CI jobs can share one between runs.
+# Since a shared directory can hold anything, entries are plain JSON (tuples
+# come back as lists) and any entry that fails to load is a miss; a value
+# that can't be stored as JSON is simply not cached.
+
+DEFAULT_DIRECTORY = '.codemods-cache'
+
+# Bump when the entry layout changes
+CACHE_VERSION = '2'
+
+PACKAGE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def content_hash(content):
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=20).hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _source_hash(path):
+    digest = hashlib.blake2b(digest_size=20)
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            if name.endswith('.py'):
+                with open(os.path.join(path, name), 'rb') as f:
+                    digest.update(name.encode('utf-8'))
+                    digest.update(f.read())
+    else:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def fingerprint(transform):
+    # Identify a transform by its code and its bound arguments. Anything
+    # running through this package also depends on the package's own source
+    # (the rewrite engine, the manifest interpreter), so that is mixed in too.
+    explicit = getattr(transform, 'fingerprint', None)
+    if isinstance(explicit, str):
+        return explicit
+
+    if isinstance(transform, functools.partial):
+        bound = json.dumps([transform.args, transform.keywords], sort_keys=True, default=repr)
+        return hashlib.blake2b(
+            (fingerprint(transform.func) + bound).encode('utf-8'), digest_size=20
+        ).hexdigest()
+
+    module = transform.__module__
+    if module == '__main__':
+        # Run with `python -m codemods.x`: use the name it is imported under
+        spec = getattr(sys.modules['__main__'], '__spec__', None)
+        module = spec.name if spec is not None else module
+    parts = [CACHE_VERSION, _source_hash(PACKAGE_DIRECTORY), module, transform.__qualname__]
+    source = inspect.getsourcefile(transform)
+    if source:
+        parts.append(_source_hash(os.path.abspath(source)))
+    return hashlib.blake2b('\0'.join(parts).encode('utf-8'), digest_size=20).hexdigest()
+
+
+class Cache:
+    def __init__(self, directory=None):
+        self.directory = directory or os.environ.get('CODEMODS_CACHE_DIR') or DEFAULT_DIRECTORY
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def key(self, transform_fingerprint, content):
+        return hashlib.blake2b(
+            f'{transform_fingerprint}:{content_hash(content)}'.encode('utf-8'), digest_size=20
+        ).hexdigest()
+
+    def get(self, key):
+        # Returns (output, detail), where output is None if the transform made
+        # no change, or None for a miss
+        entry = self._read(self._path(key))
+        if not isinstance(entry, list) or len(entry) != 2 or not isinstance(entry[0], (str, type(None))):
+            return None
+        return tuple(entry)
+
+    def put(self, key, output, detail):
+        self._write(self._path(key), (output, detail))
+
+    def load(self, name):
+        # A named entry stored with store(), or None
+        return self._read(os.path.join(self.directory, name))
+
+    def store(self, name, value):
+        # Keep a named value (e.g. a whole import graph) alongside the entries
+        self._write(os.path.join(self.directory, name), value)
+
+    def _read(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _write(self, path, value):
+        try:
+            data = json.dumps(value, separators=(',', ':'))
+        except (TypeError, ValueError):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with open(fd, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
@@ -0,0 +1,345 @@
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from functools import partial
+
+from .cache import Cache
+from .deadcode import entry_points
+from .graph import VITE_CONFIG, build_graph
+from .index import build_index
+from .routes import APP, lazy_imports, route_pages
+from .runner import TransformError, iter_tasks, stream_diffs, summarize
+from .structural import find_block
+
+# Vite manualChunks from the import graph.
+#
+# Without build.rollupOptions, Rollup puts each vendor library wherever it
+# first needs it, so an app change can rename a chunk holding recharts and
+# a route can end up downloading chart code it never renders. This tool
+# splits the app the way the browser loads it:
+#
+#   entry    modules statically reachable from the index.html entry,
+#            without following App.tsx into its route pages
+#   route    for each <Route>, modules statically reachable from its pages
+#            that the entry doesn't already load
+#
+# Packages the entry uses go into one `vendor` chunk. Every other package
+# goes into a chunk per family (its npm scope, or its own name), so
+# @radix-ui/* share one chunk, recharts gets its own, and a route only
+# downloads the families its modules import. Only packages listed in
+# package.json are named, since Rollup must be able to resolve every id.
+#
+# The size table adds up app module bytes and package bytes: the files of
+# each package's ESM build under node_modules (its `module` or `main`
+# entry's directory), or the sizes in a --package-sizes JSON file, e.g.
+# from a bundle analysis. Without either, package sizes show as `?`.
+# Sizes assume the routes are lazy-loaded (see codemods.routes); while
+# App.tsx imports its pages statically, every page is in the entry.
+#
+#   python -m codemods.chunks                     size table and proposed chunks
+#   python -m codemods.chunks --write --dry-run   diff of vite.config.ts
+#   python -m codemods.chunks --write
+
+VENDOR = 'vendor'
+NODE_MODULES = 'node_modules'
+PACKAGE_JSON = 'package.json'
+MARKER = '// Generated by python -m codemods.chunks; rerun it to update'
+
+_PATH_ATTRIBUTE = re.compile(r'''\bpath=(['"])([^'"]*)\1''')
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*$')
+_SCRIPTS = ('.js', '.mjs', '.cjs')
+
+
+@dataclass
+class Route:
+    path: str
+    pages: list                                      # module paths
+    modules: set = field(default_factory=set)        # app modules only this route loads
+    packages: set = field(default_factory=set)
+
+
+@dataclass
+class Split:
+    entry_modules: set
+    entry_packages: set
+    routes: list
+    chunks: dict            # chunk name -> [package]
+    unlisted: set           # packages imported but not in package.json
+    static_pages: list      # pages App.tsx still imports statically
+
+
+def _read(root, path):
+    with open(os.path.join(root, path), encoding='utf-8') as f:
+        return f.read()
+
+
+def dependencies(root='.'):
+    try:
+        with open(os.path.join(root, PACKAGE_JSON), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    return set(manifest.get('dependencies', {})) | set(manifest.get('devDependencies', {}))
+
+
+def family(package):
+    return package.split('/')[0] if package.startswith('@') else package
+
+
+def read_routes(graph, app=APP, root='.'):
+    # [Route] for every <Route> in `app`, and the pages it imports statically
+    text = _read(root, app)
+    index = build_index(text)
+    lazy = lazy_imports(text)
+    static = route_pages(index)
+    specifiers = {name: index.bindings[name].name for name in static}
+    specifiers.update(lazy)
+    targets = {edge.specifier: edge.target for edge in graph.edges.get(app, ()) if edge.target}
+
+    routes = []
+    for route in index.find('jsx:Route'):
+        match = _PATH_ATTRIBUTE.search(index.source(route))
+        pages = set()
+        for (scope, kind, name), nodes in index.nodes.items():
+            if scope is not None or kind != 'jsx' or name not in specifiers:
+                continue
+            if any(route.start < node.start and node.end <= route.end for node in nodes):
+                target = targets.get(specifiers[name])
+                if target:
+                    pages.add(target)
+        routes.append(Route(match[2] if match else '', sorted(pages)))
+    return routes, [targets[specifiers[name]] for name in static if specifiers[name] in targets]
+
+
+def _closure(graph, starts, cut_source=None, cut_targets=()):
+    # Modules statically reachable from `starts`; edges from `cut_source` to
+    # `cut_targets` are not followed
+    seen = set()
+    pending = list(starts)
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        for edge in graph.edges.get(path, ()):
+            if not edge.target or edge.type_only or edge.kind == 'dynamic' or edge.target in seen:
+                continue
+            if path == cut_source and edge.target in cut_targets:
+                continue
+            pending.append(edge.target)
+    return seen
+
+
+def _packages(graph, modules):
+    return {
+        edge.package
+        for path in modules for edge in graph.edges.get(path, ())
+        if edge.package and not edge.type_only and edge.kind != 'dynamic'
+    }
+
+
+def split(graph, root='.', app=APP, entries=None):
+    entries = entries or entry_points(root)
+    routes, static_pages = read_routes(graph, app, root)
+    pages = {page for route in routes for page in route.pages}
+
+    entry_modules = _closure(graph, entries, cut_source=app, cut_targets=pages)
+    for route in routes:
+        route.modules = _closure(graph, route.pages) - entry_modules
+        route.packages = _packages(graph, route.modules)
+
+    listed = dependencies(root)
+    used = _packages(graph, entry_modules) | {package for route in routes for package in route.packages}
+    unlisted = {package for package in used if package not in listed}
+    entry_packages = _packages(graph, entry_modules) & listed
+
+    chunks = {VENDOR: sorted(entry_packages)} if entry_packages else {}
+    for package in sorted(used - entry_packages - unlisted):
+        chunks.setdefault(family(package).lstrip('@'), []).append(package)
+    return Split(entry_modules, entry_packages, routes, chunks, unlisted, static_pages)
+
+
+def package_size(root, package):
+    # Bytes of the package's ESM build, or None when it isn't installed
+    directory = os.path.join(root, NODE_MODULES, package)
+    try:
+        with open(os.path.join(directory, PACKAGE_JSON), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    entry = manifest.get('module') or manifest.get('main') or 'index.js'
+    if not isinstance(entry, str):
+        return None
+    base = os.path.dirname(os.path.normpath(os.path.join(directory, entry)))
+    if os.path.normpath(base) == os.path.normpath(directory):
+        try:
+            return os.path.getsize(os.path.join(directory, entry))
+        except OSError:
+            return None
+    total = 0
+    for folder, _, filenames in os.walk(base):
+        total += sum(os.path.getsize(os.path.join(folder, name)) for name in filenames if name.endswith(_SCRIPTS))
+    return total
+
+
+# vite.config.ts
+
+def _key(name):
+    return name if _IDENTIFIER.match(name) else f"'{name}'"
+
+
+def _render(chunks, indent):
+    lines = [f'{indent}{MARKER}', f'{indent}manualChunks: {{']
+    for name, packages in chunks:
+        listed = ', '.join(f"'{package}'" for package in packages)
+        lines.append(f'{indent}  {_key(name)}: [{listed}],')
+    lines.append(f'{indent}}},')
+    return '\n'.join(lines)
+
+
+def write_manual_chunks(content, chunks):
+    # Put `chunks` ((name, packages) pairs) into build.rollupOptions.output.manualChunks
+    build = find_block(content, 'build:', jsx=False)
+    if build is None:
+        raise TransformError('no build: { ... } block')
+    begin, end = build
+    block = content[begin:end]
+
+    existing = block.find('manualChunks:')
+    if existing != -1:
+        start = begin + existing
+        span = find_block(content[start:], 'manualChunks:', jsx=False)
+        if span is None:
+            raise TransformError('manualChunks is not an object literal')
+        line_start = content.rfind('\n', 0, start) + 1
+        if content[line_start:start].strip():
+            raise TransformError('manualChunks does not start its own line')
+        indent = content[line_start:start]
+        # Replace the marker comment too, so it isn't repeated
+        marker = content.rfind(MARKER, 0, start)
+        if marker != -1 and not content[marker + len(MARKER):start].strip():
+            line_start = content.rfind('\n', 0, marker) + 1
+        stop = start + span[1]
+        if content.startswith(',', stop):
+            stop += 1
+        return content[:line_start] + _render(chunks, indent) + content[stop:]
+
+    if 'rollupOptions' in block:
+        raise TransformError('build.rollupOptions exists without manualChunks; add it by hand')
+
+    closing = begin + block.rfind('}')
+    line_start = content.rfind('\n', 0, closing) + 1
+    outer = content[line_start:closing]
+    first = re.search(r'\n([ \t]+)\S', block)
+    inner = first[1] if first else outer + '  '
+    body = '\n'.join([
+        f'{inner}rollupOptions: {{',
+        f'{inner}  output: {{',
+        _render(chunks, inner + '    '),
+        f'{inner}  }},',
+        f'{inner}}},',
+    ])
+    return content[:line_start] + body + '\n' + content[line_start:]
+
+
+# Reporting
+
+def _kb(size):
+    return '?' if size is None else f'{size / 1024:.1f} KB'
+
+
+def _sum(sizes):
+    # (total of the known sizes, whether any was unknown)
+    return sum(size for size in sizes if size is not None), any(size is None for size in sizes)
+
+
+def table(result, root='.', package_sizes=None):
+    known = dict(package_sizes or {})
+    sizes = {}
+    for packages in result.chunks.values():
+        for package in packages:
+            sizes[package] = known.get(package, package_size(root, package))
+    chunk_sizes = {name: _sum([sizes[package] for package in packages]) for name, packages in result.chunks.items()}
+    chunk_of = {package: name for name, packages in result.chunks.items() for package in packages}
+
+    def module_bytes(modules):
+        return sum(os.path.getsize(os.path.join(root, path)) for path in modules if os.path.exists(os.path.join(root, path)))
+
+    entry_app = module_bytes(result.entry_modules)
+    vendor, vendor_unknown = chunk_sizes.get(VENDOR, (0, False))
+    rows = [('(entry)', entry_app, [VENDOR] if VENDOR in result.chunks else [], entry_app + vendor, vendor_unknown)]
+    for route in result.routes:
+        app_bytes = module_bytes(route.modules)
+        names = sorted({chunk_of[package] for package in route.packages if package in chunk_of} - {VENDOR})
+        total, unknown = entry_app + vendor + app_bytes, vendor_unknown
+        for name in names:
+            size, missing = chunk_sizes[name]
+            total += size
+            unknown = unknown or missing
+        rows.append((route.path or '(no path)', app_bytes, names, total, unknown))
+    return rows, chunk_sizes
+
+
+def report(result, root='.', package_sizes=None):
+    if result.static_pages:
+        print(f"note: App.tsx imports {len(result.static_pages)} pages statically, so today every route "
+              f"loads all of them; run python -m codemods.routes. Sizes below assume lazy routes.")
+    rows, chunk_sizes = table(result, root, package_sizes)
+
+    print('Chunks:')
+    for name, packages in result.chunks.items():
+        size, unknown = chunk_sizes[name]
+        shown = _kb(size) if not unknown else f'{_kb(size)}+?' if size else '?'
+        print(f"  {name:<24} {shown:>10}  {', '.join(packages)}")
+    if result.unlisted:
+        print(f"  not in package.json (left to Rollup): {', '.join(sorted(result.unlisted))}")
+
+    print('Routes (app code, chunks, predicted total):')
+    for path, app_bytes, names, total, unknown in rows:
+        print(f"  {path:<28} {_kb(app_bytes):>10}  {_kb(total) + ('+?' if unknown else ''):>12}  {', '.join(names) or '-'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate Vite manualChunks from the import graph.')
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--app', default=APP, help=f'module holding the <Route>s (default: {APP})')
+    parser.add_argument('--config', default=VITE_CONFIG)
+    parser.add_argument('--package-sizes', metavar='FILE', help='JSON object of package name -> bytes')
+    parser.add_argument('--json', action='store_true', help='print the chunk map as JSON')
+    parser.add_argument('--write', action='store_true', help='write manualChunks into the Vite config')
+    parser.add_argument('--dry-run', action='store_true', help='with --write, print a diff instead')
+    parser.add_argument('--cache-dir', default=None, help='cache directory (default: $CODEMODS_CACHE_DIR or .codemods-cache)')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+
+    graph = build_graph(args.root, cache=None if args.no_cache else Cache(args.cache_dir))
+    result = split(graph, args.root, args.app)
+    package_sizes = None
+    if args.package_sizes:
+        with open(args.package_sizes, encoding='utf-8') as f:
+            package_sizes = json.load(f)
+
+    if args.json:
+        json.dump(result.chunks, sys.stdout, indent=1)
+        print()
+        return 0
+    if not args.write:
+        report(result, args.root, package_sizes)
+        return 0
+
+    transform = partial(write_manual_chunks, chunks=tuple((name, tuple(packages)) for name, packages in result.chunks.items()))
+    outcomes = iter_tasks([(args.config, transform)], args.root, not args.dry_run, jobs=1, diff=args.dry_run)
+    if args.dry_run:
+        outcomes = stream_diffs(outcomes)
+    with contextlib.redirect_stdout(sys.stderr if args.dry_run else sys.stdout):
+        outcomes = list(outcomes)
+        summarize(outcomes, dry_run=args.dry_run)
+    return 1 if any(outcome.error for outcome in outcomes) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,491 @@
+import argparse
+import gzip
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+
+# Seeded synthetic Workdeck data at any scale, streamed as JSON Lines.
+#
+# The board, the Resource Planner and the spending views only ever see a few
+# dozen hand-written rows (ProjectBoard's generateTasks, ResourcePlanner's
+# mockData.ts, SpendingContext's inline arrays). This generates a whole
+# company instead: departments, users with managers, projects with members,
+# activities and milestones, tasks on the board stages, weekly allocations
+# of each task's hours to its participants, events, expenses and leave.
+#
+# One JSON object per line, `{"kind": "task", "id": ..., ...}`, led by a
+# `meta` line with the seed, scale and the date the data is built around.
+# References are ids, and each record comes after the records it refers to,
+# except a department's managerId, which points at one of the users that
+# follow. Dates are ISO (`2026-10-17`), times ISO UTC.
+#
+# Records are yielded as they are made, so memory grows with the number of
+# users and projects but not with tasks, allocations, events or expenses:
+# a `--preset large` run (5k users, 50k tasks) writes a few hundred MB
+# without holding it.
+#
+# The mock API serves a file (`python -m codemods.mockapi --data FILE`);
+# --split writes one file per kind for fixtures; --check verifies the
+# references of the files it is given, across all of them, so a --split
+# directory checks as one dataset.
+#
+#   python -m codemods.dataset --preset large --out large.jsonl.gz
+#   python -m codemods.dataset --users 200 --tasks 5000 --split fixtures/
+#   python -m codemods.dataset --check large.jsonl.gz
+
+DATASET_VERSION = 1
+
+FIRST_NAMES = (
+    'Ana', 'Carlos', 'Lucía', 'Javier', 'Marta', 'David', 'Elena', 'Pablo', 'Sara', 'Diego',
+    'Laura', 'Miguel', 'Paula', 'Andrés', 'Claire', 'Tom', 'Sophie', 'James', 'Nina', 'Omar',
+)
+LAST_NAMES = (
+    'García', 'Fernández', 'López', 'Martínez', 'Sánchez', 'Pérez', 'Gómez', 'Ruiz', 'Díaz', 'Moreno',
+    'Smith', 'Jones', 'Taylor', 'Brown', 'Müller', 'Schmidt', 'Rossi', 'Silva', 'Costa', 'Novak',
+)
+DEPARTMENTS = ('Engineering', 'Design', 'Product', 'Marketing', 'Sales', 'Finance', 'Operations', 'People')
+OFFICES = (('Madrid', 'Spain'), ('Barcelona', 'Spain'), ('London', 'United Kingdom'), ('Berlin', 'Germany'), ('Lisbon', 'Portugal'))
+STAFF_CATEGORIES = (('Junior', 28), ('Mid', 38), ('Senior', 52), ('Lead', 65), ('Director', 90))
+SKILLS = ('React', 'TypeScript', 'Python', 'SQL', 'Figma', 'Copywriting', 'Negotiation', 'Accounting', 'Planning', 'Testing')
+# (name, color, system code): Open and Completed are the mandatory stages
+STAGES = (('Open', '#6B7280', 1), ('In Progress', '#3B82F6', None), ('Review', '#F59E0B', None), ('Completed', '#10B981', 2))
+CLIENTS = ('Acme Corp', 'Globex', 'Initech', 'Umbrella', 'Stark Industries', 'Wayne Enterprises', 'Hooli', 'Vandelay')
+PROJECT_WORDS = ('Website', 'Mobile App', 'Data Platform', 'Rebrand', 'ERP Rollout', 'Onboarding', 'Analytics', 'Migration', 'Portal', 'Campaign')
+PROJECT_TYPES = (('Client', '#3B82F6'), ('Internal', '#8B5CF6'), ('R&D', '#10B981'))
+PROJECT_COLORS = ('#3B82F6', '#8B5CF6', '#10B981', '#F59E0B', '#EF4444', '#EC4899', '#14B8A6', '#6366F1')
+ACTIVITIES = ('Discovery', 'Design', 'Build', 'QA', 'Launch')
+TASK_VERBS = ('Review', 'Draft', 'Update', 'Fix', 'Prepare', 'Test', 'Design', 'Plan', 'Migrate', 'Document')
+TASK_OBJECTS = ('landing page', 'API contract', 'budget', 'release notes', 'login flow', 'invoice run', 'dashboard', 'sprint backlog', 'onboarding email', 'data model')
+EVENT_TITLES = ('Standup', 'Sprint planning', 'Client call', '1:1', 'Design review', 'Retro', 'Demo', 'Workshop', 'Budget review')
+LEAVE_TYPES = (('Vacation', '#10B981'), ('Sick leave', '#EF4444'), ('Personal', '#F59E0B'), ('Remote work', '#3B82F6'))
+EXPENSE_CATEGORIES = ('Travel', 'Meals', 'Accommodation', 'Software', 'Equipment', 'Training')
+CURRENCIES = (('EUR', '€', 'Euro'), ('USD', '$', 'US Dollar'), ('GBP', '£', 'Pound sterling'))
+
+PENDING, APPROVED, DENIED = 0, 1, 2
+
+# Task ids remembered per user for their events and expenses to refer to
+RECENT_TASKS = 8
+# Users on the first projects: the mock API logs unknown addresses in as the
+# first user, whose dashboard should have something on it
+FIRST_USER_PROJECTS = 10
+
+
+@dataclass
+class Scale:
+    users: int = 50
+    projects: int = 20
+    tasks: int = 1000
+    events_per_user: int = 12
+    expenses_per_user: int = 4
+
+
+PRESETS = {
+    'small': Scale(),
+    'medium': Scale(users=500, projects=100, tasks=10_000),
+    'large': Scale(users=5000, projects=1000, tasks=50_000),
+}
+
+# kind -> ((field, kind it refers to), ...); `a.b` is field b of each item
+# of the list a, and activities are the `activities` listed in projects
+REFERENCES = {
+    'department': (('managerId', 'user'),),
+    'user': (('departmentId', 'department'), ('officeId', 'office'), ('staffCategoryId', 'staffCategory'),
+             ('managerId', 'user'), ('skills.id', 'skill')),
+    'project': (('managerId', 'user'), ('memberIds', 'user')),
+    'task': (('projectId', 'project'), ('activityId', 'activity'), ('stageId', 'stage'), ('participantIds', 'user')),
+    'allocation': (('userId', 'user'), ('projectId', 'project'), ('taskId', 'task')),
+    'event': (('creatorId', 'user'), ('guests.userId', 'user'), ('projectId', 'project'), ('taskId', 'task')),
+    'expense': (('userId', 'user'), ('projectId', 'project')),
+    'leaveRequest': (('userId', 'user'), ('leaveTypeId', 'leaveType')),
+}
+
+
+def timestamp(moment):
+    return moment.strftime('%Y-%m-%dT%H:%M:%S.000Z')
+
+
+def _uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _midnight(day):
+    return datetime.combine(day, datetime.min.time())
+
+
+def _weeks(start, end):
+    # Mondays of the weeks from `start` to `end`
+    monday = start - timedelta(days=start.weekday())
+    weeks = []
+    while monday <= end:
+        weeks.append(monday)
+        monday += timedelta(days=7)
+    return weeks
+
+
+def generate(seed=1, scale=None, today=None):
+    # (kind, record) pairs of a whole synthetic company, in reference order
+    rng = random.Random(seed)
+    scale = scale or Scale()
+    today = today or date.today()
+    yield 'meta', {'version': DATASET_VERSION, 'seed': seed, 'today': today.isoformat(), 'scale': asdict(scale)}
+
+    offices = [_uuid(rng) for _ in OFFICES]
+    for office_id, (city, country) in zip(offices, OFFICES):
+        yield 'office', {'id': office_id, 'name': f'{city} office', 'city': city, 'country': country}
+    categories = [_uuid(rng) for _ in STAFF_CATEGORIES]
+    for category_id, (name, cost) in zip(categories, STAFF_CATEGORIES):
+        yield 'staffCategory', {'id': category_id, 'name': name, 'costPerHour': cost}
+    skills = [_uuid(rng) for _ in SKILLS]
+    for skill_id, name in zip(skills, SKILLS):
+        yield 'skill', {'id': skill_id, 'name': name}
+    stages = [_uuid(rng) for _ in STAGES]
+    for position, (stage_id, (name, color, code)) in enumerate(zip(stages, STAGES)):
+        yield 'stage', {'id': stage_id, 'name': name, 'color': color, 'position': position, 'systemCode': code}
+    leave_types = [_uuid(rng) for _ in LEAVE_TYPES]
+    for leave_type_id, (name, color) in zip(leave_types, LEAVE_TYPES):
+        yield 'leaveType', {'id': leave_type_id, 'name': name, 'color': color}
+
+    # Users are assigned to departments in turn, and the first user of each
+    # department manages it
+    users = [_uuid(rng) for _ in range(scale.users)]
+    departments = [(_uuid(rng), name) for name in DEPARTMENTS[:max(1, min(len(DEPARTMENTS), scale.users // 4))]]
+    for k, (department_id, name) in enumerate(departments):
+        yield 'department', {'id': department_id, 'name': name, 'managerId': users[k] if k < len(users) else None}
+    for n, user_id in enumerate(users):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        department = n % len(departments)
+        manager = users[department] if n != department else None
+        yield 'user', {
+            'id': user_id,
+            'firstName': first,
+            'lastName': last,
+            'email': f'{first}.{last}.{n}@example.com'.lower(),
+            'departmentId': departments[department][0],
+            'officeId': rng.choice(offices),
+            'staffCategoryId': rng.choice(categories),
+            'managerId': manager,
+            'isManager': manager is None,
+            'capacity': rng.choice((40, 40, 40, 32, 20)),
+            'skills': [{'id': skill_id, 'level': rng.randint(1, 5)} for skill_id in rng.sample(skills, 3)],
+            'checklist': [
+                {'id': _uuid(rng), 'description': f'{rng.choice(TASK_VERBS)} {rng.choice(TASK_OBJECTS)}',
+                 'done': rng.random() < 0.3, 'createdAt': timestamp(_midnight(today - timedelta(days=rng.randint(0, 20))))}
+                for _ in range(rng.randint(0, 5))
+            ],
+        }
+
+    # Projects one at a time, each followed by its tasks and their
+    # allocations; each user keeps a reservoir sample of their tasks
+    recent = defaultdict(list)      # user index -> [(task id, project id)]
+    seen = Counter()                # user index -> tasks seen
+    index = {user_id: n for n, user_id in enumerate(users)}
+    for n in range(scale.projects if users else 0):
+        start = today - timedelta(days=rng.randint(0, 240))
+        end = start + timedelta(days=rng.randint(60, 360))
+        members = rng.sample(users, min(len(users), rng.randint(3, 15)))
+        if n < FIRST_USER_PROJECTS and users[0] not in members:
+            members.append(users[0])
+        kind_name, kind_color = rng.choice(PROJECT_TYPES)
+        activities = [{'id': _uuid(rng), 'name': name} for name in ACTIVITIES]
+        budget = rng.randrange(20_000, 400_000, 1000)
+        milestones = []
+        for k, name in enumerate(ACTIVITIES):
+            due = start + (end - start) * (k + 1) / len(ACTIVITIES)
+            milestones.append({'id': _uuid(rng), 'name': f'{name} complete', 'date': due.isoformat(),
+                               'done': due < today and rng.random() < 0.8})
+        project_id = _uuid(rng)
+        yield 'project', {
+            'id': project_id,
+            'name': f'{rng.choice(CLIENTS)} {rng.choice(PROJECT_WORDS)}',
+            'code': f'PRJ-{n + 1:04d}',
+            'client': rng.choice(CLIENTS),
+            'type': kind_name,
+            'typeColor': kind_color,
+            'color': rng.choice(PROJECT_COLORS),
+            'startDate': start.isoformat(),
+            'endDate': end.isoformat(),
+            'managerId': members[0],
+            'memberIds': members,
+            'activities': activities,
+            'milestones': milestones,
+            'budget': budget,
+            'spent': round(budget * rng.uniform(0.1, 1.2)),
+            'cancelled': rng.random() < 0.05,
+        }
+
+        # Tasks split evenly, the remainder going to the first projects
+        count = scale.tasks // scale.projects + (n < scale.tasks % scale.projects)
+        for position in range(count):
+            task_start = start + timedelta(days=rng.randint(0, 120))
+            task_end = task_start + timedelta(days=rng.randint(1, 30))
+            planned = rng.choice((2, 4, 8, 16, 24, 40))
+            participants = rng.sample(members, min(len(members), rng.choice((1, 1, 2, 3))))
+            progress = rng.random()
+            stage = min(len(STAGES) - 1, int(progress * len(STAGES)))
+            task_id = _uuid(rng)
+            yield 'task', {
+                'id': task_id,
+                'projectId': project_id,
+                'activityId': rng.choice(activities)['id'],
+                'name': f'{rng.choice(TASK_VERBS)} {rng.choice(TASK_OBJECTS)}',
+                'description': '',
+                'stageId': stages[stage],
+                'position': position,
+                'startDate': task_start.isoformat(),
+                'endDate': task_end.isoformat(),
+                'importance': rng.choice((1, 2, 2, 3)),
+                'plannedHours': planned,
+                'spentHours': round(planned * progress * rng.uniform(0.6, 1.3), 1),
+                'participantIds': participants,
+                'checklist': [{'id': _uuid(rng), 'text': f'Step {k + 1}', 'completed': rng.random() < progress}
+                              for k in range(rng.randint(0, 4))],
+                'numComments': rng.randint(0, 8),
+                'createdAt': timestamp(_midnight(today) - timedelta(hours=rng.randint(1, 24 * 60))),
+            }
+
+            weeks = _weeks(task_start, task_end)
+            hours = planned / len(participants) / len(weeks)
+            for user_id in participants:
+                for monday in weeks:
+                    yield 'allocation', {
+                        'id': _uuid(rng),
+                        'userId': user_id,
+                        'projectId': project_id,
+                        'taskId': task_id,
+                        'weekStart': monday.isoformat(),
+                        'hours': round(hours, 2),
+                        'type': 'soft' if stage == 0 else 'hard',
+                    }
+                user = index[user_id]
+                seen[user] += 1
+                if len(recent[user]) < RECENT_TASKS:
+                    recent[user].append((task_id, project_id))
+                else:
+                    slot = rng.randrange(seen[user])
+                    if slot < RECENT_TASKS:
+                        recent[user][slot] = (task_id, project_id)
+
+    base = _midnight(today)
+    for n, user_id in enumerate(users):
+        tasks = recent.get(n, ())
+        for _ in range(scale.events_per_user):
+            start = base + timedelta(days=rng.randint(-14, 14), hours=rng.randint(8, 17), minutes=rng.choice((0, 30)))
+            task = rng.choice(tasks) if tasks and rng.random() < 0.3 else None
+            guests = rng.sample(users, min(len(users), rng.randint(0, 4)))
+            yield 'event', {
+                'id': _uuid(rng),
+                'title': rng.choice(EVENT_TITLES),
+                'startAt': timestamp(start),
+                'endAt': timestamp(start + timedelta(minutes=rng.choice((30, 30, 60, 90, 120)))),
+                'creatorId': user_id,
+                'guests': [{'userId': guest, 'status': rng.choice((PENDING, APPROVED, APPROVED))}
+                           for guest in guests if guest != user_id],
+                'projectId': task[1] if task else None,
+                'taskId': task[0] if task else None,
+                'private': rng.random() < 0.1,
+                'billable': task is not None,
+                'createdAt': timestamp(start - timedelta(days=rng.randint(1, 10))),
+            }
+        for _ in range(scale.expenses_per_user):
+            day = today - timedelta(days=rng.randint(0, 180))
+            items = [{'id': _uuid(rng), 'description': rng.choice(EXPENSE_CATEGORIES), 'amount': round(rng.uniform(8, 400), 2)}
+                     for _ in range(rng.randint(1, 3))]
+            recent_pending = day > today - timedelta(days=14) and rng.random() < 0.6
+            yield 'expense', {
+                'id': _uuid(rng),
+                'userId': user_id,
+                'projectId': rng.choice(tasks)[1] if tasks else None,
+                'date': day.isoformat(),
+                'currency': rng.choice(CURRENCIES)[0],
+                'category': rng.choice(EXPENSE_CATEGORIES),
+                'description': f'{rng.choice(EXPENSE_CATEGORIES)} for {rng.choice(CLIENTS)}',
+                'items': items,
+                'status': PENDING if recent_pending else rng.choice((APPROVED, APPROVED, DENIED)),
+                'createdAt': timestamp(_midnight(day)),
+            }
+        if rng.random() < 0.3:
+            start = today + timedelta(days=rng.randint(-5, 30))
+            yield 'leaveRequest', {
+                'id': _uuid(rng),
+                'userId': user_id,
+                'leaveTypeId': rng.choice(leave_types),
+                'startDate': start.isoformat(),
+                'endDate': (start + timedelta(days=rng.randint(0, 9))).isoformat(),
+                'halfDay': rng.choice(('D', 'D', 'D', 'AM', 'PM')),
+                'status': rng.choice((PENDING, APPROVED, APPROVED)),
+                'createdAt': timestamp(_midnight(today - timedelta(days=rng.randint(0, 10)))),
+            }
+
+
+# Files
+
+def open_text(path, mode='r'):
+    # A text stream for `path`: '-' is stdin/stdout, `.gz` is gzipped
+    if path == '-':
+        return sys.stdin if mode == 'r' else sys.stdout
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', compresslevel=6, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def write_jsonl(records, out):
+    # Write (kind, record) pairs one per line; returns the count per kind
+    counts = Counter()
+    for kind, record in records:
+        out.write(json.dumps({'kind': kind, **record}, separators=(',', ':'), ensure_ascii=False))
+        out.write('\n')
+        counts[kind] += 1
+    return counts
+
+
+def read_jsonl(path):
+    # (kind, record) pairs of a dataset file, as they are read
+    with open_text(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                kind = record.pop('kind')
+            except (ValueError, KeyError, AttributeError):
+                raise ValueError(f'{path}:{number}: not a dataset record') from None
+            yield kind, record
+
+
+def split(records, directory):
+    # Write each kind to `directory/<kind>.jsonl`; returns the count per kind
+    os.makedirs(directory, exist_ok=True)
+    files = {}
+    counts = Counter()
+    try:
+        for kind, record in records:
+            if kind not in files:
+                files[kind] = open(os.path.join(directory, f'{kind}.jsonl'), 'w', encoding='utf-8')
+            counts.update(write_jsonl([(kind, record)], files[kind]))
+    finally:
+        for f in files.values():
+            f.close()
+    return counts
+
+
+def _references(record, path):
+    # Ids found at a REFERENCES field path
+    head, _, rest = path.partition('.')
+    value = record.get(head)
+    values = value if isinstance(value, list) else [value]
+    if rest:
+        return [item.get(rest) for item in values if isinstance(item, dict)]
+    return values
+
+
+def check(records, limit=20):
+    # (count per kind, problems): duplicate ids, references to ids that never
+    # appear, and date ranges that end before they start
+    ids = defaultdict(set)
+    pending = {}        # (kind, id) -> where it was first referenced
+    problems = []
+    counts = Counter()
+
+    def problem(message):
+        if len(problems) < limit:
+            problems.append(message)
+        elif len(problems) == limit:
+            problems.append('... more problems not shown')
+
+    for kind, record in records:
+        counts[kind] += 1
+        if kind == 'meta':
+            continue
+        record_id = record.get('id')
+        if record_id in ids[kind]:
+            problem(f'{kind} {record_id} appears twice')
+        ids[kind].add(record_id)
+        pending.pop((kind, record_id), None)
+        if kind == 'project':
+            for activity in record.get('activities', ()):
+                ids['activity'].add(activity['id'])
+                pending.pop(('activity', activity['id']), None)
+        for path, target in REFERENCES.get(kind, ()):
+            for reference in _references(record, path):
+                if reference is not None and reference not in ids[target]:
+                    pending.setdefault((target, reference), f'{kind} {record_id} {path}')
+        for start, end in (('startDate', 'endDate'), ('startAt', 'endAt')):
+            if record.get(start) and record.get(end) and record[end] < record[start]:
+                problem(f'{kind} {record_id} ends ({record[end]}) before it starts ({record[start]})')
+    for (target, reference), where in pending.items():
+        problem(f'{where} refers to missing {target} {reference}')
+    return counts, problems
+
+
+def _summary(counts, seconds=None, size=None):
+    kinds = ', '.join(f'{count} {kind}' for kind, count in counts.items() if kind != 'meta')
+    written = f', {size / 1024 / 1024:.1f} MB' if size is not None else ''
+    took = f' in {seconds:.1f}s' if seconds is not None else ''
+    return f'{sum(counts.values()) - counts["meta"]} records ({kinds}){written}{took}'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate a seeded synthetic Workdeck dataset as JSON Lines.')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small', help='scale to start from (default: small)')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--projects', type=int)
+    parser.add_argument('--tasks', type=int)
+    parser.add_argument('--events-per-user', type=int)
+    parser.add_argument('--expenses-per-user', type=int)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--today', type=date.fromisoformat, default=None, help='date the data is built around (default: today)')
+    parser.add_argument('--out', default='-', help='output file, `.gz` to compress (default: stdout)')
+    parser.add_argument('--split', metavar='DIR', help='write DIR/<kind>.jsonl instead, one file per kind')
+    parser.add_argument('--check', nargs='+', metavar='FILE', help='verify the references of dataset files instead')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.check:
+        # One pass over every file, so references resolve across them
+        file_counts = {}
+
+        def counted(path):
+            counts = file_counts[path] = Counter()
+            for kind, record in read_jsonl(path):
+                counts[kind] += 1
+                yield kind, record
+
+        try:
+            counts, problems = check(itertools.chain.from_iterable(counted(path) for path in args.check))
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 1
+        if len(args.check) > 1:
+            for path in args.check:
+                print(f'{path}: {_summary(file_counts[path])}')
+        name = args.check[0] if len(args.check) == 1 else f'{len(args.check)} files'
+        print(f'{name}: {_summary(counts, time.perf_counter() - started)}, {len(problems)} problems')
+        for message in problems:
+            print(f'  {message}')
+        return 1 if problems else 0
+
+    overrides = {name: value for name, value in vars(args).items() if name in Scale.__dataclass_fields__ and value is not None}
+    scale = Scale(**{**asdict(PRESETS[args.preset]), **overrides})
+    if scale.projects < 1 or scale.users < 1:
+        parser.error('--users and --projects must be at least 1')
+    records = generate(args.seed, scale, args.today)
+    if args.split:
+        counts = split(records, args.split)
+        size = sum(os.path.getsize(os.path.join(args.split, f'{kind}.jsonl')) for kind in counts)
+    else:
+        with open_text(args.out, 'w') as out:
+            counts = write_jsonl(records, out)
+        size = os.path.getsize(args.out) if args.out != '-' else None
+    print(_summary(counts, time.perf_counter() - started, size), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
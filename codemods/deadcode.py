@@ -0,0 +1,430 @@
+import argparse
+import contextlib
+import json
+import os
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from functools import partial
+
+from .cache import Cache
+from .graph import MODULE_EXTENSIONS, build_graph, scan_module
+from .index import build_index
+from .runner import iter_tasks, stream_diffs, summarize
+from .structural import whole_lines
+
+# Dead modules and unused exports.
+#
+# Starting from the module scripts index.html loads (src/main.tsx, which
+# pulls in App.tsx), every file reachable over the import graph is live,
+# type-only imports included, since deleting a module that is only imported
+# for its types still breaks the type check. Everything else under src/ is
+# dead:
+#
+#   modules   unreachable .ts/.tsx/.js files (ambient .d.ts files excepted)
+#   backups   editor and merge leftovers such as EventModal.tsx.bak
+#   assets    other unreferenced files; listed only, because url() in CSS
+#             and paths in index.html are not followed
+#
+# An export of a live module is unused when no live module imports it, by
+# name or as a namespace. Names requested from a barrel are forwarded
+# through its `export * from` lines to the modules behind it; a named
+# re-export keeps all of its names alive. Exports of the entry modules
+# always count as used.
+#
+# With --delete-files the dead modules and backups are removed; with
+# --prune-exports each unused export is dropped: a declaration nothing else
+# in its file refers to is deleted outright, otherwise only its `export`
+# keyword goes, and entries of `export { ... }` lists are removed together
+# with the component they name when that becomes unreferenced. Default
+# exports and re-exports are reported but never pruned. Both honour
+# --dry-run.
+#
+#   python -m codemods.deadcode                     summary by directory
+#   python -m codemods.deadcode --verbose           every dead file and export
+#   python -m codemods.deadcode --json
+#   python -m codemods.deadcode --prune-exports --dry-run > prune.diff
+
+INDEX_HTML = 'index.html'
+
+BACKUP_SUFFIXES = ('.bak', '.orig', '.old', '~')
+AMBIENT_SUFFIX = '.d.ts'
+
+# Export kinds --prune-exports may remove
+PRUNABLE = ('value', 'type', 'list')
+
+_SCRIPT_TAG = re.compile(r'<script\b([^>]*)>', re.IGNORECASE)
+_ATTRIBUTE = re.compile(r'''([\w-]+)\s*=\s*["']([^"']*)["']''')
+_EXPORT_KEYWORD = re.compile(r'export\s+')
+
+
+@dataclass
+class UnusedExport:
+    path: str
+    name: str
+    kind: str
+    size: int = 0
+
+
+@dataclass
+class DeadCode:
+    entries: list
+    modules: list = field(default_factory=list)     # [(path, bytes)]
+    backups: list = field(default_factory=list)
+    assets: list = field(default_factory=list)
+    exports: list = field(default_factory=list)     # [UnusedExport]
+
+
+def entry_points(root='.', html=INDEX_HTML):
+    # Module scripts index.html loads, as paths relative to `root`
+    try:
+        with open(os.path.join(root, html), encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return []
+    entries = []
+    for match in _SCRIPT_TAG.finditer(text):
+        attributes = dict(_ATTRIBUTE.findall(match[1]))
+        if attributes.get('type') == 'module' and attributes.get('src'):
+            entries.append(attributes['src'].lstrip('/'))
+    return entries
+
+
+def _requested(graph, live, entries):
+    # Live module -> names other live modules take from it ('*' for all)
+    requested = {path: set() for path in live}
+    for entry in entries:
+        requested[entry].add('*')
+
+    stars = []
+    for path in live:
+        for edge in graph.edges.get(path, ()):
+            if edge.target not in requested:
+                continue
+            if edge.kind == 'export' and '*' in edge.names:
+                stars.append((path, edge.target))
+            else:
+                requested[edge.target].update(edge.names)
+
+    # Forward names through `export * from` until nothing changes
+    own = {
+        path: {export.name for export in graph.exports.get(path, ()) if export.kind not in ('reexport', 'namespace')}
+        for path, _ in stars
+    }
+    namespaces = {
+        path: {export.name for export in graph.exports.get(path, ()) if export.kind == 'namespace'}
+        for path, _ in stars
+    }
+    changed = True
+    while changed:
+        changed = False
+        for barrel, target in stars:
+            names = requested[barrel]
+            if '*' in names or names & namespaces[barrel]:
+                forwarded = {'*'}
+            else:
+                forwarded = names - own[barrel]
+            if not forwarded <= requested[target]:
+                requested[target] |= forwarded
+                changed = True
+    return requested
+
+
+def _size(root, path):
+    try:
+        return os.path.getsize(os.path.join(root, path))
+    except OSError:
+        return 0
+
+
+def _read(root, path):
+    try:
+        with open(os.path.join(root, path), encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _export_sizes(text, exports, jsx):
+    # Bytes pruning each unused export would remove: its declaration, or for
+    # a list entry the component it names, when nothing else in the file
+    # refers to it; 0 when only the `export` would go
+    index = build_index(text, jsx)
+    sizes = []
+    for export in exports:
+        span = name = None
+        if export.kind in ('value', 'type'):
+            span, name = index.declaration(export.offset), export.name
+        elif export.kind == 'list':
+            name = _local_name(text, export.offset)
+            node = index.get(f'component:{name}')
+            span = (node.start, node.end) if node else None
+        if span is None or _references(text, name, span) > (export.kind == 'list'):
+            sizes.append(0)
+        else:
+            sizes.append(span[1] - span[0])
+    return sizes
+
+
+def analyze(graph, entries, root='.'):
+    entries = [entry for entry in entries if entry in graph.files]
+    live = graph.reachable(entries, include_types=True)
+    dead = DeadCode(entries)
+
+    for path in sorted(graph.files):
+        if path in live or path.endswith(AMBIENT_SUFFIX):
+            continue
+        size = _size(root, path)
+        if path.endswith(BACKUP_SUFFIXES):
+            dead.backups.append((path, size))
+        elif path.endswith(MODULE_EXTENSIONS):
+            dead.modules.append((path, size))
+        else:
+            dead.assets.append((path, size))
+
+    requested = _requested(graph, live, entries)
+    for path in sorted(live):
+        names = requested.get(path, ())
+        if '*' in names:
+            continue
+        unused = [export for export in graph.exports.get(path, ()) if export.name not in names]
+        if not unused:
+            continue
+        text = _read(root, path)
+        sizes = _export_sizes(text, unused, path.endswith('x')) if text is not None else [0] * len(unused)
+        dead.exports.extend(
+            UnusedExport(path, export.name, export.kind, size) for export, size in zip(unused, sizes)
+        )
+    return dead
+
+
+# Pruning
+
+def _local_name(text, offset):
+    # Local name of the `export { ... }` entry starting at `offset`
+    match = re.compile(r'(?:type\s+)?([\w$]+)').match(text, offset)
+    return match[1] if match else None
+
+
+def _references(text, name, *spans):
+    # Occurrences of `name` as a whole word outside `spans`
+    count = 0
+    for match in re.finditer(rf'(?<![\w$]){re.escape(name)}(?![\w$])', text):
+        if not any(start <= match.start() < end for start, end in spans):
+            count += 1
+    return count
+
+
+def _removal(text, start, end):
+    # Span deleting a declaration: its whole lines, the comment block right
+    # above it and one blank line after it
+    start, end = whole_lines(text, start, end)
+    while start:
+        previous = text.rfind('\n', 0, start - 1) + 1
+        line = text[previous:start].strip()
+        if line.endswith('*/'):
+            opening = text.rfind('/*', 0, start)
+            previous = text.rfind('\n', 0, opening) + 1
+            if text[previous:opening].strip():
+                break
+        elif not line.startswith('//'):
+            break
+        start = previous
+    if text.startswith('\n', end) or text.startswith('\r\n', end):
+        end = text.index('\n', end) + 1
+    return start, end
+
+
+def _prune_list(text, index, opener, closer, names):
+    # Edits removing the entries of the list between offsets opener..closer
+    # that export one of `names`
+    pieces = text[opener + 1:closer].split(',')
+    kept = []
+    removed = []
+    for piece in pieces:
+        words = re.findall(r'[\w$]+', piece)
+        if words and words[-1] in names:
+            removed.append([word for word in words if word != 'type'][0])
+        else:
+            kept.append(piece)
+    if not removed:
+        return [], []
+
+    statement = index.declaration(text.rfind('export', 0, opener))
+    edits = []
+    if not any(piece.strip() for piece in kept):
+        edits.append((*_removal(text, *statement), ''))
+    else:
+        tail = pieces[-1][len(pieces[-1].rstrip()):]
+        inner = ','.join(kept)
+        edits.append((opener + 1, closer, inner.rstrip() + tail))
+
+    # Components the list exported that nothing else refers to any more
+    for local in removed:
+        node = index.get(f'component:{local}')
+        if node and not _references(text, local, (node.start, node.end), statement):
+            edits.append((*_removal(text, node.start, node.end), ''))
+    return edits, removed
+
+
+def prune_exports(content, names, jsx=True):
+    # Remove the exports in `names` from one module; returns (content, pruned names)
+    names = set(names)
+    _, exports = scan_module(content, jsx)
+    index = build_index(content, jsx)
+    edits = []
+    pruned = []
+    lists = set()
+
+    for export in exports:
+        if export.name not in names or export.kind not in PRUNABLE:
+            continue
+        if export.kind == 'list':
+            opener = content.rfind('{', 0, export.offset)
+            lists.add((opener, content.find('}', export.offset)))
+            continue
+        span = index.declaration(export.offset)
+        if span is None:
+            continue
+        if _references(content, export.name, span):
+            edits.append((export.offset, _EXPORT_KEYWORD.match(content, export.offset).end(), ''))
+        else:
+            edits.append((*_removal(content, *span), ''))
+        pruned.append(export.name)
+
+    for opener, closer in sorted(lists):
+        list_edits, removed = _prune_list(content, index, opener, closer, names)
+        edits.extend(list_edits)
+        pruned.extend(removed)
+
+    pieces = []
+    cursor = 0
+    for start, end, replacement in sorted(edits):
+        if start < cursor:
+            continue
+        pieces.append(content[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(content[cursor:])
+    return ''.join(pieces), pruned
+
+
+def delete_files(paths, root='.', write=True):
+    # Delete `paths` and any directories they leave empty
+    verb = 'Deleted' if write else 'Would delete'
+    total = 0
+    for path, size in paths:
+        print(f"{verb} {path} ({size} bytes)")
+        total += size
+        if not write:
+            continue
+        full = os.path.join(root, path)
+        os.remove(full)
+        with contextlib.suppress(OSError):
+            os.removedirs(os.path.dirname(full))
+    print(f"{len(paths)} files, {total} bytes")
+
+
+def prune(dead, root='.', write=True, jobs=None, cache=None):
+    by_path = {}
+    for export in dead.exports:
+        if export.kind in PRUNABLE:
+            by_path.setdefault(export.path, []).append(export.name)
+    tasks = [
+        (path, partial(prune_exports, names=tuple(sorted(names)), jsx=path.endswith('x')))
+        for path, names in sorted(by_path.items())
+    ]
+    return iter_tasks(tasks, root, write, jobs, cache, diff=not write)
+
+
+# Reporting
+
+def _kb(size):
+    return f'{size / 1024:.1f} KB'
+
+
+def _by_directory(files):
+    directories = {}
+    for path, size in files:
+        count, total = directories.get(os.path.dirname(path), (0, 0))
+        directories[os.path.dirname(path)] = (count + 1, total + size)
+    return sorted(directories.items(), key=lambda item: -item[1][1])
+
+
+def report(dead, verbose=False):
+    print(f"Entry points: {', '.join(dead.entries) or 'none'}")
+    for title, files in (('Unreachable modules', dead.modules), ('Backups', dead.backups),
+                         ('Unreferenced assets', dead.assets)):
+        total = sum(size for _, size in files)
+        print(f"{title}: {len(files)} files, {_kb(total)}")
+        if verbose:
+            for path, size in files:
+                print(f"  {_kb(size):>10}  {path}")
+        else:
+            for directory, (count, size) in _by_directory(files):
+                print(f"  {_kb(size):>10}  {directory}/ ({count} files)")
+
+    modules = {}
+    for export in dead.exports:
+        modules.setdefault(export.path, []).append(export)
+    total = sum(export.size for export in dead.exports)
+    print(f"Unused exports: {len(dead.exports)} in {len(modules)} modules, {_kb(total)}")
+    for path, exports in sorted(modules.items(), key=lambda item: -sum(export.size for export in item[1])):
+        size = sum(export.size for export in exports)
+        if verbose:
+            names = ', '.join(f'{export.name} ({export.size})' for export in exports)
+        else:
+            names = ', '.join(export.name for export in exports[:6]) + (', ...' if len(exports) > 6 else '')
+        print(f"  {_kb(size):>10}  {path} [{len(exports)}]: {names}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Report (and optionally remove) dead modules and unused exports.')
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--entry', action='append', metavar='PATH',
+                        help=f'entry module (repeatable; default: the module scripts in {INDEX_HTML})')
+    parser.add_argument('--verbose', action='store_true', help='list every file and export')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--delete-files', action='store_true', help='delete unreachable modules and backups')
+    parser.add_argument('--prune-exports', action='store_true', help='remove unused exports')
+    parser.add_argument('--dry-run', action='store_true', help='show what would be deleted, and diffs of pruned exports')
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--cache-dir', default=None, help='cache directory (default: $CODEMODS_CACHE_DIR or .codemods-cache)')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+
+    cache = None if args.no_cache else Cache(args.cache_dir)
+    started = time.perf_counter()
+    graph = build_graph(args.root, cache=cache)
+    entries = args.entry or entry_points(args.root)
+    if not entries:
+        raise SystemExit(f'No entry points: pass --entry or add a module script to {INDEX_HTML}')
+    dead = analyze(graph, entries, args.root)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        json.dump(asdict(dead), sys.stdout, indent=1)
+        print()
+        return 0
+    if not (args.delete_files or args.prune_exports):
+        report(dead, args.verbose)
+        print(f"analyzed in {elapsed * 1000:.0f} ms")
+        return 0
+
+    # With --dry-run, diffs go to stdout and everything else to stderr
+    out = sys.stderr if args.dry_run else sys.stdout
+    if args.delete_files:
+        with contextlib.redirect_stdout(out):
+            delete_files(dead.modules + dead.backups, args.root, write=not args.dry_run)
+    if args.prune_exports:
+        outcomes = prune(dead, args.root, not args.dry_run, args.jobs, cache)
+        if args.dry_run:
+            outcomes = stream_diffs(outcomes)
+        with contextlib.redirect_stdout(out):
+            summarize(list(outcomes), dry_run=args.dry_run)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
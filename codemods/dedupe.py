@@ -0,0 +1,310 @@
+import argparse
+import contextlib
+import os
+import posixpath
+import sys
+import time
+from dataclasses import dataclass, field
+from functools import partial
+
+from .cache import Cache, content_hash
+from .graph import MODULE_EXTENSIONS, build_graph
+from .runner import TransformError, iter_tasks, stream_diffs, summarize
+from .tsx import tokenize
+
+# Collapse duplicated modules into one shared copy.
+#
+# The page bundles were each generated with their own copy of the same
+# component kit (Dashboard/components/ui, Projects/wizard/ui,
+# ResourcePlanner/components/ui), so Vite compiles and ships most of those
+# components three times. Modules are grouped by their token stream, which
+# makes whitespace-only differences (indentation, blank lines, trailing
+# spaces) irrelevant; each group records whether its members are also
+# byte-identical.
+#
+# Identical text is not enough: `import { cn } from "./utils"` means a
+# different module in each kit. Groups are therefore refined until every
+# member's relative imports resolve to the same module or to members of one
+# group, so a kit file whose ./button differs from the other kits' stays
+# separate.
+#
+# With --merge each group's first member is moved to SHARED_ROOT, under the
+# name of the directory the members share (src/components/ui/sidebar.tsx),
+# with its own relative imports re-pointed; the other members are deleted
+# and every importer is rewritten to the shared path, keeping its specifier
+# style (relative or alias, with or without extension). Groups whose target
+# path is already taken by another file are skipped.
+#
+#   python -m codemods.dedupe                      list duplicate groups
+#   python -m codemods.dedupe --merge --dry-run    show the moves and importer diffs
+#   python -m codemods.dedupe --merge
+
+SHARED_ROOT = 'src/components'
+
+
+@dataclass
+class Group:
+    members: list              # paths, sorted; the first is the canonical copy
+    exact: bool                # byte-identical, not just the same tokens
+    size: int                  # bytes of one copy
+    target: str = None         # where the canonical copy goes
+    skipped: str = None        # why the group is not merged
+
+    @property
+    def saved(self):
+        return self.size * (len(self.members) - 1)
+
+
+@dataclass
+class Plan:
+    groups: list
+    moves: list = field(default_factory=list)     # [(group, new content)]
+    edits: dict = field(default_factory=dict)     # importer path -> [(offset, old, new)]
+
+
+def normalized_hash(text, jsx=True):
+    # Hash of the token stream; whitespace between tokens, and runs of
+    # whitespace inside comments and JSX text, do not count
+    pieces = []
+    for token in tokenize(text, jsx):
+        value = text[token.start:token.end]
+        if token.kind in ('comment', 'jsx_text'):
+            value = ' '.join(value.split())
+            if not value:
+                continue
+        pieces.append(value)
+    return content_hash('\0'.join(pieces))
+
+
+def _read(root, path):
+    try:
+        with open(os.path.join(root, path), encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _imported(edge, group_of):
+    # What an import refers to, for comparing the members of a group
+    if edge.target:
+        return group_of.get(edge.target, edge.target)
+    if edge.package:
+        return edge.specifier
+    # Unresolved: the same text may mean different things in each copy
+    return (edge.source, edge.specifier)
+
+
+def _refine(groups, graph):
+    # Split groups until the members of each import the same things
+    while True:
+        group_of = {path: number for number, members in enumerate(groups) for path in members}
+        refined = []
+        for members in groups:
+            by_imports = {}
+            for path in members:
+                signature = tuple(_imported(edge, group_of) for edge in graph.edges.get(path, ()))
+                by_imports.setdefault(signature, []).append(path)
+            refined.extend(split for split in by_imports.values() if len(split) > 1)
+        if len(refined) == len(groups):
+            return refined
+        groups = refined
+
+
+def find_duplicates(graph, root='.', exact=False):
+    by_tokens = {}
+    raw = {}
+    sizes = {}
+    for path in sorted(graph.edges):
+        if not path.endswith(MODULE_EXTENSIONS):
+            continue
+        text = _read(root, path)
+        if text is None:
+            continue
+        raw[path] = content_hash(text)
+        sizes[path] = len(text.encode('utf-8'))
+        key = raw[path] if exact else normalized_hash(text, jsx=path.endswith('x'))
+        by_tokens.setdefault(key, []).append(path)
+
+    groups = _refine([members for members in by_tokens.values() if len(members) > 1], graph)
+    return sorted(
+        (Group(members, len({raw[path] for path in members}) == 1, sizes[members[0]]) for members in groups),
+        key=lambda group: (-group.saved, group.members),
+    )
+
+
+def _target(group, shared_root):
+    directories = {posixpath.basename(posixpath.dirname(path)) for path in group.members}
+    names = [posixpath.basename(path) for path in group.members]
+    name = max(names, key=names.count)
+    if len(directories) == 1:
+        return posixpath.join(shared_root, directories.pop(), name)
+    return posixpath.join(shared_root, name)
+
+
+def _strip_extension(path, extensions):
+    for extension in extensions:
+        if path.endswith(extension):
+            return path[:-len(extension)]
+    return path
+
+
+def specifier_for(original, source, target, config):
+    # Specifier in the style of `original` that resolves from `source` to `target`
+    path, question, query = original.partition('?')
+    query = question + query
+
+    written = None
+    for alias, replacement in config.aliases.items():
+        if (path == alias or path.startswith(alias + '/')) and target.startswith(replacement + '/'):
+            written = alias + target[len(replacement):]
+            break
+    if written is None:
+        written = posixpath.relpath(target, posixpath.dirname(source))
+        if not written.startswith('.'):
+            written = './' + written
+
+    if not path.endswith(tuple(config.extensions)):
+        written = _strip_extension(written, config.extensions)
+        if posixpath.basename(written) == 'index' and posixpath.basename(path) != 'index':
+            written = posixpath.dirname(written)
+    return written + query
+
+
+def plan_merge(groups, graph, root='.', shared_root=SHARED_ROOT):
+    plan = Plan(groups)
+    taken = set(graph.files)
+    moved = {}
+    for group in groups:
+        target = _target(group, shared_root)
+        if target in taken and target not in group.members:
+            group.skipped = f'{target} already exists'
+            continue
+        group.target = target
+        taken.add(target)
+        for path in group.members:
+            moved[path] = target
+
+    merged = [group for group in groups if group.target]
+    for group in merged:
+        canonical = group.members[0]
+        text = _read(root, canonical)
+        if text is None:
+            raise SystemExit(f'Cannot read {canonical}')
+        edits = []
+        for edge in graph.edges.get(canonical, ()):
+            if edge.target:
+                new = specifier_for(edge.specifier, group.target, moved.get(edge.target, edge.target), graph.config)
+                if new != edge.specifier:
+                    edits.append((edge.offset, edge.specifier, new))
+        plan.moves.append((group, retarget(text, tuple(edits))))
+
+    for target_path, edges in graph.importers.items():
+        if target_path not in moved:
+            continue
+        for edge in edges:
+            if edge.source in moved:
+                continue
+            new = specifier_for(edge.specifier, edge.source, moved[target_path], graph.config)
+            if new != edge.specifier:
+                plan.edits.setdefault(edge.source, []).append((edge.offset, edge.specifier, new))
+    return plan
+
+
+def retarget(content, edits):
+    # Replace the specifier strings at the given offsets; each must still
+    # read `old` there
+    pieces = []
+    cursor = 0
+    for offset, old, new in sorted(edits):
+        if content[offset + 1:offset + 1 + len(old)] != old or content[offset] not in '\'"':
+            raise TransformError(f'specifier {old!r} is no longer at offset {offset}')
+        pieces.append(content[cursor:offset + 1])
+        pieces.append(new)
+        cursor = offset + 1 + len(old)
+    pieces.append(content[cursor:])
+    return ''.join(pieces)
+
+
+def _importer_tasks(plan):
+    return [(path, partial(retarget, edits=tuple(edits))) for path, edits in sorted(plan.edits.items())]
+
+
+def merge(plan, root='.', write=True, jobs=None):
+    # Check every importer edit, then move the shared copies into place and
+    # write the edits. Returns the importer Outcomes; nothing is moved if an
+    # importer cannot be edited.
+    tasks = _importer_tasks(plan)
+    outcomes = list(iter_tasks(tasks, root, write=False, jobs=jobs, diff=not write))
+    verb = 'Moved' if write else 'Would move'
+    if any(outcome.error for outcome in outcomes):
+        return outcomes
+    for group, content in plan.moves:
+        others = [path for path in group.members[1:] if path != group.target]
+        print(f"{verb} {group.members[0]} -> {group.target}"
+              f"{' (deleting ' + ', '.join(others) + ')' if others else ''}")
+        if not write:
+            continue
+        destination = os.path.join(root, group.target)
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        with open(destination, 'w', encoding='utf-8') as f:
+            f.write(content)
+        for path in group.members:
+            if path != group.target:
+                full = os.path.join(root, path)
+                os.remove(full)
+                with contextlib.suppress(OSError):
+                    os.removedirs(os.path.dirname(full))
+    if write:
+        outcomes = list(iter_tasks(tasks, root, write=True, jobs=jobs))
+    return outcomes
+
+
+def report(groups, verbose=False):
+    for group in groups:
+        flag = '' if group.exact else ' (whitespace differs)'
+        where = f' -> {group.target}' if group.target else ''
+        skipped = f' skipped: {group.skipped}' if group.skipped else ''
+        print(f"  {group.saved:>8} bytes  {len(group.members)} x {group.members[0]}{flag}{where}{skipped}")
+        if verbose:
+            for path in group.members[1:]:
+                print(f"                  {path}")
+    exact = sum(group.exact for group in groups)
+    print(f"{len(groups)} duplicate groups ({exact} byte-identical), "
+          f"{sum(len(group.members) for group in groups)} files, {sum(group.saved for group in groups)} bytes duplicated")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find duplicated modules and merge them into one shared copy.')
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--shared-root', default=SHARED_ROOT, help=f'where shared copies go (default: {SHARED_ROOT})')
+    parser.add_argument('--exact', action='store_true', help='only byte-identical files')
+    parser.add_argument('--verbose', action='store_true', help='list every member of each group')
+    parser.add_argument('--merge', action='store_true', help='move one copy to the shared root and rewrite importers')
+    parser.add_argument('--dry-run', action='store_true', help='with --merge, print the moves and importer diffs')
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--cache-dir', default=None, help='cache directory (default: $CODEMODS_CACHE_DIR or .codemods-cache)')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    graph = build_graph(args.root, cache=None if args.no_cache else Cache(args.cache_dir))
+    groups = find_duplicates(graph, args.root, args.exact)
+    if not args.merge:
+        report(groups, args.verbose)
+        print(f"analyzed in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return 0
+
+    plan = plan_merge(groups, graph, args.root, args.shared_root)
+    # With --dry-run, diffs go to stdout and everything else to stderr
+    with contextlib.redirect_stdout(sys.stderr if args.dry_run else sys.stdout):
+        outcomes = merge(plan, args.root, write=not args.dry_run, jobs=args.jobs)
+    if args.dry_run:
+        outcomes = stream_diffs(outcomes)
+    with contextlib.redirect_stdout(sys.stderr if args.dry_run else sys.stdout):
+        report(groups, args.verbose)
+        summarize(outcomes, dry_run=args.dry_run)
+    return 1 if any(outcome.error for outcome in outcomes) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
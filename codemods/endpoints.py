@@ -0,0 +1,450 @@
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+
+from .cache import Cache
+from .graph import build_graph
+from .index import build_index
+from .routes import APP, route_pages
+
+# Which GET endpoints each page calls, and which of them the response cache
+# in src/services/apiClient.ts (the add_api_cache patch) shares.
+#
+# API functions are the top-level functions of modules that make requests:
+# getCurrentUser, getWhatsNew, ... A request is a call to one of TRANSPORTS
+# with a literal endpoint (a string or template, or a local const holding
+# one); `${...}` parts become `{}` and the query string is dropped. A
+# function calling another API function makes its requests too, so
+# dashboardApi's getTodayEvents also hits /queries/me.
+#
+# A page is a component a <Route> in App.tsx renders. Its modules are those
+# reachable from it over the import graph, dynamic imports included, plus
+# the ones App.tsx reaches outside its pages (providers such as AuthContext)
+# since those run on every page. Every call of an API function in those
+# modules is a call site.
+#
+# A request is cached when its transport goes through withApiCache. Cached
+# call sites of the same endpoint on one page share one request while it is
+# in flight or fresh, so each endpoint saves all but one of them; requests
+# made with plain fetch() (authService) are never shared.
+#
+# Call sites are counted as written, so a call in a click handler counts as
+# much as one in a mount effect: the numbers are an upper bound on what a
+# page load requests.
+#
+#   python -m codemods.endpoints                 every page
+#   python -m codemods.endpoints --page DashboardApp --verbose
+#   python -m codemods.endpoints --json
+
+# transport -> its fixed method, or None when it comes from `method:` in the
+# options (GET by default)
+TRANSPORTS = {
+    'apiGet': 'GET', 'apiPost': 'POST', 'apiPut': 'PUT', 'apiDelete': 'DELETE', 'apiPatch': 'PATCH',
+    'apiFetch': None, 'fetch': None,
+}
+CACHE_MARKER = 'withApiCache('
+SHELL = '(app)'
+
+_TRANSPORT_CALL = re.compile(r'\b(?:%s)\s*[<(]' % '|'.join(TRANSPORTS))
+_METHOD = re.compile(r'''\bmethod\s*:\s*['"`](\w+)['"`]''')
+_INTERPOLATION = re.compile(r'\$\{(?:[^{}]|\{[^{}]*\})*\}')
+_ROUTE_PATH = re.compile(r'''\bpath\s*=\s*["']([^"']+)["']''')
+
+
+@dataclass
+class Request:
+    method: str
+    endpoint: str
+    cached: bool
+
+
+@dataclass
+class CallSite:
+    module: str
+    line: int
+    function: str       # the API function called
+    api_module: str
+
+
+@dataclass
+class Endpoint:
+    endpoint: str
+    cached: int = 0
+    uncached: int = 0
+    functions: list = field(default_factory=list)       # 'name (module)'
+    sites: list = field(default_factory=list)           # 'module:line'
+
+    @property
+    def saved(self):
+        return max(0, self.cached - 1)
+
+
+@dataclass
+class Page:
+    name: str
+    module: str
+    paths: list
+    endpoints: dict = field(default_factory=dict)       # endpoint -> Endpoint
+
+    @property
+    def calls(self):
+        return sum(entry.cached + entry.uncached for entry in self.endpoints.values())
+
+    @property
+    def saved(self):
+        return sum(entry.saved for entry in self.endpoints.values())
+
+
+def normalize(expression):
+    # '/queries/events/user/{}' for `${API_URL}/queries/events/user/${id}?start=${...}`;
+    # None unless it is a literal path
+    expression = expression.strip()
+    if len(expression) < 2 or expression[0] not in '\'"`' or expression[-1] != expression[0]:
+        return None
+    path = _INTERPOLATION.sub('{}', expression[1:-1]).split('?', 1)[0]
+    if path.startswith('{}'):
+        path = path[2:]
+    # A trailing `${params}` is a query string
+    if path.endswith('{}') and not path.endswith('/{}'):
+        path = path[:-2]
+    return path if path.startswith('/') else None
+
+
+class Module:
+    # Top-level functions of one file and the calls inside them
+    def __init__(self, path, text):
+        self.path = path
+        self.text = text
+        self.index = build_index(text, jsx=path.endswith(('x', '.js')))
+        self.functions = {}         # name -> (start token, end token)
+        self._scan()
+
+    def _scan(self):
+        index = self.index
+        i = 0
+        while i < len(index.tokens):
+            value = index._value(i)
+            name = None
+            if value == 'function' and index._kind(i + 1) == 'name':
+                name = index._value(i + 1)
+            elif value in ('const', 'let') and index._kind(i + 1) == 'name' and index._value(i + 2) in ('=', ':'):
+                name = index._value(i + 1)
+            if name:
+                end = self._declaration_end(i)
+                self.functions.setdefault(name, (i, end))
+                i = end + 1
+                continue
+            i = index.closers.get(i, i) + 1
+
+    def _declaration_end(self, i):
+        index = self.index
+        if index._value(i) == 'function':
+            # Past the parameters and any return type to the body; a `{` right
+            # after `:`, `|`, `&` or `,` is an object type
+            k = i + 2
+            while k < len(index.tokens):
+                value = index._value(k)
+                if value == '<':
+                    k = index._skip_generic(k)
+                    continue
+                if value == ';':
+                    return k
+                if value == '{' and k in index.closers and index._value(k - 1) not in (':', '|', '&', ','):
+                    return index.closers[k]
+                k = index.closers.get(k, k) + 1
+            return len(index.tokens) - 1
+        return index._statement_end(i)
+
+    def function_at(self, i):
+        for name, (start, end) in self.functions.items():
+            if start <= i <= end:
+                return name
+        return None
+
+    def line(self, i):
+        return self.text.count('\n', 0, self.index.tokens[i].start) + 1
+
+    def calls(self, start=0, end=None):
+        # (token index, callee, argument token range) of every `name(...)` or
+        # `name<T>(...)` call in the token range, methods excluded
+        index = self.index
+        end = len(index.tokens) - 1 if end is None else end
+        for i in range(start, end + 1):
+            if index._kind(i) != 'name' or index._value(i - 1) in ('.', 'function'):
+                continue
+            k = i + 1
+            if index._value(k) == '<':
+                k = index._skip_generic(k)
+            if index._value(k) == '(' and k in index.closers:
+                yield i, index._value(i), (k + 1, index.closers[k] - 1)
+
+    def source(self, first, last):
+        tokens = self.index.tokens
+        return self.text[tokens[first].start:tokens[last].end] if first <= last else ''
+
+    def first_argument(self, first, last):
+        index = self.index
+        k = first
+        while k <= last and index._value(k) != ',':
+            k = index.closers.get(k, k) + 1
+        return first, min(k - 1, last)
+
+    def initializer(self, name, before, scope):
+        # Source of `const name = ...` in the token range `scope`, before token `before`
+        index = self.index
+        for k in range(before - 1, scope[0] - 1, -1):
+            if index._value(k) == name and index._value(k - 1) in ('const', 'let') and index._value(k + 1) == '=':
+                return self.source(k + 2, index._statement_end(k))
+        return None
+
+
+def _requests(module, cached_transports):
+    # {function name: ([Request], [called function names])} of an API module
+    functions = {}
+    for name, (start, end) in module.functions.items():
+        if name in TRANSPORTS:
+            continue
+        requests = []
+        callees = []
+        for i, callee, (first, last) in module.calls(start, end):
+            if callee not in TRANSPORTS:
+                callees.append(callee)
+                continue
+            argument = module.source(*module.first_argument(first, last))
+            if re.fullmatch(r'[\w$]+', argument):
+                argument = module.initializer(argument, i, (start, end)) or ''
+            endpoint = normalize(argument)
+            if endpoint is None:
+                continue
+            method = TRANSPORTS[callee]
+            if method is None:
+                found = _METHOD.search(module.source(first, last))
+                method = found.group(1).upper() if found else 'GET'
+            requests.append(Request(method, endpoint, cached_transports.get(callee, False)))
+        functions[name] = (requests, callees)
+    return functions
+
+
+@dataclass
+class Analysis:
+    api: dict = field(default_factory=dict)             # API module -> {function: [Request]}
+    pages: list = field(default_factory=list)
+    cache_installed: bool = False
+
+
+def _read(root, path):
+    try:
+        with open(os.path.join(root, path), encoding='utf-8') as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _api_modules(graph, root):
+    # {path: {function: [Request]}} with calls between API functions expanded
+    texts = {}
+    for path in graph.modules:
+        text = _read(root, path)
+        if text and _TRANSPORT_CALL.search(text):
+            texts[path] = text
+
+    raw = {}
+    for path, text in texts.items():
+        module = Module(path, text)
+        # Transports this module defines or imports, and whether they cache
+        cached = {name: CACHE_MARKER in text for name in TRANSPORTS if name in module.functions}
+        for edge in graph.imports_of(path):
+            for name in edge.names:
+                if name in TRANSPORTS and edge.target:
+                    cached[name] = CACHE_MARKER in (texts.get(edge.target) or _read(root, edge.target) or '')
+        cached['fetch'] = False
+        raw[path] = (module, _requests(module, cached))
+
+    def bound(path):
+        # Local name -> (API module, function) for what `path` imports
+        names = {}
+        for edge in graph.imports_of(path):
+            if edge.target in raw:
+                for name in edge.names:
+                    if name in raw[edge.target][1]:
+                        names[name] = (edge.target, name)
+        return names
+
+    expanded = {}
+
+    def expand(path, name, seen):
+        key = (path, name)
+        if key in expanded:
+            return expanded[key]
+        if key in seen:
+            return []
+        seen.add(key)
+        requests, callees = raw[path][1][name]
+        result = list(requests)
+        imported = bound(path)
+        for callee in callees:
+            if callee in raw[path][1] and callee != name:
+                result.extend(expand(path, callee, seen))
+            elif callee in imported:
+                result.extend(expand(*imported[callee], seen))
+        expanded[key] = result
+        return result
+
+    api = {}
+    for path, (_, functions) in raw.items():
+        api[path] = {name: expand(path, name, set()) for name in functions}
+        api[path] = {name: requests for name, requests in api[path].items() if requests}
+    return api
+
+
+def _pages(graph, root):
+    # [(name, module, [route paths])] of App.tsx's pages
+    text = _read(root, APP)
+    if text is None:
+        return []
+    index = build_index(text)
+    targets = {}
+    for edge in graph.imports_of(APP):
+        if edge.target:
+            for name in edge.names:
+                targets.setdefault(name, edge.target)
+    # Default imports are named by their local binding
+    for name, node in index.bindings.items():
+        specifier = re.search(r'''from\s*['"]([^'"]+)['"]''', index.source(node))
+        if specifier:
+            for edge in graph.imports_of(APP):
+                if edge.specifier == specifier.group(1) and edge.target:
+                    targets.setdefault(name, edge.target)
+    paths = defaultdict(list)
+    for node in index.find('jsx:Route'):
+        source = index.source(node)
+        found = _ROUTE_PATH.search(source)
+        for name in route_pages(index):
+            if found and re.search(r'<%s\b' % re.escape(name), source):
+                paths[name].append(found.group(1))
+    return [(name, targets[name], paths[name]) for name in route_pages(index) if name in targets]
+
+
+def _reachable(graph, entries, stop=()):
+    # Modules reachable from `entries` over value imports, not entering `stop`
+    seen = set()
+    pending = list(entries)
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        for edge in graph.imports_of(path):
+            if edge.target and not edge.type_only and edge.target not in seen and edge.target not in stop:
+                pending.append(edge.target)
+    return seen
+
+
+def _call_sites(graph, root, path, api, modules):
+    # CallSites of API functions in the non-API module `path`
+    names = {}
+    for edge in graph.imports_of(path):
+        if edge.target in api:
+            for name in edge.names:
+                if name in api[edge.target]:
+                    names[name] = edge.target
+    if not names:
+        return []
+    if path not in modules:
+        text = _read(root, path)
+        modules[path] = Module(path, text) if text else None
+    module = modules[path]
+    if module is None:
+        return []
+    return [CallSite(path, module.line(i), callee, names[callee]) for i, callee, _ in module.calls() if callee in names]
+
+
+def analyze(graph, root='.'):
+    api = _api_modules(graph, root)
+    analysis = Analysis(api=api, cache_installed=any(CACHE_MARKER in (_read(root, path) or '') for path in api))
+    pages = _pages(graph, root)
+    page_modules = {module for _, module, _ in pages}
+    shell = _reachable(graph, [APP], stop=page_modules)
+    modules = {}
+    sites = {}
+    for name, page_module, paths in pages:
+        page = Page(name, page_module, paths)
+        for path in sorted(_reachable(graph, [page_module]) | shell):
+            if path in api:
+                continue
+            if path not in sites:
+                sites[path] = _call_sites(graph, root, path, api, modules)
+            for site in sites[path]:
+                label = f'{site.function} ({os.path.splitext(os.path.basename(site.api_module))[0]})'
+                where = f'{site.module}:{site.line}' + (f' {SHELL}' if path in shell else '')
+                for request in api[site.api_module][site.function]:
+                    if request.method != 'GET':
+                        continue
+                    entry = page.endpoints.setdefault(request.endpoint, Endpoint(request.endpoint))
+                    if request.cached:
+                        entry.cached += 1
+                    else:
+                        entry.uncached += 1
+                    if label not in entry.functions:
+                        entry.functions.append(label)
+                    entry.sites.append(where)
+        page.endpoints = dict(sorted(page.endpoints.items(), key=lambda item: (-item[1].cached - item[1].uncached, item[0])))
+        analysis.pages.append(page)
+    return analysis
+
+
+def report(analysis, verbose=False):
+    for page in analysis.pages:
+        if not page.endpoints:
+            continue
+        print(f"{', '.join(page.paths) or '?'} ({page.name}): {len(page.endpoints)} GET endpoints, "
+              f'{page.calls} call sites, {page.saved} shared through the cache')
+        for entry in page.endpoints.values():
+            count = entry.cached + entry.uncached
+            note = f'  {entry.uncached} uncached' if entry.uncached else ''
+            print(f"  {count:3d}  {entry.endpoint:40s} {', '.join(entry.functions)}{note}")
+            if verbose:
+                for site in entry.sites:
+                    print(f'         {site}')
+    calls = sum(page.calls for page in analysis.pages)
+    saved = sum(page.saved for page in analysis.pages)
+    functions = sum(len(functions) for functions in analysis.api.values())
+    state = 'installed' if analysis.cache_installed else 'not installed, run add_api_cache.py'
+    print(f'{len(analysis.pages)} pages, {functions} API functions in {len(analysis.api)} modules: '
+          f'{calls} GET call sites, {saved} of them shared through the cache ({state})')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='List the GET endpoints each page calls and the requests the API cache shares.')
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--page', action='append', default=[], help='only this page component (repeatable)')
+    parser.add_argument('--verbose', action='store_true', help='list every call site')
+    parser.add_argument('--json', action='store_true')
+    parser.add_argument('--cache-dir', default=None, help='cache directory (default: $CODEMODS_CACHE_DIR or .codemods-cache)')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    graph = build_graph(args.root, cache=None if args.no_cache else Cache(args.cache_dir))
+    analysis = analyze(graph, args.root)
+    if args.page:
+        analysis.pages = [page for page in analysis.pages if page.name in args.page]
+    if args.json:
+        data = asdict(analysis)
+        for page, entry in zip(analysis.pages, data['pages']):
+            entry['calls'], entry['saved'] = page.calls, page.saved
+        json.dump(data, sys.stdout, indent=1)
+        print()
+        return 0
+    report(analysis, args.verbose)
+    print(f'analyzed in {(time.perf_counter() - started) * 1000:.0f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import stat
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, writes are still atomic
+    fcntl = None
+
+# Safe file access for the patch tooling.
+#
+# Every edit takes an advisory lock on the target, reads it, writes the new
+# content to a temporary file in the same directory and renames it over the
+# original, so the Vite dev server (or an editor) never sees a half-written
+# file. Right before the rename the file is checked against what was read; if
+# something else changed it in the meantime the edit is refused instead of
+# silently overwriting that change.
+
+
+class FileChangedError(Exception):
+    pass
+
+
+def _fingerprint(path):
+    info = os.stat(path)
+    return info.st_ino, info.st_mtime_ns, info.st_size
+
+
+def _digest(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+@contextmanager
+def locked(path, shared=False):
+    # Lock `path` and yield an open file descriptor for it. Writers replace
+    # the file by rename, so after waiting for the lock make sure the inode
+    # we hold is still the one at `path`; otherwise lock the new one.
+    while True:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+            held = os.fstat(fd)
+            current = os.stat(path)
+        except BaseException:
+            os.close(fd)
+            raise
+        if (held.st_dev, held.st_ino) == (current.st_dev, current.st_ino):
+            break
+        os.close(fd)
+
+    try:
+        yield fd
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(fd)
+
+
+def _read_fd(fd):
+    with open(fd, 'r', encoding='utf-8', closefd=False) as f:
+        f.seek(0)
+        return f.read()
+
+
+def _read_path(path):
+    # Only for re-checking a file we already hold the lock on
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def read_text(path):
+    with locked(path, shared=True) as fd:
+        return _read_fd(fd)
+
+
+def _replace_atomically(path, content):
+    directory, name = os.path.split(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with open(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def edit(path, transform, write=True):
+    # Read `path` under an exclusive lock, pass its content to `transform`
+    # and atomically write the result back if it differs. Returns
+    # (original, new). Raises FileChangedError if the file was modified by
+    # someone else between the read and the write.
+    with locked(path) as fd:
+        before = _fingerprint(path)
+        original = _read_fd(fd)
+        content = transform(original)
+
+        if not write or content == original:
+            return original, content
+
+        if _fingerprint(path) != before:
+            # mtime can move without a real change (touch, editor save of the
+            # same bytes), so only refuse if the content is really different
+            if _digest(_read_path(path)) != _digest(original):
+                raise FileChangedError(f'{path} changed while it was being patched')
+
+        _replace_atomically(path, content)
+        return original, content
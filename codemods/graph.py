@@ -0,0 +1,519 @@
+import argparse
+import json
+import os
+import posixpath
+import re
+import sys
+import time
+from collections import namedtuple
+from dataclasses import dataclass, field
+
+from .cache import Cache, content_hash, fingerprint
+from .tsx import tokenize
+
+# Import graph of the source tree.
+#
+# Every specifier in every module under src/ is resolved the way Vite would
+# resolve it, using the `resolve.alias` map and `resolve.extensions` list
+# read from vite.config.ts: alias prefixes first, then relative paths, then
+# the bare path, each extension in turn, and finally a directory index.
+# Anything else is an external package.
+#
+# Extracting the specifiers (and, in the same pass, the names each module
+# exports) is the only part that reads file contents, so that is what gets
+# cached: the raw edges and exports of every file, stored with the
+# file's stat signature and content hash in the codemods cache directory.
+# A rebuild stats every file and re-reads only those whose signature
+# changed, so rebuilding after one edit costs one parse. Resolution is
+# redone on every build because it depends on which files exist.
+#
+#   python -m codemods.graph                         summary
+#   python -m codemods.graph --imports src/App.tsx   what a module imports
+#   python -m codemods.graph --importers PATH        who imports a module
+#   python -m codemods.graph --unresolved            specifiers that resolve to nothing
+#   python -m codemods.graph --json                  the whole graph
+
+VITE_CONFIG = 'vite.config.ts'
+SOURCE_ROOT = 'src'
+
+# Vite's own defaults, for when vite.config.ts doesn't set resolve.extensions
+DEFAULT_EXTENSIONS = ['.mjs', '.js', '.mts', '.ts', '.jsx', '.tsx', '.json']
+
+# Files whose imports are followed; everything else is only ever a target
+MODULE_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.mts')
+
+CACHE_NAME = 'import-graph'
+
+# specifier: the string as written; names: the exports it uses ('default',
+# a named export, or '*' for the whole namespace); offset: where the
+# specifier string starts in the file
+RawEdge = namedtuple('RawEdge', 'specifier kind names type_only offset')
+
+# name: the exported name ('default' for a default export); kind: 'value' or
+# 'type' for `export <declaration>`, 'list' for an entry of `export { ... }`,
+# 'reexport' for an entry of `export { ... } from`, 'namespace' for
+# `export * as ns from`, 'default'; offset: where the `export` keyword starts, or for list entries
+# where the entry starts
+RawExport = namedtuple('RawExport', 'name kind offset')
+
+_DECLARATION_MODIFIERS = ('declare', 'async', 'abstract')
+_VALUE_DECLARATIONS = ('function', 'class', 'enum', 'const', 'let', 'var', 'namespace')
+
+_VERSION_SUFFIX = re.compile(r'@\d[\w.+-]*$')
+
+
+@dataclass
+class Edge:
+    source: str
+    specifier: str
+    kind: str          # 'import', 'export' (re-export) or 'dynamic'
+    names: tuple
+    type_only: bool
+    offset: int
+    target: str = None     # resolved path relative to the repository root
+    package: str = None    # external package name, without a version suffix
+
+
+@dataclass
+class ViteResolve:
+    aliases: dict = field(default_factory=dict)
+    extensions: list = field(default_factory=lambda: list(DEFAULT_EXTENSIONS))
+
+
+def _string_value(text, token):
+    return text[token.start + 1:token.end - 1]
+
+
+def read_vite_config(path=VITE_CONFIG, root='.'):
+    # Pull resolve.alias and resolve.extensions out of vite.config.ts.
+    # path.resolve(__dirname, './x') values become paths relative to `root`.
+    config = ViteResolve()
+    try:
+        with open(os.path.join(root, path), encoding='utf-8') as f:
+            text = f.read()
+    except OSError:
+        return config
+
+    tokens = [token for token in tokenize(text, jsx=False) if token.kind != 'comment']
+    values = [text[token.start:token.end] for token in tokens]
+
+    def block(start):
+        # Tokens of the bracketed block opening at `start`
+        depth = 0
+        for index in range(start, len(tokens)):
+            if tokens[index].kind == 'open':
+                depth += 1
+            elif tokens[index].kind == 'close':
+                depth -= 1
+                if depth == 0:
+                    return range(start + 1, index)
+        return range(start + 1, len(tokens))
+
+    for index, value in enumerate(values[:-2]):
+        if value == 'extensions' and values[index + 1] == ':' and values[index + 2] == '[':
+            config.extensions = [
+                _string_value(text, tokens[inner]) for inner in block(index + 2) if tokens[inner].kind == 'string'
+            ]
+        elif value == 'alias' and values[index + 1] == ':' and values[index + 2] == '{':
+            inner = list(block(index + 2))
+            position = 0
+            while position < len(inner):
+                key_token = tokens[inner[position]]
+                if key_token.kind in ('string', 'name') and position + 1 < len(inner) and values[inner[position + 1]] == ':':
+                    key = _string_value(text, key_token) if key_token.kind == 'string' else values[inner[position]]
+                    # The value runs to the next top-level comma
+                    depth = 0
+                    strings = []
+                    position += 2
+                    while position < len(inner):
+                        token = tokens[inner[position]]
+                        if token.kind == 'open':
+                            depth += 1
+                        elif token.kind == 'close':
+                            depth -= 1
+                        elif depth == 0 and values[inner[position]] == ',':
+                            break
+                        elif token.kind == 'string':
+                            strings.append(_string_value(text, token))
+                        position += 1
+                    if strings:
+                        config.aliases[key] = posixpath.normpath(posixpath.join(*strings))
+                position += 1
+
+    return config
+
+
+def _import_names(tokens, values, first, last):
+    # Export names used by `import ... from` between token indexes first..last
+    names = []
+    in_braces = False
+    index = first
+    while index < last:
+        value = values[index]
+        if value == '{':
+            in_braces = True
+        elif value == '}':
+            in_braces = False
+        elif value == '*':
+            names.append('*')
+            index += 2  # `* as ns`
+        elif tokens[index].kind == 'name' and (
+            value not in ('type', 'as', 'from')
+            # `type` is only a keyword when a name follows it
+            or (value == 'type' and values[index + 1] in (',', '}', 'as', 'from'))
+        ):
+            names.append(value if in_braces else 'default')
+            if values[index + 1] == 'as':
+                index += 2
+        index += 1
+    return tuple(names)
+
+
+def _destructured_names(tokens, values, end):
+    # Names in `const { a, b: c } = await import(...)`, with `end` at `await`
+    # or `import`; ('*',) when the whole module object is used
+    index = end - 1
+    if values[index] != '=' or values[index - 1] != '}':
+        return ('*',)
+    names = []
+    index -= 2
+    while index >= 0 and values[index] != '{':
+        if tokens[index].kind == 'name' and values[index + 1] in (':', ',', '}') and values[index - 1] != ':':
+            names.append(values[index])
+        index -= 1
+    return tuple(reversed(names))
+
+
+def _export_list(tokens, values, opener, kind):
+    # RawExports for the entries of the `{ ... }` list opening at `opener`
+    exports = []
+    entry = []
+    index = opener + 1
+    while index < len(values) and values[index] != '}':
+        if values[index] == ',':
+            entry = []
+        elif tokens[index].kind == 'name':
+            entry.append(index)
+            # `a as b` exports b; `type a` exports a
+            names = [inner for inner in entry if values[inner] != 'type' or inner == entry[-1]]
+            if names and index + 1 < len(values) and values[index + 1] in (',', '}'):
+                exported = names[-1]
+                exports.append(RawExport(values[exported], kind, tokens[entry[0]].start))
+        index += 1
+    return exports
+
+
+def _exports(tokens, values, index):
+    # RawExports declared by the `export` statement at token `index`
+    offset = tokens[index].start
+    position = index + 1
+    if position >= len(values):
+        return []
+    if values[position] == 'default':
+        return [RawExport('default', 'default', offset)]
+    while position < len(values) and values[position] in _DECLARATION_MODIFIERS:
+        position += 1
+    if position + 2 >= len(values):
+        return []
+
+    keyword = values[position]
+    if keyword == 'type' and values[position + 1] == '{':
+        position += 1
+        keyword = '{'
+    if keyword == '{':
+        close = position
+        while close < len(values) and values[close] != '}':
+            close += 1
+        kind = 'reexport' if close + 1 < len(values) and values[close + 1] == 'from' else 'list'
+        return _export_list(tokens, values, position, kind)
+    if keyword == '*':
+        if values[position + 1] == 'as':
+            return [RawExport(values[position + 2], 'namespace', offset)]
+        return []
+
+    if keyword == 'const' and values[position + 1] == 'enum':
+        position += 1
+    if keyword in _VALUE_DECLARATIONS or keyword in ('interface', 'type'):
+        name = position + 1
+        if values[name] == '*':
+            name += 1
+        if name < len(tokens) and tokens[name].kind == 'name':
+            return [RawExport(values[name], 'type' if keyword in ('interface', 'type') else 'value', offset)]
+    return []
+
+
+def scan_module(text, jsx=True):
+    # (RawEdges, RawExports) for `text`: every import, re-export and dynamic
+    # import, and every name the module exports
+    tokens = [token for token in tokenize(text, jsx) if token.kind != 'comment']
+    values = [text[token.start:token.end] for token in tokens]
+    edges = []
+    exports = []
+
+    for index, value in enumerate(values):
+        if tokens[index].kind != 'name' or value not in ('import', 'export'):
+            continue
+        if index and values[index - 1] == '.':
+            continue
+        following = values[index + 1] if index + 1 < len(values) else None
+
+        if value == 'import' and following == '(':
+            if index + 2 < len(tokens) and tokens[index + 2].kind == 'string':
+                end = index - 1 if index and values[index - 1] == 'await' else index
+                names = _destructured_names(tokens, values, end) if end > 1 else ('*',)
+                edges.append(RawEdge(_string_value(text, tokens[index + 2]), 'dynamic', names, False, tokens[index + 2].start))
+            continue
+        if value == 'import' and following == '.':
+            continue
+        if value == 'export':
+            exports.extend(_exports(tokens, values, index))
+        if value == 'export' and following not in ('{', '*', 'type'):
+            continue
+
+        # Static import or re-export: find the specifier before the statement ends
+        for end in range(index + 1, min(len(tokens), index + 400)):
+            if values[end] == ';' or (tokens[end].kind == 'name' and values[end] in ('import', 'export', 'const', 'function')):
+                break
+            if tokens[end].kind != 'string':
+                continue
+            if values[end - 1] == 'from' or (value == 'import' and end == index + 1):
+                type_only = following == 'type' and values[index + 2] != ','
+                if value == 'import':
+                    names = _import_names(tokens, values, index + 1 + type_only, end - 1)
+                else:
+                    names = tuple(
+                        '*' if values[inner] == '*' else values[inner]
+                        for inner in range(index + 1 + type_only, end - 1)
+                        if (values[inner] == '*' or tokens[inner].kind == 'name')
+                        and values[inner] not in ('as', 'type') and values[inner - 1] != 'as'
+                    )
+                edges.append(RawEdge(_string_value(text, tokens[end]), value, names, type_only, tokens[end].start))
+            break
+
+    return edges, exports
+
+
+def package_name(specifier):
+    # 'lucide-react@0.487.0' -> 'lucide-react', '@radix-ui/react-slot/x' -> '@radix-ui/react-slot'
+    parts = specifier.split('/')
+    name = '/'.join(parts[:2]) if specifier.startswith('@') else parts[0]
+    return _VERSION_SUFFIX.sub('', name)
+
+
+class ImportGraph:
+    def __init__(self, files, edges, config, parsed=0, exports=None):
+        self.files = files              # every file under the source root
+        self.config = config
+        self.parsed = parsed            # modules that had to be read and parsed
+        self.edges = edges              # module path -> [Edge]
+        self.exports = exports or {}    # module path -> [RawExport]
+        self.importers = {}             # target path -> [Edge]
+        self.packages = {}              # package name -> [Edge]
+        self.unresolved = []
+        for module_edges in edges.values():
+            for edge in module_edges:
+                if edge.target:
+                    self.importers.setdefault(edge.target, []).append(edge)
+                elif edge.package:
+                    self.packages.setdefault(edge.package, []).append(edge)
+                else:
+                    self.unresolved.append(edge)
+
+    @property
+    def modules(self):
+        return list(self.edges)
+
+    def imports_of(self, path):
+        return self.edges.get(path, [])
+
+    def importers_of(self, path):
+        return self.importers.get(path, [])
+
+    def reachable(self, entries, include_types=False):
+        # Every file reachable from `entries` over resolved edges
+        seen = set()
+        pending = [entry for entry in entries if entry in self.files]
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            for edge in self.edges.get(path, ()):
+                if edge.target and edge.target not in seen and (include_types or not edge.type_only):
+                    pending.append(edge.target)
+        return seen
+
+    def to_json(self):
+        return {
+            'modules': {
+                path: [
+                    {'specifier': edge.specifier, 'kind': edge.kind, 'names': list(edge.names),
+                     'type_only': edge.type_only, 'target': edge.target, 'package': edge.package}
+                    for edge in module_edges
+                ]
+                for path, module_edges in sorted(self.edges.items())
+            },
+            'exports': {
+                path: [{'name': export.name, 'kind': export.kind} for export in module_exports]
+                for path, module_exports in sorted(self.exports.items())
+            },
+        }
+
+
+def resolve(specifier, source, config, files, source_root=SOURCE_ROOT):
+    # Returns (target path, package); both None when nothing matches
+    specifier = specifier.split('?', 1)[0]
+
+    base = None
+    for alias, replacement in config.aliases.items():
+        if specifier == alias:
+            base = replacement
+            break
+        if specifier.startswith(alias + '/'):
+            base = replacement + specifier[len(alias):]
+            break
+    if base is None and (specifier.startswith(('./', '../')) or specifier in ('.', '..')):
+        base = posixpath.join(posixpath.dirname(source), specifier)
+    if base is None and specifier.startswith('/'):
+        base = specifier.lstrip('/')
+    if base is None:
+        return None, package_name(specifier)
+
+    base = posixpath.normpath(base)
+    if base in files:
+        return base, None
+    for extension in config.extensions:
+        if base + extension in files:
+            return base + extension, None
+    for extension in config.extensions:
+        if f'{base}/index{extension}' in files:
+            return f'{base}/index{extension}', None
+    return None, None
+
+
+def _walk(root, source_root):
+    files = {}
+    for directory, names, filenames in os.walk(os.path.join(root, source_root)):
+        names[:] = [name for name in names if name != 'node_modules' and not name.startswith('.')]
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            relative = os.path.relpath(path, root).replace(os.sep, '/')
+            files[relative] = path
+    return files
+
+
+def build_graph(root='.', source_root=SOURCE_ROOT, config_path=VITE_CONFIG, cache=None):
+    # Build the ImportGraph for `root`. `cache` is a cache.Cache; the per-file
+    # edges and exports are stored in it under CACHE_NAME.
+    config = read_vite_config(config_path, root)
+    files = _walk(root, source_root)
+
+    version = fingerprint(scan_module)
+    stored = cache.load(CACHE_NAME) if cache is not None else None
+    if not isinstance(stored, dict) or stored.get('version') != version or not isinstance(stored.get('files'), dict):
+        stored = {'version': version, 'files': {}}
+    previous = {path: entry for path, entry in stored['files'].items() if isinstance(entry, list) and len(entry) == 5}
+    by_hash = {entry[2]: entry[3:] for entry in previous.values()}
+
+    entries = {}
+    parsed = 0
+    for relative, path in files.items():
+        if not relative.endswith(MODULE_EXTENSIONS):
+            continue
+        try:
+            status = os.stat(path)
+        except OSError:
+            continue
+        signature = (status.st_mtime_ns, status.st_size)
+
+        entry = previous.get(relative)
+        if entry is not None and tuple(entry[:2]) == signature:
+            entries[relative] = entry
+            continue
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+        digest = content_hash(text)
+        scanned = by_hash.get(digest)
+        if scanned is None:
+            # Plain tuples, so the cache doesn't depend on which module
+            # (__main__ or codemods.graph) defined the namedtuples
+            edges, exports = scan_module(text, jsx=relative.endswith(('x', '.js')))
+            scanned = ([tuple(edge) for edge in edges], [tuple(export) for export in exports])
+            parsed += 1
+        entries[relative] = (*signature, digest, *scanned)
+
+    if cache is not None and (parsed or entries.keys() != previous.keys() or any(
+        entries[path] is not previous.get(path) for path in entries
+    )):
+        cache.store(CACHE_NAME, {'version': version, 'files': entries})
+
+    known = set(files)
+    edges = {}
+    exports = {}
+    for relative, entry in entries.items():
+        module_edges = []
+        for raw in entry[3]:
+            raw = RawEdge(*raw)
+            raw = raw._replace(names=tuple(raw.names))
+            target, package = resolve(raw.specifier, relative, config, known, source_root)
+            module_edges.append(Edge(relative, *raw, target=target, package=package))
+        edges[relative] = module_edges
+        exports[relative] = [RawExport(*export) for export in entry[4]]
+
+    return ImportGraph(known, edges, config, parsed, exports)
+
+
+def _print_edges(edges, attribute):
+    for edge in edges:
+        where = getattr(edge, attribute) or edge.package or 'UNRESOLVED'
+        names = ', '.join(edge.names) if edge.names else '-'
+        flag = ' (types)' if edge.type_only else ''
+        print(f"  {edge.kind:<7} {where}  [{names}]{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the import graph of the source tree.')
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--imports', metavar='PATH', help='list what PATH imports')
+    parser.add_argument('--importers', metavar='PATH', help='list the modules importing PATH')
+    parser.add_argument('--unresolved', action='store_true', help='list specifiers that resolve to nothing')
+    parser.add_argument('--json', action='store_true', help='print the whole graph as JSON')
+    parser.add_argument('--cache-dir', default=None, help='cache directory (default: $CODEMODS_CACHE_DIR or .codemods-cache)')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    graph = build_graph(args.root, cache=None if args.no_cache else Cache(args.cache_dir))
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        json.dump(graph.to_json(), sys.stdout, indent=1)
+        print()
+        return 0
+    if args.imports:
+        _print_edges(graph.imports_of(os.path.normpath(args.imports).replace(os.sep, '/')), 'target')
+        return 0
+    if args.importers:
+        for edge in graph.importers_of(os.path.normpath(args.importers).replace(os.sep, '/')):
+            print(f"  {edge.source}  [{', '.join(edge.names) or '-'}]")
+        return 0
+    if args.unresolved:
+        for edge in graph.unresolved:
+            print(f"  {edge.source}: {edge.specifier!r}")
+        return 1 if graph.unresolved else 0
+
+    edge_count = sum(len(module_edges) for module_edges in graph.edges.values())
+    internal = sum(len(edges) for edges in graph.importers.values())
+    print(f"{len(graph.edges)} modules, {len(graph.files)} files, {edge_count} edges "
+          f"({internal} internal, {edge_count - internal - len(graph.unresolved)} external, "
+          f"{len(graph.unresolved)} unresolved), {len(graph.packages)} packages")
+    print(f"built in {elapsed * 1000:.0f} ms, {graph.parsed} modules parsed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
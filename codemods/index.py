@@ -0,0 +1,362 @@
+import bisect
+import re
+from collections import namedtuple
+
+from .tsx import tokenize
+
+# Structural index of a TS/TSX file.
+#
+# One pass over codemods.tsx tokens records, with character offsets:
+#
+#   import      import statements, by module specifier
+#   interface   interface declarations, by name
+#   type        type aliases, by name
+#   component   top-level function components (capitalised `function X` or
+#               `const X = (...) =>`), by name
+#   use*        hook calls, by hook and first bound name, so
+#               `const [columns, setColumns] = useState(...)` is
+#               ('useState', 'columns'); bare calls like useEffect have no name
+#   jsx         JSX elements, by tag name ('' for fragments)
+#
+# Hooks and JSX elements are scoped to the component they sit in. Nodes are
+# kept in a dict keyed by (scope, kind, name), so lookups after the pass are
+# O(1); a query string addresses them as `[Component/]kind[:name][#n]`, e.g.
+# 'ProjectBoard/useState:columns', 'interface:BoardColumnProps',
+# 'BoardColumn/useEffect#1' or 'jsx:button'.
+#
+# Spans cover the whole statement, including a leading `export` and a trailing
+# `;`, but not the indentation before it or the newline after it.
+
+Node = namedtuple('Node', 'kind name start end scope')
+
+_HOOK = re.compile(r'use[A-Z0-9][\w$]*$')
+_QUERY = re.compile(r'(?:(?P<scope>[\w$]+)/)?(?P<kind>[\w$]+)(?::(?P<name>[^#]*))?(?:#(?P<nth>\d+))?$')
+_PAIRS = {')': '(', ']': '[', '}': '{'}
+_DECLARATION_PREFIXES = {'export', 'default', 'declare'}
+_STATEMENT_STARTS = {
+    'import', 'export', 'const', 'let', 'var', 'function', 'interface', 'type',
+    'class', 'enum', 'declare', 'return', 'if', 'for', 'while', 'switch',
+}
+_FUNCTION_STARTS = {'(', 'function', 'async', 'memo', 'forwardRef', 'React'}
+
+
+class Index:
+    def __init__(self, text, jsx=True):
+        self.text = text
+        self.tokens = [token for token in tokenize(text, jsx) if token.kind != 'comment']
+        # Token index of every opening bracket -> token index of its closer
+        self.closers = {}
+        self.openers = {}
+        # (scope, kind, name) -> [Node]; scoped nodes are also filed under scope None
+        self.nodes = {}
+        # Local name bound by an import -> that import's Node
+        self.bindings = {}
+        self._pair()
+        self._scan()
+
+    # Lookups
+
+    def find(self, query):
+        match = _QUERY.match(query)
+        if not match:
+            raise ValueError(f'Bad index query: {query!r}')
+        nodes = self.nodes.get((match['scope'], match['kind'], match['name']), [])
+        if match['nth'] is not None:
+            nth = int(match['nth'])
+            return nodes[nth:nth + 1]
+        return nodes
+
+    def get(self, query):
+        nodes = self.find(query)
+        return nodes[0] if nodes else None
+
+    def source(self, node):
+        return self.text[node.start:node.end]
+
+    def declaration(self, offset):
+        # (start, end) of the top-level declaration whose first token (usually
+        # `export`) starts at `offset`, through its closing brace or `;`
+        if not hasattr(self, '_starts'):
+            self._starts = [token.start for token in self.tokens]
+        i = bisect.bisect_left(self._starts, offset)
+        if i == len(self.tokens) or self._starts[i] != offset:
+            return None
+
+        j = i
+        while self._value(j) in _DECLARATION_PREFIXES or self._value(j) in ('async', 'abstract'):
+            j += 1
+        keyword = self._value(j)
+        if keyword == 'const' and self._value(j + 1) == 'enum':
+            keyword = 'enum'
+        if keyword in ('function', 'class', 'interface', 'enum', 'namespace'):
+            # The body is the first brace block, skipping parameters and
+            # type arguments
+            k = j + 1
+            while k < len(self.tokens) and not (self._value(k) == '{' and k in self.closers):
+                if self._value(k) == ';':
+                    return offset, self.tokens[k].end
+                if self._value(k) == '<':
+                    k = self._skip_generic(k)
+                    continue
+                if k in self.closers:
+                    k = self.closers[k]
+                k += 1
+            if k < len(self.tokens):
+                return offset, self._end_with_semicolon(self.closers[k])
+        end = self._statement_end(j)
+        return offset, self._end_with_semicolon(end)
+
+    # Token helpers
+
+    def _value(self, i):
+        if 0 <= i < len(self.tokens):
+            token = self.tokens[i]
+            return self.text[token.start:token.end]
+        return None
+
+    def _kind(self, i):
+        return self.tokens[i].kind if 0 <= i < len(self.tokens) else None
+
+    def _newline_before(self, i):
+        return '\n' in self.text[self.tokens[i - 1].end:self.tokens[i].start]
+
+    def _is_arrow(self, i):
+        # The `>` of `=>` comes out of the tokenizer as its own punct
+        return self._value(i) == '>' and self._value(i - 1) == '=' and self.tokens[i - 1].end == self.tokens[i].start
+
+    def _pair(self):
+        stack = []
+        for i, token in enumerate(self.tokens):
+            if token.kind == 'open':
+                stack.append(i)
+            elif token.kind == 'close':
+                wanted = _PAIRS[self.text[token.start]]
+                while stack:
+                    opener = stack.pop()
+                    if self.text[self.tokens[opener].start] == wanted:
+                        self.closers[opener] = i
+                        self.openers[i] = opener
+                        break
+
+    def _skip_generic(self, i):
+        # Index after a `<...>` type argument list starting at token i
+        depth = 0
+        while i < len(self.tokens):
+            value = self._value(i)
+            if i in self.closers:
+                i = self.closers[i]
+            elif value == '<':
+                depth += 1
+            elif value == '>' and not self._is_arrow(i):
+                depth -= 1
+                if depth == 0:
+                    return i + 1
+            elif value == ';':
+                break
+            i += 1
+        return i
+
+    def _statement_end(self, i):
+        # Index of the last token of the statement containing token i
+        jsx_depth = 0
+        while i < len(self.tokens):
+            kind = self.tokens[i].kind
+            if i in self.closers:
+                i = self.closers[i]
+            elif kind == 'close':
+                # Closes an enclosing block: the statement ended before it
+                return i - 1
+            elif kind == 'jsx_tag_open':
+                jsx_depth += 1
+            elif kind in ('jsx_self_close', 'jsx_closing_tag'):
+                jsx_depth -= 1
+            elif jsx_depth <= 0 and self._value(i) == ';':
+                return i
+
+            following = i + 1
+            if (
+                jsx_depth <= 0 and following < len(self.tokens) and self._newline_before(following)
+                and self._value(following) in _STATEMENT_STARTS
+            ):
+                return i
+            i += 1
+        return len(self.tokens) - 1
+
+    def _end_with_semicolon(self, i):
+        # End offset of token i, extended over a directly following `;`
+        if self._value(i + 1) == ';':
+            i += 1
+        return self.tokens[i].end
+
+    def _declaration_start(self, i):
+        while self._kind(i - 1) == 'name' and self._value(i - 1) in _DECLARATION_PREFIXES:
+            i -= 1
+        return self.tokens[i].start
+
+    def _add(self, kind, name, start, end, scope):
+        node = Node(kind, name, start, end, scope)
+        self.nodes.setdefault((scope, kind, name), []).append(node)
+        if scope is not None:
+            self.nodes.setdefault((None, kind, name), []).append(node)
+        return node
+
+    # The pass
+
+    def _scan(self):
+        scope = None
+        scope_end = -1
+        elements = []
+        i = 0
+
+        while i < len(self.tokens):
+            token = self.tokens[i]
+            if token.start >= scope_end:
+                scope = None
+
+            if token.kind == 'jsx_tag_open':
+                elements.append((self.text[token.start + 1:token.end], token.start))
+            elif token.kind in ('jsx_self_close', 'jsx_closing_tag') and elements:
+                name, start = elements.pop()
+                self._add('jsx', name, start, token.end, scope)
+
+            if token.kind != 'name' or self._value(i - 1) == '.':
+                i += 1
+                continue
+
+            value = self._value(i)
+            following = self._value(i + 1)
+
+            if value == 'import' and following not in ('(', '.') and scope is None:
+                i = self._import(i)
+                continue
+
+            if value == 'interface' and self._kind(i + 1) == 'name':
+                opener = i + 2
+                while opener < len(self.tokens) and not (self._value(opener) == '{' and opener in self.closers):
+                    opener += 1
+                if opener < len(self.tokens):
+                    self._add('interface', following, self._declaration_start(i),
+                              self.tokens[self.closers[opener]].end, scope)
+                i += 1
+                continue
+
+            if value == 'type' and self._kind(i + 1) == 'name' and self._value(i + 2) in ('=', '<'):
+                end = self._statement_end(i)
+                self._add('type', following, self._declaration_start(i), self.tokens[end].end, scope)
+                i += 1
+                continue
+
+            if scope is None and self._kind(i + 1) == 'name' and following[0].isupper():
+                node = None
+                if value == 'function':
+                    node = self._function_component(i)
+                elif value in ('const', 'let', 'var'):
+                    node = self._const_component(i)
+                if node is not None:
+                    scope, scope_end = node.name, node.end
+                    i += 2
+                    continue
+
+            if _HOOK.match(value) and (following == '(' or following == '<') and self._value(i - 1) != 'function':
+                self._hook(i, scope)
+
+            i += 1
+
+    def _import(self, i):
+        start = self._declaration_start(i)
+        j = i + 1
+        while j < len(self.tokens):
+            kind = self._kind(j)
+            value = self._value(j)
+            if kind == 'string':
+                node = self._add('import', value[1:-1], start, self._end_with_semicolon(j), None)
+                for name in self._imported_names(i + 1, j):
+                    self.bindings[name] = node
+                return j + 1
+            if value == ';' or (kind == 'name' and value in _STATEMENT_STARTS and value != 'type'):
+                break
+            if j in self.closers:
+                j = self.closers[j]
+            j += 1
+        return i + 1
+
+    def _imported_names(self, first, last):
+        names = []
+        for j in range(first, last):
+            if self._kind(j) != 'name':
+                continue
+            value = self._value(j)
+            if value in ('type', 'from', 'as') or self._value(j + 1) == 'as':
+                continue
+            names.append(value)
+        return names
+
+    def _function_component(self, i):
+        # function Name(...) [: ReturnType] { ... }
+        params = i + 2
+        if self._value(params) == '<':
+            params = self._skip_generic(params)
+        if params not in self.closers:
+            return None
+        body = self.closers[params] + 1
+        while body < len(self.tokens) and not (self._value(body) == '{' and body in self.closers):
+            if body in self.closers:
+                body = self.closers[body]
+            elif self._value(body) == ';':
+                return None
+            body += 1
+        if body >= len(self.tokens):
+            return None
+        return self._add('component', self._value(i + 1), self._declaration_start(i),
+                         self.tokens[self.closers[body]].end, None)
+
+    def _const_component(self, i):
+        # const Name[: Type] = (...) => ... / function / memo(...) / forwardRef(...)
+        equals = i + 2
+        while equals < len(self.tokens) and not (self._value(equals) == '=' and not self._is_arrow(equals + 1)):
+            if equals in self.closers:
+                equals = self.closers[equals]
+            elif self._value(equals) == ';':
+                return None
+            equals += 1
+
+        first = self._value(equals + 1)
+        if first not in _FUNCTION_STARTS and not (self._value(equals + 2) == '=' and self._is_arrow(equals + 3)):
+            return None
+        end = self._statement_end(equals + 1)
+        return self._add('component', self._value(i + 1), self._declaration_start(i), self.tokens[end].end, None)
+
+    def _hook(self, i, scope):
+        call = i + 1
+        if self._value(call) == '<':
+            call = self._skip_generic(call)
+        if self._value(call) != '(' or call not in self.closers:
+            return
+        end = self._end_with_semicolon(self.closers[call])
+
+        first = i - 2 if self._value(i - 1) == '.' else i
+        start = self.tokens[first].start
+        name = None
+
+        # const [value, setValue] = useX(...) / const value: T = useX(...)
+        if self._value(first - 1) == '=' and self.text[self.tokens[first - 1].start - 1] not in '=!<>+-*/%&|^?':
+            j = first - 2
+            while j >= 0 and self._value(j) not in ('const', 'let', 'var'):
+                if j in self.openers:
+                    j = self.openers[j]
+                elif self._value(j) in (';', '{', '}') or self._kind(j) == 'close':
+                    j = -1
+                    break
+                j -= 1
+            if j >= 0:
+                start = self._declaration_start(j)
+                for k in range(j + 1, first - 1):
+                    if self._kind(k) == 'name':
+                        name = self._value(k)
+                        break
+
+        self._add(self._value(i), name, start, end, scope)
+
+
+def build_index(text, jsx=True):
+    return Index(text, jsx)
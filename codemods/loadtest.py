@@ -0,0 +1,461 @@
+import argparse
+import asyncio
+import json
+import random
+import ssl
+import sys
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from urllib.parse import quote, urlsplit
+
+from .mockapi import DEFAULT_HOST, DEFAULT_PORT
+
+# Replays the requests a morning login makes, for N users at once.
+#
+# Each simulated user is a browser tab: its own pool of keep-alive
+# connections, at most --connections (6, the browsers' HTTP/1.1 limit per
+# origin) in flight, reused across its sessions. A session runs the phases
+# in SESSION, and each phase runs its chains concurrently the way the app
+# fires them:
+#
+#   login      authService.login, then fetchCurrentUser
+#   dashboard  useDashboardData's Promise.allSettled over the default
+#              widgets, including getTodayEvents' getCurrentUser first
+#   spending   SpendingContext's Promise.all of users, projects, the
+#              current user and tasks
+#
+# A chain stops at its first failure, as an awaited call would throw; the
+# other chains of the phase carry on. A call fails on a non-2xx status or
+# an `ERROR`/`KO` envelope, which apiFetch also throws on.
+#
+# The target is the local mock (python -m codemods.mockapi) unless --url
+# says otherwise. Against the mock each user logs in as a different person,
+# taken from /queries/users-summary; against a real API give --mail and
+# --password for an account every user shares, or --token.
+#
+# Latency is from the moment the app would make the call to the end of the
+# response body, so time spent waiting for a free connection counts. The
+# report gives p50/p95/p99 per endpoint and per phase, and the throughput.
+#
+#   python -m codemods.loadtest --users 200 --ramp 10
+#   python -m codemods.loadtest --users 50 --duration 60 --phases dashboard --json > run.json
+
+DEFAULT_URL = f'http://{DEFAULT_HOST}:{DEFAULT_PORT}'
+BROWSER_CONNECTIONS = 6
+# apiFetch's API_TIMEOUT
+TIMEOUT = 15.0
+# What getTodayEvents sends as tz; the browser's own zone in the app
+TIME_ZONE = 'Europe/Madrid'
+PERCENTILES = (50, 95, 99)
+# Responses that never have a body, whatever their headers say
+NO_BODY = (204, 304)
+
+
+@dataclass(frozen=True)
+class Call:
+    name: str                   # the client function making it
+    method: str
+    path: str                   # {user_id}, {today}, {tomorrow} and {tz} are filled in
+    save: tuple = ()            # (variable, key of the result or None for all of it)
+
+
+LOGIN = Call('login', 'POST', '/auth/login', save=('token', None))
+ME = Call('getCurrentUser', 'GET', '/queries/me', save=('user_id', 'id'))
+
+# phase -> chains run concurrently; each chain's calls run in turn
+SESSION = {
+    'login': (
+        (LOGIN, ME),
+    ),
+    'dashboard': (
+        (Call('getUserWidgets', 'GET', '/queries/me/widgets'),),
+        (Call('getWhatsNew', 'GET', '/queries/whats-new'),),
+        (Call('getWhatsPending', 'GET', '/queries/whats-pending'),),
+        (Call('getTaskCount', 'GET', '/queries/widget-task-count'),),
+        (Call('getPortfolio', 'GET', '/queries/widget-portfolio'),),
+        (Call('getRedZone', 'GET', '/queries/widget-red-zone'),),
+        (Call('getChecklist', 'GET', '/queries/me/checklist'),),
+        (Call('getWhosWhere', 'GET', '/queries/who-is-where'),),
+        (ME, Call('getTodayEvents', 'GET', '/queries/events/user/{user_id}?start={today}&end={tomorrow}&tz={tz}')),
+        (Call('getAssignedTasks', 'GET', '/queries/tasks'),),
+    ),
+    'spending': (
+        (Call('getUsers', 'GET', '/queries/users'),),
+        (Call('getProjects', 'GET', '/queries/projects-summary'),),
+        (ME,),
+        (Call('getTasks', 'GET', '/queries/tasks'),),
+    ),
+}
+
+
+class CallError(Exception):
+    pass
+
+
+# HTTP
+
+@dataclass
+class Target:
+    host: str
+    port: int
+    tls: bool
+    base: str                   # path prefix of the API
+
+    @classmethod
+    def parse(cls, url):
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f'not an http(s) URL: {url}')
+        tls = parts.scheme == 'https'
+        return cls(parts.hostname, parts.port or (443 if tls else 80), tls, parts.path.rstrip('/'))
+
+
+class Pool:
+    # Keep-alive connections to one target, at most `size` in use at once
+    def __init__(self, target, size, context=None):
+        self.target = target
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+        self.context = context
+        self.opened = 0
+
+    async def _open(self):
+        self.opened += 1
+        server_hostname = self.target.host if self.target.tls else None
+        return await asyncio.open_connection(self.target.host, self.target.port, ssl=self.context,
+                                             server_hostname=server_hostname, limit=1024 * 1024)
+
+    async def request(self, method, path, headers, body=None):
+        # (status, body bytes); an idle connection the server has closed
+        # meanwhile is dropped and the request sent on the next one
+        async with self.slots:
+            while self.idle:
+                connection = self.idle.pop()
+                try:
+                    return await self._exchange(connection, method, path, headers, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection[1].close()
+            return await self._exchange(await self._open(), method, path, headers, body)
+
+    async def _exchange(self, connection, method, path, headers, body):
+        reader, writer = connection
+        payload = json.dumps(body).encode('utf-8') if body is not None else b''
+        head = [f'{method} {self.target.base}{path} HTTP/1.1', f'Host: {self.target.host}',
+                'Accept: application/json', 'Connection: keep-alive', f'Content-Length: {len(payload)}']
+        if body is not None:
+            head.append('Content-Type: application/json')
+        head.extend(f'{name}: {value}' for name, value in headers.items())
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload)
+        try:
+            await writer.drain()
+            status, response_headers = _parse_head(await reader.readuntil(b'\r\n\r\n'))
+            while 100 <= status < 200:
+                # Interim responses (100 Continue, 103 Early Hints) precede the real one
+                status, response_headers = _parse_head(await reader.readuntil(b'\r\n\r\n'))
+            if method == 'HEAD' or status in NO_BODY:
+                data = b''
+            elif 'chunked' in response_headers.get('transfer-encoding', '').lower():
+                data = await _read_chunked(reader)
+            elif 'content-length' in response_headers:
+                data = await reader.readexactly(int(response_headers['content-length']))
+            else:
+                # Only the end of the connection ends this body
+                data = await reader.read()
+                response_headers['connection'] = 'close'
+        except BaseException:
+            writer.close()
+            raise
+        if response_headers.get('connection', '').lower() == 'close':
+            writer.close()
+        else:
+            self.idle.append(connection)
+        return status, data
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+def _parse_head(head):
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def _read_chunked(reader):
+    chunks = []
+    while True:
+        size = int((await reader.readline()).split(b';')[0], 16)
+        if size == 0:
+            break
+        chunks.append(await reader.readexactly(size))
+        await reader.readexactly(2)
+    while (await reader.readline()) not in (b'\r\n', b''):
+        pass
+    return b''.join(chunks)
+
+
+# Sessions
+
+@dataclass
+class Results:
+    latencies: dict = field(default_factory=lambda: defaultdict(list))     # endpoint -> seconds
+    phases: dict = field(default_factory=lambda: defaultdict(list))        # phase -> seconds
+    bytes: Counter = field(default_factory=Counter)                        # endpoint -> bytes
+    errors: Counter = field(default_factory=Counter)                       # (endpoint, reason) -> count
+    names: dict = field(default_factory=dict)                              # endpoint -> client functions
+    sessions: int = 0
+    failed_sessions: int = 0
+    connections: int = 0
+    started: float = 0.0
+    finished: float = 0.0
+
+    def record(self, call, seconds, size, error=None):
+        endpoint = f'{call.method} {call.path.split("?")[0]}'
+        self.latencies[endpoint].append(seconds)
+        self.bytes[endpoint] += size
+        self.names.setdefault(endpoint, set()).add(call.name)
+        if error:
+            self.errors[endpoint, error] += 1
+
+
+class User:
+    # One simulated browser: its pool, credentials and session variables
+    def __init__(self, target, results, credentials, connections, timeout, context=None):
+        self.pool = Pool(target, connections, context)
+        self.results = results
+        self.credentials = credentials
+        self.timeout = timeout
+        today = date.today()
+        self.variables = {'today': today.isoformat(), 'tomorrow': (today + timedelta(days=1)).isoformat(),
+                          'tz': quote(TIME_ZONE, safe='')}
+
+    async def call(self, call):
+        path = call.path.format_map(self.variables)
+        headers = {'Authorization': f"Bearer {self.variables['token']}"} if 'token' in self.variables else {}
+        body = None
+        if call is LOGIN:
+            body = {'mail': self.credentials[0], 'password': self.credentials[1], 'remember': False}
+        started = time.perf_counter()
+        size = 0
+        try:
+            status, data = await asyncio.wait_for(self.pool.request(call.method, path, headers, body), self.timeout)
+            size = len(data)
+            seconds = time.perf_counter() - started
+            if not 200 <= status < 300:
+                raise CallError(f'HTTP {status}')
+            try:
+                envelope = json.loads(data) if data else {}
+            except ValueError:
+                raise CallError('invalid JSON') from None
+            if isinstance(envelope, dict) and envelope.get('status') in ('ERROR', 'KO'):
+                raise CallError(envelope['status'])
+        except asyncio.TimeoutError:
+            self.results.record(call, time.perf_counter() - started, size, 'timeout')
+            raise CallError('timeout') from None
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+            self.results.record(call, time.perf_counter() - started, size, e.__class__.__name__)
+            raise CallError(e.__class__.__name__) from None
+        except CallError as e:
+            self.results.record(call, time.perf_counter() - started, size, str(e))
+            raise
+        self.results.record(call, seconds, size)
+        if call.save:
+            name, key = call.save
+            result = envelope.get('result') if isinstance(envelope, dict) else None
+            self.variables[name] = result if key is None else (result or {}).get(key)
+        return envelope
+
+    async def chain(self, calls):
+        for call in calls:
+            await self.call(call)
+
+    async def session(self, phases, think):
+        # False if a phase's chain failed
+        ok = True
+        for name in phases:
+            started = time.perf_counter()
+            outcomes = await asyncio.gather(*(self.chain(chain) for chain in SESSION[name]), return_exceptions=True)
+            self.results.phases[name].append(time.perf_counter() - started)
+            failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+            for outcome in failures:
+                if not isinstance(outcome, CallError):
+                    raise outcome
+            if failures:
+                ok = False
+                if name == 'login':
+                    break
+            if think:
+                await asyncio.sleep(random.expovariate(1 / think))
+        return ok
+
+
+async def discover_users(target, password, context=None):
+    # Login addresses of the mock's users, as the first user sees them
+    results = Results()
+    user = User(target, results, ('', password), 1, TIMEOUT, context)
+    try:
+        await user.call(LOGIN)
+        envelope = await user.call(Call('getUsersSummary', 'GET', '/queries/users-summary'))
+    finally:
+        user.pool.close()
+    return [entry['email'] for entry in envelope.get('result') or () if entry.get('email')]
+
+
+async def run(target, users, phases, sessions=1, duration=None, ramp=0.0, think=0.0, connections=BROWSER_CONNECTIONS,
+              mails=(), password='', token=None, timeout=TIMEOUT, context=None):
+    results = Results()
+    deadline = None
+
+    async def simulate(n):
+        await asyncio.sleep(ramp * n / users if users > 1 else 0)
+        credentials = (mails[n % len(mails)] if mails else '', password)
+        user = User(target, results, credentials, connections, timeout, context)
+        if token:
+            user.variables['token'] = token
+        try:
+            count = 0
+            while (count < sessions) if deadline is None else (time.perf_counter() < deadline):
+                ok = await user.session(phases, think)
+                results.sessions += 1
+                results.failed_sessions += not ok
+                count += 1
+        finally:
+            results.connections += user.pool.opened
+            user.pool.close()
+
+    results.started = time.perf_counter()
+    if duration:
+        deadline = results.started + duration
+    await asyncio.gather(*(simulate(n) for n in range(users)))
+    results.finished = time.perf_counter()
+    return results
+
+
+# Report
+
+def percentile(ordered, p):
+    # Nearest-rank percentile of a sorted list
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, -(-len(ordered) * p // 100) - 1))]
+
+
+def _stats(seconds):
+    ordered = sorted(seconds)
+    stats = {f'p{p}': percentile(ordered, p) * 1000 for p in PERCENTILES}
+    stats['max'] = ordered[-1] * 1000 if ordered else 0.0
+    return stats
+
+
+def summary(results):
+    elapsed = max(results.finished - results.started, 1e-9)
+    requests = sum(len(values) for values in results.latencies.values())
+    errors = defaultdict(dict)
+    for (endpoint, reason), count in results.errors.items():
+        errors[endpoint][reason] = count
+    return {
+        'elapsed': elapsed,
+        'requests': requests,
+        'errors': sum(results.errors.values()),
+        'requests_per_second': requests / elapsed,
+        'sessions': results.sessions,
+        'failed_sessions': results.failed_sessions,
+        'sessions_per_second': results.sessions / elapsed,
+        'connections': results.connections,
+        'endpoints': {
+            endpoint: {'calls': sorted(results.names[endpoint]), 'requests': len(values), 'bytes': results.bytes[endpoint],
+                       'errors': errors.get(endpoint, {}), **_stats(values)}
+            for endpoint, values in sorted(results.latencies.items(), key=lambda item: -len(item[1]))
+        },
+        'phases': {name: {'runs': len(values), **_stats(values)} for name, values in results.phases.items()},
+    }
+
+
+def report(data):
+    columns = '  '.join(f'{f"p{p}":>8}' for p in PERCENTILES)
+    print(f'  {"requests":>8} {"errors":>6}  {columns}  {"max":>8}  {"KB":>9}  endpoint')
+    for endpoint, stats in data['endpoints'].items():
+        errors = sum(stats['errors'].values())
+        times = '  '.join(f"{stats[f'p{p}']:8.1f}" for p in PERCENTILES)
+        print(f"  {stats['requests']:8d} {errors:6d}  {times}  {stats['max']:8.1f}  {stats['bytes'] / 1024:9.1f}  "
+              f"{endpoint} ({', '.join(stats['calls'])})")
+        for reason, count in sorted(stats['errors'].items(), key=lambda item: -item[1]):
+            print(f'  {"":8} {count:6d}  {reason}')
+    print()
+    for name, stats in data['phases'].items():
+        times = '  '.join(f"{stats[f'p{p}']:8.1f}" for p in PERCENTILES)
+        print(f"  {stats['runs']:8d} {'':6}  {times}  {stats['max']:8.1f}  {'':9}  {name} (whole phase)")
+    print()
+    print(f"{data['sessions']} sessions ({data['failed_sessions']} with failures), {data['requests']} requests, "
+          f"{data['errors']} errors in {data['elapsed']:.1f}s: {data['requests_per_second']:.1f} req/s, "
+          f"{data['sessions_per_second']:.2f} sessions/s over {data['connections']} connections (times in ms)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay the dashboard's login request mix for many users and report latencies.")
+    parser.add_argument('--url', default=DEFAULT_URL, help=f'API base URL (default: the local mock, {DEFAULT_URL})')
+    parser.add_argument('--users', type=int, default=20, help='simulated users at once (default: 20)')
+    parser.add_argument('--sessions', type=int, default=1, help='sessions per user (default: 1)')
+    parser.add_argument('--duration', type=float, help='keep starting sessions for this many seconds instead')
+    parser.add_argument('--ramp', type=float, default=0.0, help='spread the users\' first requests over this many seconds')
+    parser.add_argument('--think', type=float, default=0.0, help='mean pause between phases, in seconds')
+    parser.add_argument('--phases', default=','.join(SESSION), help=f"comma-separated phases to run (default: {','.join(SESSION)})")
+    parser.add_argument('--connections', type=int, default=BROWSER_CONNECTIONS, help='connections per user (default: 6)')
+    parser.add_argument('--timeout', type=float, default=TIMEOUT, help='seconds before a request is abandoned (default: 15)')
+    parser.add_argument('--mail', help='log every user in with this address instead of discovering the mock\'s users')
+    parser.add_argument('--password', default='mock')
+    parser.add_argument('--token', help='skip logging in and use this token')
+    parser.add_argument('--insecure', action='store_true', help='do not verify TLS certificates')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    try:
+        target = Target.parse(args.url)
+    except ValueError as e:
+        parser.error(str(e))
+    phases = [name.strip() for name in args.phases.split(',') if name.strip()]
+    unknown = [name for name in phases if name not in SESSION]
+    if unknown:
+        parser.error(f"unknown phases: {', '.join(unknown)} (known: {', '.join(SESSION)})")
+    if args.token:
+        phases = [name for name in phases if name != 'login']
+    elif 'login' not in phases:
+        phases.insert(0, 'login')
+    if args.users < 1 or args.connections < 1:
+        parser.error('--users and --connections must be at least 1')
+    context = None
+    if target.tls:
+        context = ssl.create_default_context()
+        if args.insecure:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+
+    mails = [args.mail] if args.mail else []
+    if not args.mail and not args.token:
+        try:
+            mails = asyncio.run(discover_users(target, args.password, context))
+        except (CallError, OSError) as e:
+            print(f'{args.url}: could not list users to log in as ({e}); is the mock running?', file=sys.stderr)
+            return 1
+    results = asyncio.run(run(target, args.users, phases, args.sessions, args.duration, args.ramp, args.think,
+                              args.connections, mails, args.password, args.token, args.timeout, context))
+    data = summary(results)
+    if args.json:
+        json.dump(data, sys.stdout, indent=1)
+        print()
+    else:
+        report(data)
+    return 1 if data['failed_sessions'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,263 @@
+import os
+import re
+import tomllib
+from dataclasses import dataclass
+from functools import partial
+
+from .cache import Cache
+from .index import build_index
+from .rewrite import rewrite
+from .runner import expand, iter_tasks, summarize
+from .structural import (
+    REGEX_BUDGET, bounded_search, bounded_subn, delete_block, find_block, replace_between, whole_lines,
+)
+
+# Declarative patch manifest (patches.toml) and the per-file planner.
+#
+# The scripts in the repository root used to open, read and rewrite their
+# targets one after another, so a file touched by three scripts was read and
+# written three times. The manifest describes the same patches as data; the
+# planner groups them by target file so each file is read once, run through
+# all of its patches in dependency order, and written once.
+
+MANIFEST_PATH = 'patches.toml'
+
+STEP_FIELDS = {
+    'replace': ('old', 'new'),
+    'regex': ('pattern', 'repl'),
+    'move': ('anchor', 'template'),
+    'delete_block': ('start',),
+    'replace_between': ('start', 'end', 'new'),
+    'delete_node': ('node',),
+    'replace_node': ('node', 'new'),
+}
+
+
+class ManifestError(Exception):
+    pass
+
+
+@dataclass
+class FilePlan:
+    path: str
+    patches: list
+
+
+def load_manifest(path=MANIFEST_PATH):
+    with open(path, 'rb') as f:
+        data = tomllib.load(f)
+
+    patches = data.get('patch', [])
+    seen = set()
+    for patch in patches:
+        for key in ('id', 'script', 'target'):
+            if key not in patch:
+                raise ManifestError(f"Patch is missing '{key}': {patch.get('id', patch)}")
+        if patch['id'] in seen:
+            raise ManifestError(f"Duplicate patch id '{patch['id']}'")
+        seen.add(patch['id'])
+
+        patch.setdefault('after', [])
+        patch.setdefault('step', [])
+        for index, step in enumerate(patch['step']):
+            op = step.get('op')
+            if op not in STEP_FIELDS:
+                raise ManifestError(f"{patch['id']} step {index}: unknown op '{op}'")
+            for key in STEP_FIELDS[op]:
+                if key not in step:
+                    raise ManifestError(f"{patch['id']} step {index}: '{op}' needs '{key}'")
+            if op == 'move' and sum(key in step for key in ('pattern', 'start', 'node')) != 1:
+                raise ManifestError(f"{patch['id']} step {index}: 'move' needs one of 'pattern', 'start' or 'node'")
+
+    for patch in patches:
+        for dependency in patch['after']:
+            if dependency not in seen:
+                raise ManifestError(f"{patch['id']} runs after unknown patch '{dependency}'")
+
+    return patches
+
+
+def select(patches, scripts=None):
+    # Keep only the patches that belong to the given script file names
+    if not scripts:
+        return list(patches)
+    scripts = set(scripts)
+    return [patch for patch in patches if patch['script'] in scripts]
+
+
+def _order(patches):
+    # Stable topological sort: manifest order unless `after` says otherwise.
+    # Dependencies on patches that don't touch this file are ignored.
+    ids = {patch['id'] for patch in patches}
+    pending = list(patches)
+    done = set()
+    ordered = []
+
+    while pending:
+        for index, patch in enumerate(pending):
+            if all(dep in done or dep not in ids for dep in patch['after']):
+                break
+        else:
+            cycle = ', '.join(patch['id'] for patch in pending)
+            raise ManifestError(f'Dependency cycle between patches: {cycle}')
+
+        ordered.append(pending.pop(index))
+        done.add(patch['id'])
+
+    return ordered
+
+
+def build_plan(patches, root='.'):
+    by_path = {}
+    for patch in patches:
+        targets = patch['target']
+        if isinstance(targets, str):
+            targets = [targets]
+
+        paths = {os.path.normpath(path) for target in targets for path in expand(target, root)}
+        for path in sorted(paths):
+            by_path.setdefault(path, []).append(patch)
+
+    return [FilePlan(path, _order(file_patches)) for path, file_patches in by_path.items()]
+
+
+def _regex_flags(step):
+    flags = 0
+    for name in step.get('flags', []):
+        flags |= getattr(re, name)
+    return flags
+
+
+def _block(step):
+    # The selection fields shared by delete_block and structural moves
+    return step['start'], step.get('through'), step.get('opener', '{'), step.get('trailing', '')
+
+
+def _node(content, step):
+    # Span of the index node a step addresses, or None. Like the literal
+    # anchors in the manifest, it includes the indentation before the node.
+    node = build_index(content).get(step['node'])
+    if node is None:
+        return None
+    line_start = content.rfind('\n', 0, node.start) + 1
+    if content[line_start:node.start].strip():
+        return node.start, node.end
+    return line_start, node.end
+
+
+def transform(content, patches):
+    # Run every step of every patch over `content`. Consecutive unguarded
+    # literal replacements, even across patches, go through one rewrite() so
+    # the file is scanned once per batch rather than once per replacement.
+    hits = {patch['id']: [0] * len(patch['step']) for patch in patches}
+    batch = []
+
+    def flush():
+        nonlocal content
+        if not batch:
+            return
+        content, counts = rewrite(content, [(step['old'], step['new']) for _, _, step in batch])
+        for (patch_id, index, _), count in zip(batch, counts):
+            hits[patch_id][index] = count
+        batch.clear()
+
+    for patch in patches:
+        for index, step in enumerate(patch['step']):
+            op = step['op']
+
+            if op == 'replace' and 'unless' not in step:
+                batch.append((patch['id'], index, step))
+                continue
+
+            flush()
+
+            if op == 'replace':
+                if step['unless'] in content:
+                    continue
+                hits[patch['id']][index] = content.count(step['old'])
+                content = content.replace(step['old'], step['new'])
+
+            elif op == 'regex':
+                content, count = bounded_subn(
+                    step['pattern'], step['repl'], content, _regex_flags(step), step.get('timeout', REGEX_BUDGET)
+                )
+                hits[patch['id']][index] = count
+
+            elif op == 'delete_block':
+                content, count = delete_block(content, *_block(step))
+                hits[patch['id']][index] = count
+
+            elif op == 'replace_between':
+                content, count = replace_between(content, step['start'], step['end'], step['new'])
+                hits[patch['id']][index] = count
+
+            elif op in ('delete_node', 'replace_node'):
+                span = _node(content, step)
+                if span:
+                    if op == 'delete_node':
+                        begin, end = whole_lines(content, *span)
+                        content = content[:begin] + content[end:]
+                    else:
+                        content = content[:span[0]] + step['new'] + content[span[1]:]
+                    hits[patch['id']][index] = 1
+
+            elif op == 'move':
+                if 'start' in step or 'node' in step:
+                    span = find_block(content, *_block(step)) if 'start' in step else _node(content, step)
+                    block = content[span[0]:span[1]] if span else None
+                else:
+                    match = bounded_search(
+                        step['pattern'], content, _regex_flags(step), step.get('timeout', REGEX_BUDGET)
+                    )
+                    block = (match.group(1) if match.re.groups else match.group(0)) if match else None
+                if block is not None:
+                    content = content.replace(block, '')
+                    content = content.replace(step['anchor'], step['template'].replace('{block}', block))
+                    hits[patch['id']][index] = 1
+
+    flush()
+    return content, hits
+
+
+def _apply_patches(patches, content):
+    return transform(content, patches)
+
+
+def iter_plan(plan, root='.', write=True, jobs=None, cache=None, diff=False):
+    # Yield one Outcome per file as it completes; Outcome.detail holds the
+    # per-step hit counts
+    tasks = [(file_plan.path, partial(_apply_patches, file_plan.patches)) for file_plan in plan]
+    return iter_tasks(tasks, root, write, jobs, cache, diff)
+
+
+def execute_plan(plan, root='.', write=True, jobs=None, cache=None, diff=False):
+    return list(iter_plan(plan, root, write, jobs, cache, diff))
+
+
+def report(patches, outcomes, dry_run=False):
+    # The runner's file summary, then what each patch did
+    summarize(outcomes, dry_run)
+
+    if dry_run:
+        for patch in patches:
+            hits = sum(sum((outcome.detail or {}).get(patch['id'], ())) for outcome in outcomes)
+            print(f"{patch['id']}: {hits} hits")
+        return
+
+    for patch in patches:
+        applied = any(sum((outcome.detail or {}).get(patch['id'], ())) for outcome in outcomes)
+        if applied and patch.get('message'):
+            print(patch['message'])
+        elif not applied:
+            print(f"{patch['id']}: no anchors matched")
+
+
+def run_script(script, manifest=MANIFEST_PATH, root='.'):
+    # Entry point for the thin wrapper scripts in the repository root
+    patches = select(load_manifest(manifest), [script])
+    if not patches:
+        raise ManifestError(f'No patches for {script} in {manifest}')
+
+    outcomes = execute_plan(build_plan(patches, root), root, cache=Cache())
+    report(patches, outcomes)
+    return outcomes
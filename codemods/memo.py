@@ -0,0 +1,785 @@
+import argparse
+import bisect
+import contextlib
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from functools import partial
+
+from .cache import Cache
+from .graph import build_graph
+from .index import build_index
+from .routes import react_import
+from .runner import TransformError, iter_tasks, stream_diffs, summarize
+
+# React.memo for the board's hot components, and stable handlers for them.
+#
+# ProjectBoard re-renders on every state change, and so does every
+# BoardColumn and ImprovedTaskCard under it. This codemod:
+#
+#   memoizes   each component in MEMOIZED:
+#                export function TaskCard({ ... }: TaskCardProps) { ... }
+#              becomes
+#                function areTaskCardPropsEqual(prev: TaskCardProps, next: TaskCardProps) { ... }
+#                export const TaskCard = React.memo(function TaskCard({ ... }: TaskCardProps) { ... }, areTaskCardPropsEqual);
+#              The comparator is generated from the props interface: object
+#              props (task, column) are compared field by field, so an equal
+#              copy doesn't re-render the card, everything else by identity.
+#
+#   hoists     every handler that reaches a memoized component's props into
+#              useCallback. Each element rendering a memoized component is
+#              found over the import graph, and each prop value is traced
+#              back through the component rendering it: a `const handle =
+#              (...) => ...` in that component is wrapped in useCallback, with
+#              dependencies taken from the component-level names its body
+#              uses (setters and refs excluded, since they never change); a
+#              prop passed straight through is followed to that component's
+#              own callers, so MyTasksBoard's timer handlers are hoisted for
+#              TaskCard via Column. A handler whose dependencies are declared
+#              after it is left alone, since the dependency array would read
+#              them before they exist.
+#
+# Whatever still hands a memoized component a new value on every render is
+# reported: inline functions and object literals, functions declared with
+# `function` inside the component, handlers that could not be hoisted, and
+# calls (which only matter if they return an object). So are useCallback and
+# useMemo values whose dependencies keep changing: state such as the board's
+# `columns` changes on every drag, so a handler depending on it is new each
+# time and the memo never holds; it should go through setColumns(prev => ...)
+# with no dependencies instead. A prop the rendering component only calls
+# (`elapsedTime={getElapsedTime()}`) passes the result on, not the function,
+# so the function itself is left alone. So is the opposite
+# mistake, a state updater in a rendering component that mutates objects in
+# place (`col.tasks.push(...)`): the comparator sees the same object and the
+# memoized component never shows the change.
+#
+#   python -m codemods.memo                   report
+#   python -m codemods.memo --write --dry-run
+#   python -m codemods.memo --write
+
+MEMOIZED = {
+    'src/pages/Projects/board/ImprovedTaskCard.tsx': ('ImprovedTaskCard',),
+    'src/pages/Projects/board/BoardColumn.tsx': ('BoardColumn',),
+    'src/pages/Work/MyTasks/TaskCard.tsx': ('TaskCard',),
+}
+
+# Kinds of component-level bindings
+PROP = 'prop'
+STABLE = 'stable'           # useState setters, dispatch, refs, literals
+MEMO = 'memo'               # useCallback / useMemo results
+STATE = 'state'             # state and other hook results: change with the data
+FUNCTION = 'function'       # const f = (...) => ...: a new function every render
+DECLARED = 'declared'       # function f() {} inside the component
+COMPUTED = 'computed'       # anything else, evaluated every render
+
+_HOOK = re.compile(r'use[A-Z0-9][\w$]*$')
+_STABLE_HOOKS = {'useRef'}
+_MEMO_HOOKS = {'useCallback', 'useMemo'}
+# Hooks returning [value, stable function]
+_PAIR_HOOKS = {'useState', 'useReducer', 'useTransition'}
+_LITERALS = {'true', 'false', 'null', 'undefined'}
+_OBJECT_TYPE = re.compile(r'(?:[A-Z][\w$]*|\{[\s\S]*\})$')
+_SKIPPED_ATTRIBUTES = {'key', 'ref'}
+_SETTER = re.compile(r'set[A-Z][\w$]*$')
+_MUTATORS = {'push', 'pop', 'shift', 'unshift', 'splice', 'sort', 'reverse', 'fill', 'copyWithin'}
+
+# The comparators' field-by-field check, shared by every memoized component
+SHALLOW_EQUAL_PATH = 'src/utils/shallowEqual.ts'
+SHALLOW_EQUAL = '''// Same keys with Object.is-equal values; the comparators of memoized components
+// use it for object props
+export const shallowEqual = (a: object | undefined, b: object | undefined) => {
+  if (a === b) return true;
+  if (!a || !b) return false;
+  const keys = Object.keys(a);
+  return keys.length === Object.keys(b).length && keys.every((key) => Object.is((a as any)[key], (b as any)[key]));
+};'''
+
+
+@dataclass
+class Binding:
+    name: str
+    kind: str
+    statement: int              # first token of the declaring statement
+    init: tuple = None          # (first, last) tokens of a const's initializer
+
+
+@dataclass
+class Scope:
+    component: str
+    bindings: dict
+
+
+@dataclass
+class Finding:
+    path: str
+    line: int
+    element: str                # the memoized component rendered
+    prop: str
+    reason: str
+    via: tuple = ()             # Component.prop hops the value was passed through
+    certain: bool = True        # False for calls, which only matter for objects
+
+
+@dataclass
+class Plan:
+    memoize: dict = field(default_factory=dict)     # path -> [component]
+    hoist: dict = field(default_factory=dict)       # path -> {(component, handler): deps}
+    findings: list = field(default_factory=list)
+
+
+class Module:
+    def __init__(self, path, text):
+        self.path = path
+        self.text = text
+        self.index = build_index(text, jsx=path.endswith(('x', '.js')))
+        self.tokens = self.index.tokens
+        self.starts = [token.start for token in self.tokens]
+        self._scopes = {}
+
+    def value(self, i):
+        return self.index._value(i)
+
+    def kind(self, i):
+        return self.index._kind(i)
+
+    def token_at(self, offset):
+        return bisect.bisect_left(self.starts, offset)
+
+    def line(self, offset):
+        return self.text.count('\n', 0, offset) + 1
+
+    def closer(self, i):
+        return self.index.closers.get(i)
+
+    def is_arrow_function(self, i):
+        # Does the expression at token i start with an arrow function?
+        if self.value(i) == 'async':
+            i += 1
+        if self.kind(i) == 'name' and self.value(i + 1) == '=' and self.index._is_arrow(i + 2):
+            return True
+        if self.value(i) != '(' or self.closer(i) is None:
+            return False
+        k = self.closer(i) + 1
+        if self.value(k) == ':':
+            # Return type annotation
+            while k < len(self.tokens) and self.value(k) not in (';', ',') and not (
+                self.value(k) == '=' and self.index._is_arrow(k + 1)
+            ):
+                k = (self.closer(k) or k) + 1
+        return self.value(k) == '=' and self.index._is_arrow(k + 1)
+
+    # Component scopes
+
+    def function_body(self, node):
+        # (params opener, body opener) token indexes of a component's function
+        i = self.token_at(node.start)
+        end = self.token_at(node.end)
+        while i < end:
+            if self.value(i) == '(' and self.closer(i) is not None:
+                k = self.closer(i) + 1
+                if self.value(k) == ':':
+                    while k < end and self.value(k) != '{' and not (self.value(k) == '=' and self.index._is_arrow(k + 1)):
+                        k = (self.closer(k) or k) + 1
+                if self.value(k) == '=' and self.index._is_arrow(k + 1):
+                    k += 2
+                if self.value(k) == '{' and self.closer(k) is not None:
+                    return i, k
+            i += 1
+        return None
+
+    def scope(self, component):
+        if component not in self._scopes:
+            self._scopes[component] = self._scan_scope(component)
+        return self._scopes[component]
+
+    def _scan_scope(self, component):
+        node = self.index.get(f'component:{component}')
+        found = node and self.function_body(node)
+        if not found:
+            return None
+        params, body = found
+        bindings = {}
+        opener = params + 1
+        if self.value(opener) == '{':
+            for name in self.pattern_names(opener):
+                bindings[name] = Binding(name, PROP, params)
+        elif self.kind(opener) == 'name':
+            bindings[self.value(opener)] = Binding(self.value(opener), PROP, params)
+
+        i = body + 1
+        closer = self.closer(body)
+        while i < closer:
+            end = max(self.index._statement_end(i), i)
+            self._declare(i, min(end, closer - 1), bindings)
+            i = end + 1
+        return Scope(component, bindings)
+
+    def _declare(self, first, last, bindings):
+        keyword = self.value(first)
+        if keyword in ('function', 'async') and self.kind(first + 1) == 'name':
+            name = self.value(first + 2) if keyword == 'async' else self.value(first + 1)
+            bindings[name] = Binding(name, DECLARED, first)
+            return
+        if keyword not in ('const', 'let', 'var'):
+            return
+        target = first + 1
+        if self.value(target) in ('[', '{') and self.closer(target) is not None:
+            names = self.pattern_names(target)
+            after = self.closer(target) + 1
+        else:
+            names = [self.value(target)]
+            after = target + 1
+        equals = after
+        while equals <= last and not (self.value(equals) == '=' and not self.index._is_arrow(equals + 1)):
+            equals = (self.closer(equals) or equals) + 1
+        if equals > last:
+            return
+        init = (equals + 1, last - 1 if self.value(last) == ';' else last)
+        kinds = self._init_kinds(init, len(names), self.value(target) == '[')
+        for name, kind in zip(names, kinds):
+            bindings[name] = Binding(name, kind, first, init if kind in (FUNCTION, MEMO) else None)
+
+    def _init_kinds(self, init, count, array_pattern):
+        first, last = init
+        hook = self.value(first)
+        if hook == 'React' and self.value(first + 1) == '.':
+            hook = self.value(first + 2)
+        if _HOOK.match(hook or ''):
+            if hook in _STABLE_HOOKS:
+                return [STABLE] * count
+            if hook in _MEMO_HOOKS:
+                return [MEMO] * count
+            if hook in _PAIR_HOOKS and array_pattern:
+                return [STATE, STABLE][:count] + [STATE] * (count - 2)
+            return [STATE] * count
+        if self.value(first) == 'function' or self.is_arrow_function(first):
+            return [FUNCTION] * count
+        if first == last and (self.kind(first) in ('string', 'number') or self.value(first) in _LITERALS):
+            return [STABLE] * count
+        return [COMPUTED] * count
+
+    def pattern_names(self, opener):
+        # Names bound by a destructuring pattern starting at token `opener`
+        names = []
+        closer = self.closer(opener)
+        i = opener + 1
+        while i < closer:
+            value = self.value(i)
+            if value == '=':
+                # Skip a default value
+                while i < closer and self.value(i) != ',':
+                    i = (self.closer(i) or i) + 1
+                continue
+            if self.kind(i) == 'name' and self.value(i + 1) in (',', '}', ']', '=') or (
+                self.kind(i) == 'name' and i + 1 == closer
+            ):
+                names.append(value)
+            i += 1
+        return names
+
+    def references(self, first, last):
+        # [(token, name)] of the free names an expression reads, and the
+        # names it declares itself (parameters, locals)
+        shadowed = set()
+        for i in range(first, last + 1):
+            value = self.value(i)
+            if value in ('(', '[', '{') and self.closer(i) is not None:
+                before = self.value(i - 1)
+                if (value == '(' and (self.is_arrow_function(i) or before == 'function'
+                                      or self.value(i - 2) == 'function')) or before in ('const', 'let', 'var'):
+                    shadowed.update(self.value(k) for k in range(i + 1, self.closer(i)) if self.kind(k) == 'name')
+            elif self.kind(i) == 'name' and (
+                self.value(i - 1) in ('const', 'let', 'var', 'function')
+                or self.value(i + 1) == '=' and self.index._is_arrow(i + 2)
+            ):
+                shadowed.add(value)
+
+        names = []
+        for i in range(first, last + 1):
+            if self.kind(i) != 'name' or self.value(i - 1) == '.':
+                continue
+            value = self.value(i)
+            if value in shadowed or self.value(i + 1) == ':' and self.value(i - 1) in ('{', ','):
+                continue
+            names.append((i, value))
+        return names
+
+    def mutations(self, scope):
+        # [(token, chain, setter)] of `a.b = ...` and `a.b.push(...)` inside
+        # functional state updaters, which change objects the previous
+        # render's props still point at
+        node = self.index.get(f'component:{scope.component}')
+        first, last = self.token_at(node.start), self.token_at(node.end)
+        found = []
+        for i in range(first, last):
+            setter = self.value(i)
+            binding = scope.bindings.get(setter)
+            if binding is None or binding.kind != STABLE or not _SETTER.match(setter) \
+                    or self.value(i - 1) == '.' or self.value(i + 1) != '(' or not self.is_arrow_function(i + 2):
+                continue
+            for k in range(i + 2, self.closer(i + 1)):
+                value = self.value(k)
+                if value == '=' and self.value(k + 1) not in ('=', '>') and self.kind(k - 1) == 'name' \
+                        and self.value(k - 2) == '.':
+                    end = k - 1
+                elif value in _MUTATORS and self.value(k - 1) == '.' and self.value(k + 1) == '(' \
+                        and self.value(k - 3) == '.':
+                    end = k - 2
+                else:
+                    continue
+                root = end
+                while self.value(root - 1) == '.' and self.kind(root - 2) == 'name':
+                    root -= 2
+                chain = self.text[self.tokens[root].start:self.tokens[end].end]
+                found.append((k, chain, setter))
+        return found
+
+    # Elements
+
+    def attributes(self, node):
+        # [(name, (first, last) expression tokens or None)] of a JSX element;
+        # a spread is ('...', tokens)
+        i = self.token_at(node.start) + 1
+        attributes = []
+        while i < len(self.tokens) and self.kind(i) not in ('jsx_tag_end', 'jsx_self_close'):
+            if self.value(i) == '{' and self.closer(i) is not None:
+                attributes.append(('...', (i + 1, self.closer(i) - 1)))
+                i = self.closer(i) + 1
+            elif self.kind(i) == 'name' and self.value(i + 1) == '=':
+                value = i + 2
+                if self.value(value) == '{' and self.closer(value) is not None:
+                    attributes.append((self.value(i), (value + 1, self.closer(value) - 1)))
+                    i = self.closer(value) + 1
+                else:
+                    attributes.append((self.value(i), None))
+                    i = value + 1
+            else:
+                if self.kind(i) == 'name':
+                    attributes.append((self.value(i), None))
+                i += 1
+        return attributes
+
+
+# Analysis
+
+def _deps(module, scope, binding):
+    # Component-level names a handler's body reads that can change
+    first, last = binding.init
+    deps = []
+    for _, name in module.references(first, last):
+        dependency = scope.bindings.get(name)
+        if dependency is None or dependency.kind == STABLE or name == binding.name or name in deps:
+            continue
+        deps.append(name)
+    return deps
+
+
+def _hook_deps(module, binding):
+    # Names in the dependency array of a useCallback / useMemo binding, or
+    # None when it has none
+    first, last = binding.init
+    opener = first
+    while opener <= last and module.value(opener) != '(':
+        opener += 1
+    closer = module.closer(opener)
+    if closer is None or module.value(closer - 1) != ']':
+        return None
+    array = module.index.openers.get(closer - 1)
+    if array is None or module.value(array - 1) != ',':
+        return None
+    return [module.value(i) for i in range(array + 1, closer - 1) if module.kind(i) == 'name' and module.value(i - 1) != '.']
+
+
+def _unstable(name, dependency, kind):
+    # Why a handler depending on `dependency` gets a new identity, or None
+    if kind == STATE:
+        return f'{name} changes whenever {dependency} does; update through the setter\'s prev => ... form instead'
+    if kind in (COMPUTED, DECLARED, FUNCTION):
+        return f'{name} depends on {dependency}, which changes on every render'
+    return None
+
+
+class Analysis:
+    def __init__(self, graph, root='.', memoized=MEMOIZED):
+        self.graph = graph
+        self.root = root
+        self.memoized = memoized
+        self.modules = {}
+        self.plan = Plan({path: list(names) for path, names in memoized.items()})
+        self.requests = {}      # (path, component) -> {handler}
+        self.pending = []       # findings that depend on whether a handler is hoisted
+        self._traced = set()
+
+    def module(self, path):
+        if path not in self.modules:
+            with open(f'{self.root}/{path}', encoding='utf-8') as f:
+                self.modules[path] = Module(path, f.read())
+        return self.modules[path]
+
+    def sites(self, path, component):
+        # (module, jsx node) of every element rendering `component` from `path`
+        importers = {edge.source for edge in self.graph.importers_of(path) if component in edge.names}
+        for source in sorted(importers | {path}):
+            module = self.module(source)
+            for node in module.index.find(f'jsx:{component}'):
+                yield module, node
+
+    def run(self):
+        renderers = set()
+        for path, components in self.memoized.items():
+            for component in components:
+                for module, node in self.sites(path, component):
+                    if node.scope:
+                        renderers.add((module.path, node.scope))
+                    for attribute, expression in module.attributes(node):
+                        if attribute in _SKIPPED_ATTRIBUTES:
+                            continue
+                        self.check(module, node, component, attribute, expression, ())
+        self.resolve_hoists()
+        for path, component in sorted(renderers):
+            module = self.module(path)
+            scope = module.scope(component)
+            for token, chain, setter in module.mutations(scope) if scope else ():
+                self.plan.findings.append(Finding(
+                    path, module.line(module.tokens[token].start), '', chain,
+                    f'mutated in place inside a {setter} updater; a memoized component given it won\'t update'))
+        return self.plan
+
+    def check(self, module, node, element, prop, expression, via):
+        line = module.line(node.start)
+
+        def finding(reason, certain=True):
+            self.plan.findings.append(Finding(module.path, line, element, prop, reason, via, certain))
+
+        if prop == '...':
+            finding('spread props; not checked')
+            return
+        if expression is None:
+            return
+        first, last = expression
+        value = module.value(first)
+        if value in ('function', 'async') or module.is_arrow_function(first):
+            finding('inline function, new on every render')
+            return
+        if value in ('{', '[') and module.closer(first) == last:
+            finding(f"inline {'object' if value == '{' else 'array'} literal, new on every render")
+            return
+        if module.kind(first) == 'jsx_tag_open':
+            finding('inline JSX element, new on every render')
+            return
+        if value == 'new':
+            finding('new object on every render')
+            return
+
+        scope = module.scope(node.scope) if node.scope else None
+        references = module.references(first, last)
+        bare = len(references) == 1 and references[0][0] == first and last in (first, first + 1)
+        flagged = False
+        for i, name in references:
+            binding = scope.bindings.get(name) if scope else None
+            if binding is None:
+                continue
+            # Only the result of a call reaches the element
+            called = module.value(i + 1) == '('
+            if binding.kind == PROP and not called:
+                self.trace(module.path, scope.component, name, element, via + (f'{scope.component}.{name}',))
+            elif binding.kind == FUNCTION and not called:
+                self.requests.setdefault((module.path, scope.component), set()).add(name)
+                self.pending.append((Finding(module.path, line, element, prop, '', via), module.path, scope.component, name))
+            elif binding.kind == MEMO and not called:
+                deps = _hook_deps(module, binding)
+                if deps is None:
+                    finding(f'{name} has no dependency array, so it is new on every render')
+                    flagged = True
+                for dependency in deps or ():
+                    other = scope.bindings.get(dependency)
+                    reason = other and _unstable(name, dependency, other.kind)
+                    if reason:
+                        finding(reason)
+                        flagged = True
+            elif binding.kind == DECLARED:
+                finding(f'function {name} is redeclared on every render')
+                flagged = True
+            elif binding.kind == COMPUTED and bare:
+                finding(f'{name} is recomputed on every render (fine if it is a primitive)', certain=False)
+                flagged = True
+        if not flagged:
+            for i in range(first, last + 1):
+                if module.value(i) == '(' and (module.kind(i - 1) == 'name' and module.value(i - 1) not in ('if', 'typeof')
+                                               or module.value(i - 1) in (')', ']')):
+                    callee = module.value(i - 1)
+                    finding(f'calls {callee}() on every render (fine if it returns a primitive)', certain=False)
+                    break
+
+    def trace(self, path, component, prop, element, via):
+        # A prop passed straight to a memoized component: check what the
+        # component's own callers pass for it
+        key = (path, component, prop)
+        if key in self._traced:
+            return
+        self._traced.add(key)
+        for module, node in self.sites(path, component):
+            for attribute, expression in module.attributes(node):
+                if attribute == prop or attribute == '...':
+                    self.check(module, node, element, attribute, expression, via)
+
+    def resolve_hoists(self):
+        for (path, component), requested in sorted(self.requests.items()):
+            module = self.module(path)
+            scope = module.scope(component)
+            hoisted = set(requested)
+            # Handlers the hoisted ones call must be stable too
+            changed = True
+            while changed:
+                changed = False
+                for name in list(hoisted):
+                    for dependency in _deps(module, scope, scope.bindings[name]):
+                        if scope.bindings[dependency].kind == FUNCTION and dependency not in hoisted:
+                            hoisted.add(dependency)
+                            changed = True
+            blocked = {}
+            changed = True
+            while changed:
+                changed = False
+                for name in sorted(hoisted - blocked.keys()):
+                    binding = scope.bindings[name]
+                    for dependency in _deps(module, scope, binding):
+                        other = scope.bindings[dependency]
+                        if other.kind != PROP and other.statement > binding.statement:
+                            blocked[name] = f'uses {dependency}, which is declared after it'
+                        elif dependency in blocked:
+                            blocked[name] = f'uses {dependency}, which cannot be hoisted'
+                        if name in blocked:
+                            changed = True
+                            break
+            handlers = self.plan.hoist.setdefault(path, {})
+            for name in sorted(hoisted - blocked.keys()):
+                handlers[(component, name)] = tuple(_deps(module, scope, scope.bindings[name]))
+                for dependency in handlers[(component, name)]:
+                    kind = scope.bindings[dependency].kind
+                    if kind in (DECLARED, COMPUTED, STATE):
+                        self.plan.findings.append(Finding(
+                            path, module.line(module.tokens[scope.bindings[name].statement].start), '', name,
+                            f'hoisted, but {_unstable(name, dependency, kind)}', certain=kind == STATE))
+            for finding, source, owner, name in self.pending:
+                if (source, owner) == (path, component) and name in blocked:
+                    finding.reason = f'{name} is recreated on every render; not hoisted: {blocked[name]}'
+                    self.plan.findings.append(finding)
+            if not handlers:
+                del self.plan.hoist[path]
+
+
+def analyze(graph, root='.', memoized=MEMOIZED):
+    return Analysis(graph, root, memoized).run()
+
+
+# Transforms
+
+def _interface_members(module, name):
+    # [(member, type text)] of an interface in the module
+    node = module.index.get(f'interface:{name}')
+    if node is None:
+        return None
+    i = module.token_at(node.start)
+    while module.value(i) != '{':
+        i += 1
+    closer = module.closer(i)
+    members = []
+    k = i + 1
+    while k < closer:
+        if module.kind(k) in ('name', 'string'):
+            member = module.value(k).strip('\'"')
+            colon = k + 1
+            if module.value(colon) == '?':
+                colon += 1
+            if module.value(colon) in (':', '(', '<'):
+                end = colon + 1
+                while end < closer and module.value(end) not in (';', ',') and not module.index._newline_before(end) \
+                        or module.value(end - 1) in ('|', '&', '=>', '>'):
+                    end = (module.closer(end) or end) + 1
+                text = module.text[module.tokens[colon].end:module.tokens[end - 1].end].strip()
+                members.append((member, text if module.value(colon) == ':' else '() => void'))
+                k = end
+                continue
+        k += 1
+    return members
+
+
+def _comparator(component, props_type, members):
+    objects = [member for member, type_text in members if _OBJECT_TYPE.match(type_text)]
+    checks = [
+        f'shallowEqual(prev.{member}, next.{member})' if member in objects else f'prev.{member} === next.{member}'
+        for member, _ in members
+    ]
+    compared = ', '.join(f'`{member}`' for member in objects)
+    comment = f'// Re-render only when a prop changes; {compared} {"is" if len(objects) == 1 else "are"} ' \
+              f'compared field by field,\n// so an equal copy doesn\'t count\n' if objects else \
+              '// Re-render only when a prop changes\n'
+    body = ' &&\n    '.join(checks) or 'true'
+    return (f'{comment}function are{component}PropsEqual(prev: {props_type}, next: {props_type}) {{\n'
+            f'  return (\n    {body}\n  );\n}}\n\n'), bool(objects)
+
+
+def _memoize(module, component):
+    # Edits wrapping one component in React.memo
+    node = module.index.get(f'component:{component}')
+    if node is None:
+        raise TransformError(f'no component {component}')
+    source = module.index.source(node)
+    if re.match(rf'export\s+const\s+{component}\s*=\s*(?:React\.)?memo\(', source):
+        return [], False, False
+    declaration = re.match(rf'export\s+function\s+{component}\s*\(', source)
+    if not declaration:
+        raise TransformError(f'{component} is not declared as `export function {component}(...)`')
+    params, _ = module.function_body(node)
+    inner = module.text[module.tokens[params].end:module.tokens[module.closer(params)].start]
+    props_type = re.search(r':\s*([\w$]+)\s*$', inner)
+    if not props_type:
+        raise TransformError(f'{component} has no named props type')
+    members = _interface_members(module, props_type[1])
+    if members is None:
+        raise TransformError(f'interface {props_type[1]} is not declared in this file')
+
+    react = module.index.bindings.get('React')
+    memo = 'React.memo' if react is not None and re.match(r'import\s+React\b', module.index.source(react)) else 'memo'
+    comparator, shallow = _comparator(component, props_type[1], members)
+    ending = ')' if module.text.startswith(';', node.end) else ');'
+    edits = [
+        (node.start, node.start + declaration.end(),
+         comparator + f'export const {component} = {memo}(function {component}('),
+        (node.end, node.end, f', are{component}PropsEqual{ending}'),
+    ]
+    return edits, shallow, memo == 'memo'
+
+
+def _shallow_equal_import(module, path):
+    # Edit importing shallowEqual from SHALLOW_EQUAL_PATH after the last import
+    specifier = os.path.relpath(os.path.splitext(SHALLOW_EQUAL_PATH)[0], os.path.dirname(path) or '.').replace(os.sep, '/')
+    if not specifier.startswith('.'):
+        specifier = './' + specifier
+    end = max((node.end for (scope, kind, _), nodes in module.index.nodes.items() if kind == 'import' for node in nodes), default=0)
+    statement = f"import {{ shallowEqual }} from '{specifier}';"
+    return (end, end, '\n' + statement) if end else (0, 0, statement + '\n')
+
+
+def memoize_and_hoist(content, path='', components=(), handlers=()):
+    # Wrap `components` in React.memo and the (component, handler, deps)
+    # `handlers` in useCallback
+    module = Module(path, content)
+    edits = []
+    shallow = False
+    react_names = []
+    first_component = None
+    for component in components:
+        result = _memoize(module, component)
+        if not result[0]:
+            continue
+        component_edits, needs_shallow, named_memo = result
+        edits.extend(component_edits)
+        shallow = shallow or needs_shallow
+        if named_memo and 'memo' not in react_names:
+            react_names.append('memo')
+        start = component_edits[0][0]
+        first_component = start if first_component is None else min(first_component, start)
+
+    if shallow and 'shallowEqual' not in module.index.bindings and not re.search(r'\bconst shallowEqual\b', content):
+        edits.append(_shallow_equal_import(module, path))
+
+    for component, name, deps in handlers:
+        scope = module.scope(component)
+        binding = scope.bindings.get(name) if scope else None
+        if binding is None or binding.kind == MEMO:
+            continue
+        if binding.kind != FUNCTION:
+            raise TransformError(f'{component}: {name} is not a `const {name} = (...) => ...` handler')
+        first, last = binding.init
+        start = module.tokens[first].start
+        end = module.tokens[last].end
+        edits.append((start, start, 'useCallback('))
+        edits.append((end, end, f", [{', '.join(deps)}])"))
+        if 'useCallback' not in react_names:
+            react_names.append('useCallback')
+
+    if not edits:
+        return content
+    present = set(module.index.bindings)
+    wanted = [name for name in react_names if name not in present]
+    if wanted:
+        edit = react_import(content, module.index, wanted)
+        if edit is not None:
+            edits.append(edit)
+
+    pieces = []
+    cursor = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+        pieces.append(content[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(content[cursor:])
+    return ''.join(pieces)
+
+
+def tasks(plan):
+    paths = sorted(set(plan.memoize) | set(plan.hoist))
+    return [
+        (path, partial(
+            memoize_and_hoist,
+            path=path,
+            components=tuple(plan.memoize.get(path, ())),
+            handlers=tuple((component, name, deps) for (component, name), deps in sorted(plan.hoist.get(path, {}).items())),
+        ))
+        for path in paths
+    ]
+
+
+def report(plan):
+    print('Memoized:')
+    for path, components in sorted(plan.memoize.items()):
+        print(f"  {', '.join(components)}  ({path})")
+    print('Hoisted into useCallback:')
+    for path, handlers in sorted(plan.hoist.items()):
+        print(f'  {path}')
+        for (component, name), deps in sorted(handlers.items()):
+            print(f"    {component}: {name} [{', '.join(deps)}]")
+    certain = [finding for finding in plan.findings if finding.certain]
+    print(f'Props that still break memoization ({len(certain)}):')
+    for finding in sorted(plan.findings, key=lambda finding: (not finding.certain, finding.path, finding.line)):
+        where = f'<{finding.element} {finding.prop}>' if finding.element else finding.prop
+        via = f" via {' <- '.join(finding.via)}" if finding.via else ''
+        marker = '' if finding.certain else '? '
+        print(f'  {marker}{finding.path}:{finding.line}  {where}{via}: {finding.reason}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Wrap hot components in React.memo and their handlers in useCallback.')
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--write', action='store_true', help='apply the codemod (default: only report)')
+    parser.add_argument('--dry-run', action='store_true', help='with --write, print a unified diff instead')
+    parser.add_argument('--cache-dir', default=None, help='cache directory (default: $CODEMODS_CACHE_DIR or .codemods-cache)')
+    parser.add_argument('--no-cache', action='store_true')
+    args = parser.parse_args(argv)
+
+    graph = build_graph(args.root, cache=None if args.no_cache else Cache(args.cache_dir))
+    plan = analyze(graph, args.root)
+    if not args.write:
+        report(plan)
+        return 0
+
+    shared = os.path.join(args.root, SHALLOW_EQUAL_PATH)
+    if plan.memoize and not args.dry_run and not os.path.exists(shared):
+        os.makedirs(os.path.dirname(shared), exist_ok=True)
+        with open(shared, 'w', encoding='utf-8') as f:
+            f.write(SHALLOW_EQUAL + '\n')
+    outcomes = iter_tasks(tasks(plan), args.root, not args.dry_run, jobs=1, diff=args.dry_run)
+    if args.dry_run:
+        outcomes = stream_diffs(outcomes)
+    with contextlib.redirect_stdout(sys.stderr if args.dry_run else sys.stdout):
+        outcomes = list(outcomes)
+        report(plan)
+        summarize(outcomes, dry_run=args.dry_run)
+    return 1 if any(outcome.error for outcome in outcomes) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
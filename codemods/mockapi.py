@@ -0,0 +1,1432 @@
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from urllib.parse import parse_qsl, urlsplit
+
+from .dataset import APPROVED, CURRENCIES, DENIED, PENDING, PRESETS, Scale, generate, read_jsonl, timestamp as _iso
+
+# A local stand-in for the Workdeck API, for latency and load testing.
+#
+# Serves the GET /queries endpoints src/services/*.ts and the dashboard's
+# dashboardApi.ts call, in the `{status: 'OK', result}` envelope apiFetch
+# unwraps, from seeded synthetic data: the same --seed and scale give the
+# same users, projects and tasks on every run. The dataset has no logged
+# time, so timesheets and time entries are the allocations of the weeks
+# that have started; files and comments are always empty lists, there are
+# no purchases to approve, and file downloads (/queries/file/{token}/{userId})
+# are not served. Point the app at it with
+#
+#   VITE_API_URL=http://localhost:8787 npm run dev
+#
+# and log in with any address (an unknown one logs in as the first user).
+# Tokens are `mock-<user id>`; requests without one get a 401 unless the
+# server runs with --no-auth.
+#
+# Every response waits for a simulated network and backend time: --latency
+# plus a gaussian --jitter, and fails at --error-rate (HTTP 500) or
+# --ko-rate (HTTP 200 with status 'KO', which apiFetch also throws on).
+# --route overrides these for the paths under a prefix:
+#
+#   --route /queries/whats-pending:latency=900,error=0.05
+#
+# With --log each request prints as one line of a waterfall, timed from the
+# first request after a quiet second, so a page load reads as the sequence
+# and overlap of its fetches. GET /__mock/stats returns the counts and
+# server times per endpoint and POST /__mock/reset clears them.
+#
+# Commands (/commands/...) answer OK; the ones the dashboard relies on
+# (events, tasks, expenses, the personal checklist, what's-new dismissals)
+# change the data, so a refetch sees the change.
+#
+# The data comes from codemods/dataset.py: generated at start-up from --seed
+# and the scale options, or loaded from a file it wrote with --data.
+#
+#   python -m codemods.mockapi
+#   python -m codemods.mockapi --users 5000 --tasks 50000 --latency 120 --jitter 40 --log
+#   python -m codemods.mockapi --data large.jsonl.gz
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8787
+TOKEN_PREFIX = 'mock-'
+# A request after this many quiet seconds starts a new waterfall
+WATERFALL_GAP = 1.0
+MAX_BODY = 10 * 1024 * 1024
+
+PURCHASE_CATEGORIES = ('Software', 'Equipment')
+COST_TYPES = ('Personnel', 'Subcontracting', 'Travel', 'Equipment', 'Other')
+LEAVE_DAYS_PER_YEAR = 22
+# Meeting slots /queries/events/recommend-time offers, in hours of the day
+WORKING_HOURS = (9, 18)
+# Widget types as in dashboardApi.ts WIDGET_TYPES
+WIDGETS = ((1, 'large'), (2, 'medium'), (3, 'medium'), (4, 'small'), (5, 'medium'), (7, 'medium'),
+           (8, 'medium'), (9, 'small'), (10, 'small'), (12, 'medium'))
+
+
+def _dmy(day):
+    return day.strftime('%d/%m/%Y')
+
+
+# Data
+
+class Store:
+    # The records by kind and id, with the lookups the endpoints need
+    def __init__(self, records, today=None):
+        self.meta = {}
+        self.items = defaultdict(dict)
+        self.order = defaultdict(list)          # kind -> ids in load order
+        for kind, record in records:
+            if kind == 'meta':
+                self.meta = record
+                continue
+            self.items[kind][record['id']] = record
+            self.order[kind].append(record['id'])
+        # The date the data was built around, so a saved dataset keeps its
+        # overdue tasks and this week's events
+        self.today = today or (date.fromisoformat(self.meta['today']) if 'today' in self.meta else date.today())
+        self.stages = sorted(self.all('stage'), key=lambda stage: stage['position'])
+        self.leave_types = self.all('leaveType')
+        self.dismissed = defaultdict(set)       # user id -> dismissed notification ids
+        self.version = 0
+        self._indexes = None
+
+    def all(self, kind):
+        items = self.items[kind]
+        return [items[i] for i in self.order[kind] if i in items]
+
+    def stage(self, task):
+        return self.items['stage'][task['stageId']]
+
+    def get(self, kind, id):
+        record = self.items[kind].get(id)
+        if record is None:
+            raise ApiError(404, 'NOT_FOUND', f'{kind} {id} not found')
+        return record
+
+    def put(self, kind, record):
+        if record['id'] not in self.items[kind]:
+            self.order[kind].append(record['id'])
+        self.items[kind][record['id']] = record
+        self.changed()
+
+    def delete(self, kind, id):
+        self.get(kind, id)
+        del self.items[kind][id]
+        self.changed()
+
+    def changed(self):
+        self.version += 1
+        self._indexes = None
+
+    @property
+    def indexes(self):
+        if self._indexes is None:
+            indexes = defaultdict(lambda: defaultdict(list))
+            for task in self.all('task'):
+                for user_id in task['participantIds']:
+                    indexes['tasks'][user_id].append(task)
+                indexes['project_tasks'][task['projectId']].append(task)
+            for event in self.all('event'):
+                indexes['events'][event['creatorId']].append(event)
+                for guest in event['guests']:
+                    indexes['events'][guest['userId']].append(event)
+            for expense in self.all('expense'):
+                indexes['expenses'][expense['userId']].append(expense)
+            for allocation in self.all('allocation'):
+                indexes['allocations'][allocation['userId']].append(allocation)
+            for user in self.all('user'):
+                if user['managerId']:
+                    indexes['reports'][user['managerId']].append(user)
+            for project in self.all('project'):
+                for user_id in project['memberIds']:
+                    indexes['projects'][user_id].append(project)
+            self._indexes = indexes
+        return self._indexes
+
+
+class ApiError(Exception):
+    def __init__(self, status, code, message):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+
+# Entities, in the shapes the services' interfaces declare
+
+def _name(user):
+    return f"{user['firstName']} {user['lastName']}"
+
+
+def _user_ref(store, user_id):
+    user = store.items['user'].get(user_id)
+    return {'id': user_id, 'fullName': _name(user) if user else 'Deleted user'}
+
+
+def _project_ref(store, project_id):
+    project = store.items['project'].get(project_id)
+    return {'id': project_id, 'name': project['name']} if project else None
+
+
+def user_summary(user):
+    return {'id': user['id'], 'fullName': _name(user), 'firstName': user['firstName'], 'lastName': user['lastName'],
+            'email': user['email'], 'avatar': None}
+
+
+def user_entity(store, user):
+    department = store.items['department'].get(user['departmentId'], {})
+    office = store.items['office'].get(user['officeId'], {})
+    category = store.items['staffCategory'].get(user['staffCategoryId'], {})
+    return {
+        **user_summary(user),
+        'office': {'id': office.get('id'), 'name': office.get('name')},
+        'department': {'id': department.get('id'), 'name': department.get('name')},
+        'manager': _user_ref(store, user['managerId']) if user['managerId'] else None,
+        'staffCategory': {'id': category.get('id'), 'name': category.get('name')},
+        'costPerHour': f"{category.get('costPerHour', 0):.2f}",
+        'language': {'id': 'en', 'name': 'English', 'code': 'en'},
+        'timeTable': {},
+        'isManager': user['isManager'],
+        'isGuest': False,
+        'companyId': 'mock-company',
+        'timesheetsType': 2,
+        'deleted': False,
+        'lastLogin': _iso(datetime.combine(store.today, datetime.min.time())),
+        'planTime': True,
+        'skills': [
+            {'id': skill['id'], 'name': store.items['skill'][skill['id']]['name'], 'level': skill['level']}
+            for skill in user['skills'] if skill['id'] in store.items['skill']
+        ],
+    }
+
+
+def task_entity(store, task):
+    project = store.items['project'].get(task['projectId'], {})
+    activity = next((a for a in project.get('activities', ()) if a['id'] == task['activityId']), {'id': task['activityId'], 'name': ''})
+    stage = store.stage(task)
+    done = sum(item['completed'] for item in task['checklist'])
+    planned = task['plannedHours']
+    return {
+        'id': task['id'],
+        'name': task['name'],
+        'summary': task['name'],
+        'description': task['description'],
+        'activity': {'id': activity['id'], 'name': activity['name'],
+                     'project': {'id': task['projectId'], 'name': project.get('name', '')}},
+        'column': {'id': stage['id'], 'name': stage['name'], 'color': stage['color'],
+                   'isSystem': stage['systemCode'] is not None, 'systemCode': stage['systemCode']},
+        'startDate': _dmy(date.fromisoformat(task['startDate'])),
+        'endDate': _dmy(date.fromisoformat(task['endDate'])),
+        'importance': task['importance'],
+        'color': project.get('color', stage['color']),
+        'billable': project.get('type') == 'Client',
+        'timesheet': True,
+        'position': task.get('position', 0),
+        'globalPosition': task.get('position', 0),
+        'plannedHours': f'{planned:.2f}',
+        'spentHours': f"{task['spentHours']:.2f}",
+        'availableHours': f"{max(0, planned - task['spentHours']):.2f}",
+        'dedicatedHours': task['spentHours'],
+        'participants': [
+            {'user': _user_ref(store, user_id), 'isOwner': k == 0,
+             'plannedHours': f'{planned / len(task["participantIds"]):.2f}', 'spentHours': '0.00'}
+            for k, user_id in enumerate(task['participantIds'])
+        ],
+        'checklist': task['checklist'],
+        'files': [],
+        'labels': [],
+        'predecessors': [],
+        'successors': [],
+        'numComments': task['numComments'],
+        'numFlags': 0,
+        'numAttachments': 0,
+        'numChecklist': len(task['checklist']),
+        'numChecklistDone': done,
+        'createdByManager': False,
+        # The dashboard's AssignedTask reads these
+        'projectId': task['projectId'],
+        'projectName': project.get('name', ''),
+        'projectColor': project.get('color'),
+        'dueDate': task['endDate'],
+        'status': 'completed' if stage['systemCode'] == 2 else stage['name'].lower(),
+        'priority': ('low', 'medium', 'high')[task['importance'] - 1],
+    }
+
+
+def event_entity(store, event):
+    return {
+        'id': event['id'],
+        'title': event['title'],
+        'description': event.get('description', ''),
+        'startAt': event['startAt'],
+        'endAt': event['endAt'],
+        'address': '',
+        'color': (store.items['project'].get(event['projectId']) or {}).get('color', '#3B82F6'),
+        'secondaryColor': '#DBEAFE',
+        'private': event['private'],
+        'billable': event['billable'],
+        'timesheet': event['billable'],
+        'externalMeeting': False,
+        'createWherebyRoom': False,
+        'planSync': False,
+        'task': {'id': event['taskId'], 'name': store.items['task'][event['taskId']]['name']}
+        if event['taskId'] in store.items['task'] else None,
+        'project': _project_ref(store, event['projectId']) if event['projectId'] else None,
+        'creator': _user_ref(store, event['creatorId']),
+        'guests': [{'user': _user_ref(store, guest['userId']), 'status': guest['status']} for guest in event['guests']],
+        'externalGuests': [],
+        'timezone': 'Europe/Madrid',
+        'isRecurrent': False,
+        'isMasterOfRecurrence': False,
+        'state': 1,
+    }
+
+
+def _currency(code):
+    _, symbol, name = next(currency for currency in CURRENCIES if currency[0] == code)
+    return {'id': code, 'symbol': symbol, 'name': name}
+
+
+def expense_entity(store, expense):
+    return {
+        'id': expense['id'],
+        'creator': _user_ref(store, expense['userId']),
+        'project': _project_ref(store, expense['projectId']) if expense['projectId'] else None,
+        'date': _dmy(date.fromisoformat(expense['date'])),
+        'amount': f"{sum(item['amount'] for item in expense['items']):.2f}",
+        'currency': _currency(expense['currency']),
+        'category': expense['category'],
+        'description': expense['description'],
+        'status': expense['status'],
+        'items': [{**item, 'amount': f"{item['amount']:.2f}"} for item in expense['items']],
+        'files': [],
+    }
+
+
+def leave_entity(store, leave):
+    kind = store.items['leaveType'][leave['leaveTypeId']]
+    user = store.items['user'].get(leave['userId'], {})
+    return {
+        'id': leave['id'],
+        'user': {'id': leave['userId'], 'firstName': user.get('firstName'), 'lastName': user.get('lastName'), 'avatar': None},
+        'startAt': leave['startDate'],
+        'endAt': leave['endDate'],
+        'type': 'leave',
+        'leaveType': {'id': kind['id'], 'name': kind['name'], 'color': kind['color']},
+        'halfDay': leave['halfDay'],
+        'state': ('pending', 'approved', 'denied')[leave['status']],
+        'createdAt': leave['createdAt'],
+    }
+
+
+def _working_days(start, end):
+    # Weekdays in [start, end], ISO dates
+    first, last = date.fromisoformat(start), date.fromisoformat(end)
+    return sum(1 for n in range((last - first).days + 1) if (first + timedelta(days=n)).weekday() < 5)
+
+
+def leave_request_entity(store, leave):
+    # leaveApi.ts's LeaveRequestEntity, where leave_entity is the dashboard's
+    kind = store.items['leaveType'][leave['leaveTypeId']]
+    days = _working_days(leave['startDate'], leave['endDate'])
+    manager = (store.items['user'].get(leave['userId']) or {}).get('managerId')
+    return {
+        'id': leave['id'],
+        'user': _user_ref(store, leave['userId']),
+        'leaveType': {'id': kind['id'], 'name': kind['name'], 'daysPerYear': LEAVE_DAYS_PER_YEAR, 'color': kind['color']},
+        'startDate': _dmy(date.fromisoformat(leave['startDate'])),
+        'endDate': _dmy(date.fromisoformat(leave['endDate'])),
+        'days': days / 2 if leave['halfDay'] != 'D' and days == 1 else days,
+        'status': leave['status'],
+        'comment': '',
+        'approver': _user_ref(store, manager) if manager and leave['status'] != PENDING else None,
+        'createdAt': leave['createdAt'],
+        'updatedAt': leave['createdAt'],
+    }
+
+
+def timesheet_entity(store, allocation):
+    # The dataset has no logged time: each allocation of a week that has
+    # started reads as that week's timesheet, approved once the week is over
+    task = store.items['task'].get(allocation['taskId'], {})
+    project = store.items['project'].get(allocation['projectId'], {})
+    activity = next((a for a in project.get('activities', ()) if a['id'] == task.get('activityId')), {'id': None, 'name': ''})
+    week = date.fromisoformat(allocation['weekStart'])
+    logged = _iso(datetime.combine(min(week + timedelta(days=4), store.today), datetime.min.time()) + timedelta(hours=17))
+    return {
+        'id': allocation['id'],
+        'user': _user_ref(store, allocation['userId']),
+        'date': _dmy(week),
+        'hours': f"{allocation['hours']:.2f}",
+        'task': {'id': allocation['taskId'], 'name': task.get('name', ''),
+                 'activity': {'id': activity['id'], 'name': activity['name'],
+                              'project': {'id': allocation['projectId'], 'name': project.get('name', '')}}},
+        'description': '',
+        'status': APPROVED if week + timedelta(days=7) <= store.today else PENDING,
+        'billable': project.get('type') == 'Client',
+        'createdAt': logged,
+        'updatedAt': logged,
+    }
+
+
+def milestone_entity(store, project, milestone):
+    due = date.fromisoformat(milestone['date'])
+    return {
+        'id': milestone['id'],
+        'name': milestone['name'],
+        'description': '',
+        'deliveryDate': _dmy(due),
+        'alertDays': 0,
+        'alert': {'value': 0, 'text': 'No alert'},
+        'color': project['color'],
+        'project': {'id': project['id'], 'name': project['name']},
+        'done': milestone['done'],
+        'notifications': [],
+    }
+
+
+def project_summary(store, project):
+    return {
+        'id': project['id'],
+        'name': project['name'],
+        'code': project['code'],
+        'color': project['color'],
+        'startDate': _dmy(date.fromisoformat(project['startDate'])),
+        'endDate': _dmy(date.fromisoformat(project['endDate'])),
+        'client': {'id': project['client'], 'name': project['client']},
+        'projectType': {'id': project['type'], 'name': project['type'], 'color': project['typeColor']},
+        'activities': project['activities'],
+        'members': [{'user': _user_ref(store, user_id)} for user_id in project['memberIds']],
+    }
+
+
+def _project_health(store, project):
+    tasks = store.indexes['project_tasks'][project['id']]
+    today = store.today.isoformat()
+    done = sum(1 for task in tasks if store.stage(task)['systemCode'] == 2)
+    late = [task for task in tasks if task['endDate'] < today and store.stage(task)['systemCode'] != 2]
+    progress = round(done * 100 / len(tasks)) if tasks else 0
+    if project['cancelled'] or progress == 100:
+        status = 'completed'
+    elif project['startDate'] > today:
+        status = 'upcoming'
+    elif project['spent'] > project['budget'] or len(late) > len(tasks) / 4:
+        status = 'critical'
+    elif late:
+        status = 'at-risk'
+    else:
+        status = 'on-track'
+    return status, progress, len(tasks) - done, late
+
+
+# Endpoints
+
+ROUTES = []
+
+
+def route(method, template):
+    # Register a handler for `method template`, where {name} matches one
+    # path segment and is passed as a keyword argument
+    pattern = re.compile('^' + re.sub(r'\\\{(\w+)\\\}', r'(?P<\1>[^/]+)', re.escape(template)) + '$')
+
+    def register(handler):
+        ROUTES.append((method, template, pattern, handler))
+        return handler
+    return register
+
+
+@dataclass
+class Request:
+    method: str
+    target: str
+    path: str
+    query: dict
+    headers: dict
+    body: object = None
+    user: dict = None
+
+
+def _between(moment, start, end):
+    return start <= moment[:10] <= end
+
+
+def _range(request, start_key, end_key, dmy):
+    # ISO (start, end) dates from query parameters, by default the next month
+    def parse(value):
+        if dmy:
+            day, month, year = value.split('/')
+            return f'{year}-{month}-{day}'
+        return value[:10]
+    try:
+        return parse(request.query[start_key]), parse(request.query[end_key])
+    except (KeyError, ValueError):
+        raise ApiError(400, 'BAD_REQUEST', f'{start_key} and {end_key} are required') from None
+
+
+@route('POST', '/auth/login')
+def login(store, request):
+    mail = str((request.body or {}).get('mail', '')).lower()
+    users = store.all('user')
+    user = next((user for user in users if user['email'] == mail), users[0] if users else None)
+    if user is None:
+        raise ApiError(401, 'INVALID_CREDENTIALS', 'No users in the mock dataset')
+    return TOKEN_PREFIX + user['id']
+
+
+@route('GET', '/queries/me')
+def me(store, request):
+    return user_entity(store, request.user)
+
+
+@route('GET', '/queries/me/widgets')
+def widgets(store, request):
+    return [{'id': f'widget-{kind}', 'type': kind, 'size': size, 'position': k, 'enabled': True}
+            for k, (kind, size) in enumerate(WIDGETS)]
+
+
+@route('GET', '/queries/me/checklist')
+def checklist(store, request):
+    return {'userChecklist': request.user['checklist'], 'taskChecklist': []}
+
+
+@route('GET', '/queries/whats-new')
+def whats_new(store, request):
+    user = request.user
+    since = _iso(datetime.combine(store.today - timedelta(days=3), datetime.min.time()))
+    dismissed = store.dismissed[user['id']]
+
+    def items(records, kind, message):
+        return [
+            {'id': record['id'], 'notificationId': f"{kind}-{record['id']}", 'message': message(record), 'createdAt': record['createdAt']}
+            for record in records if record['createdAt'] >= since and f"{kind}-{record['id']}" not in dismissed
+        ][:20]
+
+    tasks = store.indexes['tasks'][user['id']]
+    events = [event for event in store.indexes['events'][user['id']] if event['creatorId'] != user['id']]
+    reports = {report['id'] for report in store.indexes['reports'][user['id']]}
+    leave = [leave for leave in store.all('leaveRequest') if leave['userId'] in reports]
+    return {
+        'newTasks': items(tasks, 'task', lambda task: f"You were assigned to {task['name']}"),
+        'newComments': items([task for task in tasks if task['numComments']], 'comment',
+                             lambda task: f"{task['numComments']} comments on {task['name']}"),
+        'newEvents': items(events, 'event', lambda event: f"{_user_ref(store, event['creatorId'])['fullName']} invited you to {event['title']}"),
+        'newLeaveRequests': items(leave, 'leave', lambda leave: f"{_user_ref(store, leave['userId'])['fullName']} requested leave"),
+        'movedTasks': [],
+        'deleteEvents': [],
+    }
+
+
+@route('GET', '/queries/whats-pending')
+def whats_pending(store, request):
+    user = request.user
+    reports = {report['id'] for report in store.indexes['reports'][user['id']]}
+
+    def requester(user_id):
+        other = store.items['user'].get(user_id, {})
+        return {'id': user_id, 'firstName': other.get('firstName'), 'lastName': other.get('lastName')}
+
+    expenses = [expense for expense in store.all('expense') if expense['userId'] in reports and expense['status'] == PENDING]
+    leave = [leave for leave in store.all('leaveRequest') if leave['userId'] in reports and leave['status'] == PENDING]
+    events = [
+        event for event in store.indexes['events'][user['id']]
+        if any(guest['userId'] == user['id'] and guest['status'] == PENDING for guest in event['guests'])
+        and event['startAt'][:10] >= store.today.isoformat()
+    ]
+    return {
+        'pendingExpenses': [{'id': expense['id'], 'title': expense['description'], 'user': requester(expense['userId']),
+                             'createdAt': expense['createdAt'], 'status': 'pending'} for expense in expenses],
+        'pendingLeaveRequests': [{**leave_entity(store, leave), 'user': requester(leave['userId']),
+                                  'reason': store.items['leaveType'][leave['leaveTypeId']]['name']} for leave in leave],
+        'pendingEvents': [{'id': event['id'], 'title': event['title'], 'user': requester(event['creatorId']),
+                           'startAt': event['startAt'], 'status': 'pending'} for event in events],
+        'pendingPurchases': [],
+        'pendingTimesheets': [],
+    }
+
+
+@route('GET', '/queries/widget-portfolio')
+def widget_portfolio(store, request):
+    statuses = Counter(_project_health(store, project)[0] for project in store.indexes['projects'][request.user['id']])
+    total = sum(statuses.values())
+    return {
+        'totalProjects': total,
+        'activeProjects': total - statuses['completed'] - statuses['upcoming'],
+        'completedProjects': statuses['completed'],
+        'onTrack': statuses['on-track'],
+        'atRisk': statuses['at-risk'],
+        'delayed': statuses['critical'],
+    }
+
+
+@route('GET', '/queries/widget-task-count')
+def widget_task_count(store, request):
+    tasks = store.indexes['tasks'][request.user['id']]
+    today = store.today.isoformat()
+    codes = Counter(store.stage(task)['systemCode'] for task in tasks)
+    overdue = sum(1 for task in tasks if task['endDate'] < today and store.stage(task)['systemCode'] != 2)
+    return {'total': len(tasks), 'completed': codes[2], 'todo': codes[1],
+            'inProgress': len(tasks) - codes[1] - codes[2], 'overdue': overdue}
+
+
+def _widget_items(expenses):
+    return [
+        {'id': expense['id'], 'description': expense['description'],
+         'amount': round(sum(item['amount'] for item in expense['items']), 2), 'currency': expense['currency'],
+         'status': ('pending', 'approved', 'rejected')[expense['status']], 'date': expense['date']}
+        for expense in sorted(expenses, key=lambda expense: expense['date'], reverse=True)
+    ]
+
+
+@route('GET', '/queries/widget-expenses')
+def widget_expenses(store, request):
+    items = _widget_items(store.indexes['expenses'][request.user['id']])
+    statuses = Counter(item['status'] for item in items)
+    return {'total': len(items), 'pending': statuses['pending'], 'approved': statuses['approved'],
+            'rejected': statuses['rejected'], 'items': items[:10]}
+
+
+@route('GET', '/queries/widget-purchases')
+def widget_purchases(store, request):
+    purchases = [expense for expense in store.indexes['expenses'][request.user['id']] if expense['category'] in PURCHASE_CATEGORIES]
+    items = _widget_items(purchases)
+    statuses = Counter(item['status'] for item in items)
+    return {'total': len(items), 'pending': statuses['pending'], 'approved': statuses['approved'], 'items': items[:10]}
+
+
+@route('GET', '/queries/widget-milestones')
+def widget_milestones(store, request):
+    today = store.today.isoformat()
+    upcoming, overdue = [], []
+    for project in store.indexes['projects'][request.user['id']]:
+        for milestone in project['milestones']:
+            if milestone['done']:
+                continue
+            entry = {'id': milestone['id'], 'name': milestone['name'], 'projectName': project['name'], 'dueDate': milestone['date']}
+            if milestone['date'] < today:
+                overdue.append(entry)
+            else:
+                upcoming.append({**entry, 'status': 'pending'})
+    return {'upcoming': sorted(upcoming, key=lambda m: m['dueDate'])[:10], 'overdue': sorted(overdue, key=lambda m: m['dueDate'])}
+
+
+@route('GET', '/queries/widget-red-zone')
+def widget_red_zone(store, request):
+    projects = []
+    for project in store.indexes['projects'][request.user['id']]:
+        status, _, _, late = _project_health(store, project)
+        if status not in ('critical', 'at-risk'):
+            continue
+        planned = sum(task['plannedHours'] for task in store.indexes['project_tasks'][project['id']])
+        spent = sum(task['spentHours'] for task in store.indexes['project_tasks'][project['id']])
+        projects.append({
+            'id': project['id'], 'name': project['name'], 'clientName': project['client'],
+            'numLateTasks': len(late), 'numOverdueTasks': len(late), 'numFlags': 0,
+            'numMilestones': sum(1 for m in project['milestones'] if not m['done'] and m['date'] < store.today.isoformat()),
+            'numActiveProjectAlerts': int(project['spent'] > project['budget']),
+            'budgetPlanned': project['budget'], 'budgetSpent': project['spent'],
+            'effortPlannedSeconds': int(planned * 3600), 'effortSpentSeconds': int(spent * 3600),
+        })
+    return projects
+
+
+@route('GET', '/queries/who-is-where')
+def who_is_where(store, request):
+    start = request.query.get('startDate')
+    end = request.query.get('endDate')
+    if start and end:
+        start, end = _range(request, 'startDate', 'endDate', dmy='/' in start)
+    else:
+        start, end = store.today.isoformat(), (store.today + timedelta(days=14)).isoformat()
+    leave = [leave for leave in store.all('leaveRequest') if leave['startDate'] <= end and leave['endDate'] >= start]
+    return {
+        'leaveEvents': [leave_entity(store, leave) for leave in leave if leave['status'] == APPROVED],
+        'leaveRequests': [leave_entity(store, leave) for leave in leave if leave['status'] == PENDING],
+    }
+
+
+@route('GET', '/queries/projects')
+def portfolio_projects(store, request):
+    projects = []
+    for project in store.indexes['projects'][request.user['id']]:
+        status, progress, open_tasks, late = _project_health(store, project)
+        projects.append({'id': project['id'], 'name': project['name'], 'status': status, 'progress': progress,
+                         'openTasks': open_tasks, 'overdueTasks': len(late),
+                         'budget': {'used': project['spent'], 'total': project['budget']}})
+    return projects
+
+
+@route('GET', '/queries/projects-summary')
+def projects_summary(store, request):
+    return [project_summary(store, project) for project in store.all('project') if not project['cancelled']]
+
+
+@route('GET', '/queries/projects/{project_id}/activities')
+def project_activities(store, request, project_id):
+    project = store.get('project', project_id)
+    tasks = store.indexes['project_tasks'][project_id]
+    return [
+        {**activity, 'position': k, 'startDate': _dmy(date.fromisoformat(project['startDate'])),
+         'endDate': _dmy(date.fromisoformat(project['endDate'])), 'participants': [],
+         'tasks': [task_entity(store, task) for task in tasks if task['activityId'] == activity['id']]}
+        for k, activity in enumerate(project['activities'])
+    ]
+
+
+@route('GET', '/queries/gantt/{project_id}')
+def gantt(store, request, project_id):
+    project = store.get('project', project_id)
+    first = min([project['startDate']] + [task['startDate'] for task in store.indexes['project_tasks'][project_id]])
+    last = max([project['endDate']] + [task['endDate'] for task in store.indexes['project_tasks'][project_id]])
+    return {'id': project_id, 'activities': project_activities(store, request, project_id),
+            'start': request.query.get('start', project['startDate']), 'end': request.query.get('end', project['endDate']),
+            'firstDate': first, 'lastDate': last}
+
+
+@route('GET', '/queries/milestones-summary')
+def milestones_summary(store, request):
+    project_id = request.query.get('projectId')
+    return [milestone_entity(store, project, milestone) for project in store.all('project')
+            if project_id in (None, project['id']) for milestone in project['milestones']]
+
+
+@route('GET', '/queries/milestones/{milestone_id}')
+def milestone(store, request, milestone_id):
+    for project in store.all('project'):
+        for milestone in project['milestones']:
+            if milestone['id'] == milestone_id:
+                return milestone_entity(store, project, milestone)
+    raise ApiError(404, 'NOT_FOUND', f'milestone {milestone_id} not found')
+
+
+@route('GET', '/queries/tasks')
+def tasks(store, request):
+    completed = request.query.get('archived') == 'true'
+    return [task_entity(store, task) for task in store.indexes['tasks'][request.user['id']]
+            if (store.stage(task)['systemCode'] == 2) == completed or 'archived' not in request.query]
+
+
+@route('GET', '/queries/tasks/user/{user_id}')
+def user_tasks(store, request, user_id):
+    store.get('user', user_id)
+    return [task_entity(store, task) for task in store.indexes['tasks'][user_id]]
+
+
+@route('GET', '/queries/tasks/{task_id}')
+def task(store, request, task_id):
+    return task_entity(store, store.get('task', task_id))
+
+
+@route('GET', '/queries/task-stages')
+def task_stages(store, request):
+    return [{'id': stage['id'], 'name': stage['name'], 'position': stage['position'], 'color': stage['color'],
+             'isSystem': stage['systemCode'] is not None, 'systemCode': stage['systemCode']} for stage in store.stages]
+
+
+@route('GET', '/queries/events')
+def events(store, request):
+    start, end = _range(request, 'startDate', 'endDate', dmy=True)
+    user_id = request.query.get('userId', request.user['id'])
+    return [event_entity(store, event) for event in store.indexes['events'][user_id] if _between(event['startAt'], start, end)]
+
+
+@route('GET', '/queries/events/user/{user_id}')
+def user_events(store, request, user_id):
+    start, end = _range(request, 'start', 'end', dmy=False)
+    # The dashboard asks for [today, tomorrow] meaning today's events
+    return [event_entity(store, event) for event in store.indexes['events'][user_id]
+            if start <= event['startAt'][:10] < end or start == end == event['startAt'][:10]]
+
+
+@route('GET', '/queries/events/recommend-time')
+def recommend_time(store, request):
+    # Slots of `duration` minutes on `date` and whether every participant
+    # is free; registered before /queries/events/{event_id}, which would
+    # match it too
+    try:
+        day = datetime.strptime(request.query['date'], '%d/%m/%Y')
+        duration = timedelta(minutes=int(request.query.get('duration', 30)))
+    except (KeyError, ValueError):
+        raise ApiError(400, 'BAD_REQUEST', 'date (DD/MM/YYYY) and duration (minutes) are required') from None
+    participants = [user_id for user_id in request.query.get('participants', '').split(',') if user_id]
+    busy = [(event['startAt'], event['endAt']) for user_id in participants or [request.user['id']]
+            for event in store.indexes['events'][user_id]]
+    slots = []
+    start = day + timedelta(hours=WORKING_HOURS[0])
+    while duration and start + duration <= day + timedelta(hours=WORKING_HOURS[1]):
+        begin, end = _iso(start), _iso(start + duration)
+        slots.append({'startTime': begin, 'endTime': end,
+                      'available': not any(taken < end and begin < until for taken, until in busy)})
+        start += timedelta(minutes=30)
+    return {'slots': slots}
+
+
+@route('GET', '/queries/events/{event_id}')
+def event(store, request, event_id):
+    return event_entity(store, store.get('event', event_id))
+
+
+@route('GET', '/queries/expenses')
+def expenses(store, request):
+    query = request.query
+    start, end = (_range(request, 'startDate', 'endDate', dmy=True) if 'startDate' in query and 'endDate' in query
+                  else ('0000-00-00', '9999-99-99'))
+    return [
+        expense_entity(store, expense) for expense in store.all('expense')
+        if start <= expense['date'] <= end
+        and query.get('userId', expense['userId']) == expense['userId']
+        and query.get('projectId', expense['projectId']) == expense['projectId']
+        and ('status' not in query or query['status'] == str(expense['status']))
+    ]
+
+
+@route('GET', '/queries/expenses/{expense_id}')
+def expense(store, request, expense_id):
+    return expense_entity(store, store.get('expense', expense_id))
+
+
+@route('GET', '/queries/expense-stream')
+def expense_stream(store, request):
+    expense = store.get('expense', request.query.get('expenseId', ''))
+    stream = [{'id': f"{expense['id']}-created", 'type': 'created', 'user': _user_ref(store, expense['userId']),
+               'createdAt': expense['createdAt']}]
+    if expense['status'] != PENDING:
+        manager = store.items['user'].get(expense['userId'], {}).get('managerId')
+        stream.append({'id': f"{expense['id']}-reviewed", 'type': 'approved' if expense['status'] == APPROVED else 'denied',
+                       'user': _user_ref(store, manager) if manager else None, 'createdAt': expense['createdAt']})
+    return stream
+
+
+@route('GET', '/queries/users-summary')
+def users_summary(store, request):
+    return [user_summary(user) for user in store.all('user')]
+
+
+@route('GET', '/queries/users')
+def users(store, request):
+    return [user_entity(store, user) for user in store.all('user')]
+
+
+def _working_hours(store, user_ids, start, end, project_id=None):
+    # Allocated hours per user and project for the weeks starting in
+    # [start, end], ISO dates
+    hours = defaultdict(float)
+    for user_id in user_ids:
+        for allocation in store.indexes['allocations'][user_id]:
+            if start <= allocation['weekStart'] <= end and project_id in (None, allocation['projectId']):
+                hours[user_id, allocation['projectId']] += allocation['hours']
+    first, last = (_dmy(date.fromisoformat(day)) for day in (start, end))
+    return [{'userId': user_id, 'startDate': first, 'endDate': last, 'hours': round(total, 2), 'projectId': project}
+            for (user_id, project), total in hours.items()]
+
+
+@route('GET', '/queries/users/working-hours')
+def working_hours(store, request):
+    start, end = _range(request, 'startDate', 'endDate', dmy=True)
+    user_ids = [request.query['userId']] if 'userId' in request.query else store.order['user']
+    return _working_hours(store, user_ids, start, end)
+
+
+@route('POST', '/queries/users/working-hours')
+def working_hours_for(store, request):
+    body = request.body or {}
+    request.query.update((key, body[key]) for key in ('startDate', 'endDate') if isinstance(body.get(key), str))
+    start, end = _range(request, 'startDate', 'endDate', dmy=True)
+    return _working_hours(store, body.get('users') or store.order['user'], start, end, body.get('projectId'))
+
+
+@route('GET', '/queries/users/{user_id}')
+def user(store, request, user_id):
+    return user_entity(store, store.get('user', user_id))
+
+
+@route('GET', '/queries/departments')
+def departments(store, request):
+    members = defaultdict(list)
+    for user in store.all('user'):
+        members[user['departmentId']].append({'id': user['id'], 'fullName': _name(user), 'email': user['email']})
+    return [{'id': department['id'], 'name': department['name'],
+             'manager': _user_ref(store, department['managerId']) if department['managerId'] else None,
+             'members': members[department['id']]} for department in store.all('department')]
+
+
+@route('GET', '/queries/offices')
+def offices(store, request):
+    return [{'id': office['id'], 'name': office['name'], 'address': '', 'city': office['city'],
+             'country': {'id': office['country'], 'name': office['country']}} for office in store.all('office')]
+
+
+@route('GET', '/queries/staff-categories')
+def staff_categories(store, request):
+    return [{**category, 'costPerHour': f"{category['costPerHour']:.2f}"} for category in store.all('staffCategory')]
+
+
+@route('GET', '/queries/skills')
+def skills(store, request):
+    return store.all('skill')
+
+
+@route('GET', '/queries/leave-types')
+def leave_types(store, request):
+    return store.leave_types
+
+
+@route('GET', '/queries/currencies')
+def currencies(store, request):
+    return [_currency(code) for code, _, _ in CURRENCIES]
+
+
+@route('GET', '/queries/cost-types')
+def cost_types(store, request):
+    return [{'id': name.lower(), 'name': name} for name in COST_TYPES]
+
+
+def _dates(request):
+    # ISO (start, end) from optional DD/MM/YYYY startDate and endDate
+    if 'startDate' in request.query and 'endDate' in request.query:
+        return _range(request, 'startDate', 'endDate', dmy=True)
+    return '0000-00-00', '9999-99-99'
+
+
+def _leave_requests(store, request, user_ids=None):
+    start, end = _dates(request)
+    return [leave_request_entity(store, leave) for leave in store.all('leaveRequest')
+            if leave['startDate'] <= end and leave['endDate'] >= start
+            and (user_ids is None or leave['userId'] in user_ids)
+            and request.query.get('status', str(leave['status'])) == str(leave['status'])]
+
+
+@route('GET', '/queries/leave-requests')
+def leave_requests(store, request):
+    return _leave_requests(store, request, {request.query['userId']} if 'userId' in request.query else None)
+
+
+@route('GET', '/queries/leave-requests/pending')
+def pending_leave_requests(store, request):
+    reports = {report['id'] for report in store.indexes['reports'][request.user['id']]}
+    return [leave_request_entity(store, leave) for leave in store.all('leaveRequest')
+            if leave['userId'] in reports and leave['status'] == PENDING]
+
+
+@route('GET', '/queries/me/leave-requests')
+def my_leave_requests(store, request):
+    return _leave_requests(store, request, {request.user['id']})
+
+
+@route('GET', '/queries/me/team/leave-requests')
+def team_leave_requests(store, request):
+    return _leave_requests(store, request, {report['id'] for report in store.indexes['reports'][request.user['id']]})
+
+
+@route('GET', '/queries/leave-working-days')
+def leave_working_days(store, request):
+    start, end = _range(request, 'startDate', 'endDate', dmy=True)
+    return {'days': _working_days(start, end) if start <= end else 0}
+
+
+def _timesheets(store, request, user_ids):
+    start, end = _dates(request)
+    today = store.today.isoformat()
+    project_id = request.query.get('projectId')
+    return [timesheet_entity(store, allocation) for user_id in user_ids
+            for allocation in store.indexes['allocations'][user_id]
+            if start <= allocation['weekStart'] <= min(end, today) and project_id in (None, allocation['projectId'])]
+
+
+@route('GET', '/queries/timesheets')
+@route('GET', '/queries/time-entries')
+def timesheets(store, request):
+    return _timesheets(store, request, [request.query['userId']] if 'userId' in request.query else store.order['user'])
+
+
+@route('GET', '/queries/me/timesheets')
+def my_timesheets(store, request):
+    return _timesheets(store, request, [request.user['id']])
+
+
+@route('GET', '/queries/me/team/timesheets')
+def team_timesheets(store, request):
+    return _timesheets(store, request, [report['id'] for report in store.indexes['reports'][request.user['id']]])
+
+
+@route('GET', '/queries/timesheet-stream')
+def timesheet_stream(store, request):
+    timesheet = timesheet_entity(store, store.get('allocation', request.query.get('timesheetId', '')))
+    stream = [{'id': f"{timesheet['id']}-created", 'type': 'created', 'user': timesheet['user'],
+               'createdAt': timesheet['createdAt']}]
+    if timesheet['status'] == APPROVED:
+        stream.append({'id': f"{timesheet['id']}-approved", 'type': 'approved', 'user': None,
+                       'createdAt': timesheet['updatedAt']})
+    return stream
+
+
+@route('GET', '/queries/files/{entity_type}/{entity_id}')
+@route('GET', '/queries/comments/{entity_type}/{entity_id}')
+def attachments(store, request, **_):
+    # The dataset has no files or comment text
+    return []
+
+
+@route('GET', '/queries/{approval}/{item_id}')
+def approval_details(store, request, approval, item_id):
+    # dashboardApi.ts getApprovalDetails; registered after every other query
+    # so it only sees the paths nothing else matched
+    kinds = {'leave': ('leaveRequest', leave_request_entity), 'expense': ('expense', expense_entity),
+             'timesheet': ('allocation', timesheet_entity), 'event': ('event', event_entity)}
+    if approval not in kinds:
+        raise ApiError(404, 'NOT_FOUND', f'No mock for GET {request.path}')
+    kind, entity = kinds[approval]
+    return entity(store, store.get(kind, item_id))
+
+
+# Commands
+
+def _body_id(request):
+    body = request.body if isinstance(request.body, dict) else {}
+    if not body.get('id'):
+        raise ApiError(400, 'BAD_REQUEST', 'id is required')
+    return body['id']
+
+
+@route('POST', '/commands/sync/create-event')
+def create_event(store, request):
+    body = request.body or {}
+    record = {
+        'id': body.get('id') or str(uuid.uuid4()),
+        'title': body.get('title', 'New event'),
+        'description': body.get('description', ''),
+        'startAt': body.get('startAt', _iso(datetime.now())),
+        'endAt': body.get('endAt', _iso(datetime.now() + timedelta(hours=1))),
+        'creatorId': request.user['id'],
+        'guests': [{'userId': guest.get('id') or guest.get('user', {}).get('id'), 'status': PENDING}
+                   for guest in body.get('guests', []) if isinstance(guest, dict)],
+        'projectId': (body.get('project') or {}).get('id'),
+        'taskId': (body.get('task') or {}).get('id'),
+        'private': bool(body.get('private')),
+        'billable': bool(body.get('billable')),
+        'createdAt': _iso(datetime.now()),
+    }
+    store.put('event', record)
+    return event_entity(store, record)
+
+
+@route('POST', '/commands/sync/update-event')
+def update_event(store, request):
+    record = dict(store.get('event', _body_id(request)))
+    record.update({key: request.body[key] for key in ('title', 'description', 'startAt', 'endAt', 'private', 'billable')
+                   if key in request.body})
+    store.put('event', record)
+    return event_entity(store, record)
+
+
+@route('POST', '/commands/sync/delete-event')
+def delete_event(store, request):
+    store.delete('event', _body_id(request))
+
+
+@route('POST', '/commands/sync/update-task')
+def update_task(store, request):
+    record = dict(store.get('task', _body_id(request)))
+    body = request.body
+    if 'name' in body:
+        record['name'] = body['name']
+    if 'description' in body:
+        record['description'] = body['description']
+    column = (body.get('column') or {}).get('id') if isinstance(body.get('column'), dict) else body.get('column')
+    if column in store.items['stage']:
+        record['stageId'] = column
+    store.put('task', record)
+    return task_entity(store, record)
+
+
+@route('POST', '/commands/sync/delete-task')
+def delete_task(store, request):
+    store.delete('task', _body_id(request))
+
+
+@route('POST', '/commands/sync/approve-expense')
+def approve_expense(store, request):
+    store.put('expense', {**store.get('expense', _body_id(request)), 'status': APPROVED})
+
+
+@route('POST', '/commands/sync/deny-expense')
+def deny_expense(store, request):
+    store.put('expense', {**store.get('expense', _body_id(request)), 'status': DENIED})
+
+
+@route('POST', '/commands/sync/approve-leave-request')
+def approve_leave(store, request):
+    store.put('leaveRequest', {**store.get('leaveRequest', _body_id(request)), 'status': APPROVED})
+
+
+@route('POST', '/commands/sync/deny-leave-request')
+def deny_leave(store, request):
+    store.put('leaveRequest', {**store.get('leaveRequest', _body_id(request)), 'status': DENIED})
+
+
+@route('POST', '/commands/sync/expenses/delete-expense')
+def delete_expense(store, request):
+    store.delete('expense', _body_id(request))
+
+
+@route('POST', '/commands/sync/user/update-checklist')
+def update_checklist(store, request):
+    item_id = _body_id(request)
+    body = request.body
+    user = request.user
+    items = [item for item in user['checklist'] if item['id'] != item_id]
+    existing = next((item for item in user['checklist'] if item['id'] == item_id), None)
+    items.append({'id': item_id, 'description': body.get('description', ''), 'done': bool(body.get('done')),
+                  'createdAt': existing['createdAt'] if existing else _iso(datetime.now())})
+    user['checklist'] = items
+    store.changed()
+
+
+@route('POST', '/commands/sync/user/delete-checklist')
+def delete_checklist(store, request):
+    item_id = _body_id(request)
+    request.user['checklist'] = [item for item in request.user['checklist'] if item['id'] != item_id]
+    store.changed()
+
+
+@route('POST', '/commands/sync/user/clear-completed-checklist')
+def clear_checklist(store, request):
+    request.user['checklist'] = [item for item in request.user['checklist'] if not item['done']]
+    store.changed()
+
+
+@route('POST', '/commands/sync/whats-new/dismiss')
+def dismiss(store, request):
+    store.dismissed[request.user['id']].add(_body_id(request))
+    store.changed()
+
+
+@route('POST', '/commands/sync/whats-new/dismiss/all')
+def dismiss_all(store, request):
+    current = whats_new(store, request)
+    store.dismissed[request.user['id']].update(item['notificationId'] for items in current.values() for item in items)
+    store.changed()
+
+
+# Every other command is accepted and changes nothing
+@route('POST', '/commands/{group}/{command}')
+@route('POST', '/commands/{group}/{section}/{command}')
+def command(store, request, **_):
+    body = request.body if isinstance(request.body, dict) else {}
+    return {'id': body.get('id') or str(uuid.uuid4())} if '/create-' in request.path else None
+
+
+def match(method, path):
+    # (handler, parameters, template) of a request, or None
+    for route_method, template, pattern, handler in ROUTES:
+        if route_method != method:
+            continue
+        found = pattern.match(path)
+        if found:
+            return handler, found.groupdict(), template
+    return None
+
+
+# Faults
+
+@dataclass
+class Fault:
+    latency: float = 0.0        # ms
+    jitter: float = 0.0         # ms, standard deviation
+    error: float = 0.0          # share of requests answered with HTTP 500
+    ko: float = 0.0             # share answered with status 'KO'
+
+    def delay(self, rng):
+        return max(0.0, rng.gauss(self.latency, self.jitter) if self.jitter else self.latency) / 1000
+
+
+_FAULT_KEYS = {'latency': 'latency', 'jitter': 'jitter', 'error': 'error', 'ko': 'ko'}
+
+
+def parse_route_fault(text, default):
+    # '/queries/whats-new:latency=900,error=0.05' -> (prefix, Fault)
+    prefix, _, settings = text.partition(':')
+    if not prefix.startswith('/') or not settings:
+        raise argparse.ArgumentTypeError(f'expected PREFIX:key=value,...; got {text!r}')
+    values = {}
+    for setting in settings.split(','):
+        key, _, value = setting.partition('=')
+        if key.strip() not in _FAULT_KEYS:
+            raise argparse.ArgumentTypeError(f"unknown setting {key!r} (expected {', '.join(_FAULT_KEYS)})")
+        try:
+            values[_FAULT_KEYS[key.strip()]] = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f'{key} needs a number, got {value!r}') from None
+    return prefix, Fault(**{**default.__dict__, **values})
+
+
+# Server
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    errors: int = 0
+    bytes: int = 0
+    server_ms: float = 0.0      # handler and encoding time, without the simulated delay
+
+
+@dataclass
+class MockServer:
+    store: Store
+    fault: Fault = field(default_factory=Fault)
+    routes: list = field(default_factory=list)      # [(prefix, Fault)], longest prefix wins
+    auth: bool = True
+    log: bool = False
+    seed: int = 1
+
+    def __post_init__(self):
+        self.rng = random.Random(self.seed)
+        self.stats = defaultdict(EndpointStats)
+        self.cache = {}                 # (target, user id) -> encoded body, for the current store version
+        self.cache_version = self.store.version
+        self.in_flight = 0
+        self.waterfall_start = None
+        self.last_activity = 0.0
+
+    def fault_for(self, path):
+        matches = [(len(prefix), fault) for prefix, fault in self.routes if path.startswith(prefix)]
+        return max(matches, key=lambda match: match[0])[1] if matches else self.fault
+
+    def authenticate(self, request):
+        header = request.headers.get('authorization', '')
+        token = header[7:] if header.startswith('Bearer ') else header
+        if token.startswith(TOKEN_PREFIX) and token[len(TOKEN_PREFIX):] in self.store.items['user']:
+            return self.store.items['user'][token[len(TOKEN_PREFIX):]]
+        if not self.auth and self.store.order['user']:
+            return self.store.items['user'][self.store.order['user'][0]]
+        return None
+
+    def handle(self, request):
+        # (HTTP status, JSON-ready body, endpoint name); runs the handler
+        # without the simulated delay
+        if request.path == '/__mock/stats':
+            return 200, {name: stats.__dict__ for name, stats in sorted(self.stats.items())}, None
+        if request.path == '/__mock/reset' and request.method == 'POST':
+            self.stats.clear()
+            return 200, {'status': 'OK', 'result': None}, None
+        found = match(request.method, request.path)
+        if found is None:
+            return 404, _error('NOT_FOUND', f'No mock for {request.method} {request.path}'), f'{request.method} (unmatched)'
+        handler, parameters, template = found
+        name = f'{request.method} {template}'
+        if not request.path.startswith('/auth/'):
+            request.user = self.authenticate(request)
+            if request.user is None:
+                return 401, _error('UNAUTHORIZED', 'Missing or unknown token'), name
+        try:
+            return 200, {'status': 'OK', 'result': handler(self.store, request, **parameters)}, name
+        except ApiError as e:
+            return e.status, _error(e.code, str(e)), name
+
+    def encode(self, request, started):
+        fault = self.fault_for(request.path)
+        roll = self.rng.random()
+        if roll < fault.error:
+            return 500, _dumps(_error('MOCK_ERROR', 'Injected server error')), fault, None
+        if roll < fault.error + fault.ko:
+            return 200, _dumps({'status': 'KO', 'result': 'Injected KO response'}), fault, None
+
+        if self.cache_version != self.store.version:
+            self.cache.clear()
+            self.cache_version = self.store.version
+        key = (request.target, request.headers.get('authorization'))
+        if request.method == 'GET' and key in self.cache:
+            status, body, name = self.cache[key]
+        else:
+            status, result, name = self.handle(request)
+            body = _dumps(result)
+            if request.method == 'GET' and status == 200 and name:
+                self.cache[key] = status, body, name
+        return status, body, fault, name
+
+    async def respond(self, request):
+        started = time.perf_counter()
+        if started - self.last_activity > WATERFALL_GAP and not self.in_flight:
+            self.waterfall_start = started
+            if self.log:
+                print(file=sys.stderr)
+        self.in_flight += 1
+        try:
+            status, body, fault, name = self.encode(request, started)
+            handled = time.perf_counter()
+            name = name or f'{request.method} {request.path}'
+            stats = self.stats[name]
+            stats.requests += 1
+            stats.errors += status >= 400 or body.startswith(b'{"status":"KO"')
+            stats.bytes += len(body)
+            stats.server_ms += (handled - started) * 1000
+            await asyncio.sleep(max(0.0, fault.delay(self.rng) - (handled - started)))
+        finally:
+            self.in_flight -= 1
+            self.last_activity = time.perf_counter()
+        if self.log:
+            offset = (started - self.waterfall_start) * 1000
+            took = (self.last_activity - started) * 1000
+            print(f'{offset:8.0f} ms {took:6.0f} ms  {status}  {request.method} {request.target}  {len(body)} B', file=sys.stderr)
+        return status, body
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await _write(writer, 431, _dumps(_error('HEADERS_TOO_LARGE', 'Request headers too large')), {}, False)
+                    break
+                try:
+                    request, keep_alive = _parse_head(head)
+                    length = int(request.headers.get('content-length') or 0)
+                    if not 0 <= length <= MAX_BODY:
+                        raise ValueError('bad Content-Length')
+                    raw = await reader.readexactly(length) if length else b''
+                    request.body = json.loads(raw) if raw.strip() else None
+                except (ValueError, UnicodeDecodeError) as e:
+                    await _write(writer, 400, _dumps(_error('BAD_REQUEST', str(e))), {}, False)
+                    break
+                cors = _cors_headers(request.headers)
+                if request.method == 'OPTIONS':
+                    await _write(writer, 204, b'', cors, keep_alive)
+                else:
+                    status, body = await self.respond(request)
+                    await _write(writer, status, body, cors, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def summary(self):
+        lines = []
+        for name, stats in sorted(self.stats.items(), key=lambda item: -item[1].requests):
+            mean = stats.server_ms / stats.requests if stats.requests else 0
+            lines.append(f'  {stats.requests:7d} req {stats.errors:5d} err {mean:8.2f} ms  {stats.bytes / 1024:10.1f} KB  {name}')
+        return '\n'.join(lines)
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def _error(code, message):
+    return {'status': 'ERROR', 'result': {'code': code, 'message': message}, 'errors': [{'code': code, 'message': message}]}
+
+
+_REASONS = {200: 'OK', 204: 'No Content', 400: 'Bad Request', 401: 'Unauthorized', 404: 'Not Found',
+            431: 'Request Header Fields Too Large', 500: 'Internal Server Error'}
+
+
+def _parse_head(head):
+    # (Request, keep-alive) of a request head
+    lines = head.decode('latin-1').split('\r\n')
+    method, target, version = lines[0].split(' ', 2)
+    headers = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise ValueError('chunked request bodies are not supported')
+    parts = urlsplit(target)
+    connection = headers.get('connection', '').lower()
+    keep_alive = connection == 'keep-alive' or (version == 'HTTP/1.1' and connection != 'close')
+    return Request(method.upper(), target, parts.path, dict(parse_qsl(parts.query)), headers), keep_alive
+
+
+def _cors_headers(headers):
+    # The app runs on another origin (Vite's dev server), so every response
+    # allows it, including the preflight for Authorization headers
+    return {
+        'Access-Control-Allow-Origin': headers.get('origin', '*'),
+        'Access-Control-Allow-Methods': 'GET, POST, PUT, PATCH, DELETE, OPTIONS',
+        'Access-Control-Allow-Headers': headers.get('access-control-request-headers', 'Authorization, Content-Type'),
+        'Access-Control-Max-Age': '600',
+        'Vary': 'Origin',
+    }
+
+
+async def _write(writer, status, body, headers, keep_alive):
+    head = [f'HTTP/1.1 {status} {_REASONS.get(status, "Unknown")}']
+    if status != 204:
+        head.append('Content-Type: application/json; charset=utf-8')
+    head.append(f'Content-Length: {len(body)}')
+    head.append(f"Connection: {'keep-alive' if keep_alive else 'close'}")
+    head.extend(f'{name}: {value}' for name, value in headers.items())
+    writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + body)
+    await writer.drain()
+
+
+async def serve(server, host=DEFAULT_HOST, port=DEFAULT_PORT, ready=None):
+    # Run until cancelled; `ready` (an asyncio.Event) is set once listening
+    listener = await asyncio.start_server(server.serve_connection, host, port, limit=64 * 1024)
+    if ready is not None:
+        ready.set()
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve a seeded synthetic Workdeck API for latency and load testing.')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--seed', type=int, default=1, help='seed for the data and the injected faults (default: 1)')
+    parser.add_argument('--data', metavar='FILE', help='serve a file written by codemods.dataset instead of generating')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='small', help='scale to generate at (default: small)')
+    parser.add_argument('--users', type=int)
+    parser.add_argument('--projects', type=int)
+    parser.add_argument('--tasks', type=int)
+    parser.add_argument('--events-per-user', type=int)
+    parser.add_argument('--expenses-per-user', type=int)
+    parser.add_argument('--today', type=date.fromisoformat, default=None,
+                        help="date the data is built around (default: today, or the --data file's)")
+    parser.add_argument('--latency', type=float, default=0.0, help='mean delay per response, in ms')
+    parser.add_argument('--jitter', type=float, default=0.0, help='standard deviation of the delay, in ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='share of responses that are HTTP 500')
+    parser.add_argument('--ko-rate', type=float, default=0.0, help="share of responses with status 'KO'")
+    parser.add_argument('--route', action='append', default=[], metavar='PREFIX:key=value,...',
+                        help='latency, jitter, error or ko for paths under PREFIX (repeatable)')
+    parser.add_argument('--no-auth', action='store_true', help='treat requests without a token as the first user')
+    parser.add_argument('--log', action='store_true', help='print every request as a waterfall line on stderr')
+    args = parser.parse_args(argv)
+
+    fault = Fault(args.latency, args.jitter, args.error_rate, args.ko_rate)
+    try:
+        routes = [parse_route_fault(text, fault) for text in args.route]
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+    overrides = {name: value for name, value in vars(args).items() if name in Scale.__dataclass_fields__ and value is not None}
+    started = time.perf_counter()
+    if args.data:
+        try:
+            store = Store(read_jsonl(args.data), args.today)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f'{args.data}: {e}')
+    else:
+        scale = Scale(**{**asdict(PRESETS[args.preset]), **overrides})
+        store = Store(generate(args.seed, scale, args.today), args.today)
+    server = MockServer(store, fault, routes, auth=not args.no_auth, log=args.log, seed=args.seed)
+    counts = ', '.join(f'{len(store.items[kind])} {kind}s' for kind in ('user', 'project', 'task', 'event', 'expense'))
+    print(f'Serving {counts} on http://{args.host}:{args.port} (built in {time.perf_counter() - started:.1f}s)', file=sys.stderr)
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    if server.stats:
+        print(server.summary(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import time
+from dataclasses import dataclass
+from functools import partial
+
+from .index import build_index
+from .manifest import _regex_flags
+from .rewrite import Rewriter
+from .runner import run_tasks
+from .structural import REGEX_BUDGET, bounded_count
+
+# Preflight check of every patch anchor.
+#
+# A literal replacement whose `old` text has drifted is a silent no-op, so a
+# broken patch only shows up once the app does. preflight() reads each target
+# once, counts every literal anchor of every patch with one Rewriter.count()
+# (regex anchors and index nodes are counted separately) and reports each
+# anchor as:
+#
+#   matched     found exactly once (or, for regex steps, at least once)
+#   ambiguous   a literal or node anchor found more than once in one file
+#   missing     not found
+#   applied     a replace whose `old` is gone but whose `new` is present
+#   pending     only present in the output of an earlier step on the same file
+#   guarded     the step's `unless` text is present, so it will be skipped
+#
+# Only `missing` fails the check. Anchors are checked against the files as
+# they are now, not as each step would leave them; `pending` covers anchors
+# that earlier steps are expected to create.
+
+MATCHED = 'matched'
+AMBIGUOUS = 'ambiguous'
+MISSING = 'missing'
+APPLIED = 'applied'
+PENDING = 'pending'
+GUARDED = 'guarded'
+
+STATUSES = (MATCHED, AMBIGUOUS, MISSING, APPLIED, PENDING, GUARDED)
+
+# Step fields holding literal text the step looks for
+ANCHOR_FIELDS = ('old', 'anchor', 'start', 'through', 'end')
+
+
+@dataclass
+class Finding:
+    patch: str
+    step: int
+    field: str
+    anchor: str
+    status: str
+    hits: int = 0
+    path: str = None
+    files: int = 1
+
+
+def _produced(step):
+    # Literal text a step writes into the file
+    if 'new' in step:
+        return [step['new']]
+    if 'repl' in step:
+        return [step['repl']]
+    if 'template' in step:
+        return step['template'].split('{block}')
+    return []
+
+
+def _anchors(step):
+    anchors = [(field, step[field]) for field in ANCHOR_FIELDS if step.get(field)]
+    if 'pattern' in step:
+        anchors.append(('pattern', step['pattern']))
+    if 'node' in step:
+        anchors.append(('node', step['node']))
+    return anchors
+
+
+def check(content, patches):
+    # Findings for one file, as a list of (patch, step, field, anchor, status, hits)
+    literals = []
+    for patch in patches:
+        for step in patch['step']:
+            literals.extend(text for field, text in _anchors(step) if field != 'pattern' and field != 'node')
+            if step['op'] == 'replace':
+                literals.append(step['new'])
+            if step.get('unless'):
+                literals.append(step['unless'])
+    literals = [text for text in dict.fromkeys(literals) if text]
+    counts = dict(zip(literals, Rewriter([(text, '') for text in literals]).count(content))) if literals else {}
+
+    index = None
+    findings = []
+    produced = []
+    for patch in patches:
+        for number, step in enumerate(patch['step']):
+            guarded = bool(step.get('unless')) and counts.get(step['unless'], 0) > 0
+
+            for field, anchor in _anchors(step):
+                if field == 'pattern':
+                    hits = bounded_count(anchor, content, _regex_flags(step), step.get('timeout', REGEX_BUDGET))
+                elif field == 'node':
+                    if index is None:
+                        index = build_index(content)
+                    hits = len(index.find(anchor))
+                else:
+                    hits = counts[anchor]
+
+                if guarded:
+                    status = GUARDED
+                elif hits > 1 and step['op'] != 'regex':
+                    status = AMBIGUOUS
+                elif hits:
+                    status = MATCHED
+                elif step['op'] == 'replace' and step['new'] and counts.get(step['new'], 0):
+                    status = APPLIED
+                elif field != 'pattern' and any(anchor in text for text in produced):
+                    status = PENDING
+                else:
+                    status = MISSING
+                findings.append((patch['id'], number, field, anchor, status, hits))
+
+            produced.extend(_produced(step))
+
+    return content, findings
+
+
+def _merge(findings_per_file):
+    # Combine per-file findings so a glob target counts as matched when any
+    # of its files matches
+    merged = {}
+    rank = {AMBIGUOUS: 0, MATCHED: 1, APPLIED: 2, PENDING: 3, GUARDED: 4, MISSING: 5}
+    for path, findings in findings_per_file:
+        for patch, step, field, anchor, status, hits in findings:
+            key = (patch, step, field)
+            current = merged.get(key)
+            if current is None:
+                merged[key] = Finding(patch, step, field, anchor, status, hits, path)
+                continue
+            current.files += 1
+            if rank[status] < rank[current.status]:
+                current.status = status
+                current.path = path
+                # An ambiguous anchor reports its hits in the offending file
+                current.hits = hits if status == AMBIGUOUS else current.hits + hits
+            elif current.status != AMBIGUOUS:
+                current.hits += hits
+    return list(merged.values())
+
+
+def preflight(plan, root='.', jobs=None, cache=None):
+    tasks = [(file_plan.path, partial(check, patches=file_plan.patches)) for file_plan in plan]
+    outcomes = run_tasks(tasks, root, write=False, jobs=jobs, cache=cache)
+    errors = [(outcome.path, outcome.error) for outcome in outcomes if outcome.error]
+    findings = _merge((outcome.path, outcome.detail) for outcome in outcomes if outcome.detail)
+    return findings, errors
+
+
+def _preview(anchor, width=60):
+    first_line = anchor.strip().split('\n', 1)[0]
+    return repr(first_line if len(first_line) <= width else first_line[:width] + '...')
+
+
+def report(findings, errors, elapsed=None):
+    # Print missing and ambiguous anchors plus a summary; returns the number
+    # of missing anchors and unreadable files
+    for path, error in errors:
+        print(f"  unreadable {path}: {error}")
+
+    for finding in sorted(findings, key=lambda finding: (finding.patch, finding.step)):
+        if finding.status in (MISSING, AMBIGUOUS):
+            hits = f" ({finding.hits} hits)" if finding.status == AMBIGUOUS else ''
+            where = finding.path if finding.status == AMBIGUOUS or finding.files == 1 else f'{finding.files} files'
+            print(f"  {finding.status:<9} {finding.patch} step {finding.step} {finding.field} "
+                  f"in {where}{hits}: {_preview(finding.anchor)}")
+
+    totals = {status: 0 for status in STATUSES}
+    for finding in findings:
+        totals[finding.status] += 1
+    summary = ', '.join(f'{count} {status}' for status, count in totals.items())
+    timing = f' in {elapsed:.2f}s' if elapsed is not None else ''
+    print(f"{len(findings)} anchors: {summary}{timing}")
+    return totals[MISSING] + len(errors)
+
+
+def run_preflight(plan, root='.', jobs=None, cache=None):
+    started = time.perf_counter()
+    findings, errors = preflight(plan, root, jobs, cache)
+    return report(findings, errors, time.perf_counter() - started)
@@ -0,0 +1,231 @@
+import argparse
+import contextlib
+import re
+import sys
+from functools import partial
+
+from .index import build_index
+from .runner import iter_tasks, stream_diffs, summarize
+from .structural import whole_lines
+
+# Route-level code splitting for App.tsx.
+#
+# Every page a <Route> renders is imported statically, so the whole app
+# (Finance, the Resource Planner, ...) lands in the initial chunk. This
+# codemod turns each page import into a React.lazy() chunk:
+#
+#   import SpendingApp from './pages/Finance/Spending/SpendingApp';
+#   import { LoginPage } from './pages/Login';
+#
+# become, after the remaining imports,
+#
+#   const SpendingApp = lazy(() => import('./pages/Finance/Spending/SpendingApp'));
+#   const LoginPage = lazy(() => import('./pages/Login').then((module) => ({ default: module.LoginPage })));
+#
+# and wraps <Routes> in a single <Suspense fallback={...}>. A page is an
+# imported component rendered as a self-closing element inside a <Route>
+# (wrappers with children, like ProtectedRoute and AppLayout, stay eager)
+# that the module doesn't mention anywhere else. `lazy` and `Suspense` are
+# added to the react import.
+#
+# Pages already converted are no longer static imports and an existing
+# <Suspense> around <Routes> is left alone, so a second run changes nothing.
+#
+#   python -m codemods.routes --dry-run
+#   python -m codemods.routes --eager LoginPage --fallback '<PageLoader />'
+
+APP = 'src/App.tsx'
+FALLBACK = 'null'
+
+_IMPORT = re.compile(
+    r'''import\s+(?P<default>[\w$]+)?\s*,?\s*(?:\{(?P<named>[^}]*)\})?\s*from\s*(?P<quote>['"])(?P<specifier>[^'"]+)(?P=quote)'''
+)
+_REACT_IMPORT = re.compile(r'''import\s+(?P<default>[\w$]+\s*,\s*)?\{(?P<named>[^}]*)\}\s*from\s*['"]react['"]''')
+_REACT_DEFAULT_IMPORT = re.compile(r'''import\s+(?P<default>[\w$]+)\s+from\s*['"]react['"]''')
+_LAZY = re.compile(r'''const\s+(?P<name>[\w$]+)\s*=\s*(?:React\.)?lazy\(\s*\(\)\s*=>\s*import\(\s*(?P<quote>['"])(?P<specifier>[^'"]+)(?P=quote)''')
+
+
+def _named(text):
+    # [(imported, local)] of an import's `{ ... }` list
+    names = []
+    for entry in text.split(','):
+        words = entry.split()
+        if not words or words[0] == 'type':
+            continue
+        names.append((words[0], words[-1]))
+    return names
+
+
+def route_pages(index):
+    # Import bindings rendered as self-closing elements inside a <Route>
+    routes = [(node.start, node.end) for node in index.find('jsx:Route')]
+    pages = []
+    for (scope, kind, name), nodes in index.nodes.items():
+        if scope is not None or kind != 'jsx' or name not in index.bindings or name in pages:
+            continue
+        for node in nodes:
+            if index.source(node).endswith('/>') and any(start < node.start and node.end <= end for start, end in routes):
+                pages.append(name)
+                break
+    return pages
+
+
+def lazy_imports(text):
+    # Components declared as `const X = lazy(() => import('...'))`, name -> specifier
+    return {match['name']: match['specifier'] for match in _LAZY.finditer(text)}
+
+
+def _mentioned_elsewhere(text, name, routes, statement):
+    for match in re.finditer(rf'(?<![\w$.]){re.escape(name)}(?![\w$])', text):
+        position = match.start()
+        if statement[0] <= position < statement[1]:
+            continue
+        if not any(start <= position < end for start, end in routes):
+            return True
+    return False
+
+
+def _lazy(local, imported, specifier, quote):
+    source = f'import({quote}{specifier}{quote})'
+    if imported == 'default':
+        return f'const {local} = lazy(() => {source});'
+    return f'const {local} = lazy(() => {source}.then((module) => ({{ default: module.{imported} }})));'
+
+
+def _remaining_import(match, kept_default, kept_named):
+    parts = []
+    if kept_default:
+        parts.append(kept_default)
+    if kept_named:
+        parts.append('{ ' + ', '.join(
+            imported if imported == local else f'{imported} as {local}' for imported, local in kept_named
+        ) + ' }')
+    quote = match['quote']
+    return f"import {', '.join(parts)} from {quote}{match['specifier']}{quote};"
+
+
+def react_import(text, index, wanted):
+    # Edit adding the names in `wanted` to the react import, or None
+    node = index.get('import:react')
+    if node is not None:
+        statement = index.source(node)
+        match = _REACT_IMPORT.match(statement)
+        if match:
+            present = [local for _, local in _named(match['named'])]
+            missing = [name for name in wanted if name not in present]
+            if not missing:
+                return None
+            named = ', '.join([entry.strip() for entry in match['named'].split(',') if entry.strip()] + missing)
+            start = node.start + match.start('named') - 1
+            return start, node.start + match.end('named') + 1, '{ ' + named + ' }'
+        if _REACT_DEFAULT_IMPORT.match(statement):
+            default = _REACT_DEFAULT_IMPORT.match(statement)
+            position = node.start + default.end('default')
+            return position, position, ', { ' + ', '.join(wanted) + ' }'
+    first = min((nodes[0].start for (scope, kind, _), nodes in index.nodes.items() if kind == 'import'), default=0)
+    return first, first, "import { " + ', '.join(wanted) + " } from 'react';\n"
+
+
+def _wrap_routes(text, index, fallback):
+    # Edits wrapping each <Routes> not already inside a <Suspense>
+    suspense = [(node.start, node.end) for node in index.find('jsx:Suspense')]
+    edits = []
+    for node in index.find('jsx:Routes'):
+        if any(start < node.start and node.end <= end for start, end in suspense):
+            continue
+        line_start = text.rfind('\n', 0, node.start) + 1
+        indent = text[line_start:node.start]
+        block = text[node.start:node.end]
+        if not indent.strip() and '`' not in block:
+            block = block.replace('\n', '\n  ')
+            # Blank lines stay empty
+            block = re.sub(r'\n  (?=\n)', '\n', block)
+        edits.append((node.start, node.end,
+                      f'<Suspense fallback={{{fallback}}}>\n{indent}  {block}\n{indent}</Suspense>'))
+    return edits
+
+
+def split_routes(content, eager=(), fallback=FALLBACK):
+    # Lazy-load the route pages of an App.tsx; returns (content, converted names)
+    index = build_index(content)
+    routes = [(node.start, node.end) for node in index.find('jsx:Route')]
+    pages = [name for name in route_pages(index) if name not in eager]
+
+    edits = []
+    declarations = []
+    converted = []
+    by_import = {}
+    for name in pages:
+        node = index.bindings[name]
+        if _mentioned_elsewhere(content, name, routes, (node.start, node.end)):
+            continue
+        by_import.setdefault(node, []).append(name)
+
+    for node, names in sorted(by_import.items(), key=lambda item: item[0].start):
+        statement = index.source(node)
+        match = _IMPORT.match(statement)
+        if not match or statement.startswith('import type'):
+            continue
+        default = match['default']
+        named = _named(match['named']) if match['named'] is not None else []
+        imports = ([('default', default)] if default else []) + named
+        lazy = [(imported, local) for imported, local in imports if local in names]
+        for imported, local in lazy:
+            declarations.append(_lazy(local, imported, match['specifier'], match['quote']))
+            converted.append(local)
+
+        kept_default = default if default and default not in names else None
+        kept_named = [(imported, local) for imported, local in named if local not in names]
+        if kept_default or kept_named:
+            edits.append((node.start, node.end, _remaining_import(match, kept_default, kept_named)))
+        else:
+            edits.append((*whole_lines(content, node.start, node.end), ''))
+
+    wraps = _wrap_routes(content, index, fallback)
+    if not converted and not wraps:
+        return content, []
+
+    if declarations:
+        last_import = max(nodes[-1].end for (scope, kind, _), nodes in index.nodes.items() if kind == 'import')
+        after = content.find('\n', last_import)
+        after = len(content) if after == -1 else after + 1
+        edits.append((after, after, '\n' + '\n'.join(declarations) + '\n'))
+    react = react_import(content, index, ['lazy', 'Suspense'])
+    if react is not None:
+        edits.append(react)
+    edits.extend(wraps)
+
+    pieces = []
+    cursor = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+        pieces.append(content[cursor:start])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(content[cursor:])
+    return ''.join(pieces), converted
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Lazy-load the pages routed in App.tsx behind a Suspense boundary.')
+    parser.add_argument('path', nargs='?', default=APP)
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--eager', action='append', default=[], metavar='NAME', help='keep this page a static import')
+    parser.add_argument('--fallback', default=FALLBACK, help=f'Suspense fallback expression (default: {FALLBACK})')
+    parser.add_argument('--dry-run', action='store_true', help='print a unified diff instead of writing')
+    args = parser.parse_args(argv)
+
+    transform = partial(split_routes, eager=tuple(args.eager), fallback=args.fallback)
+    outcomes = iter_tasks([(args.path, transform)], args.root, not args.dry_run, jobs=1, diff=args.dry_run)
+    if args.dry_run:
+        outcomes = stream_diffs(outcomes)
+    outcomes = list(outcomes)
+    with contextlib.redirect_stdout(sys.stderr if args.dry_run else sys.stdout):
+        for outcome in outcomes:
+            if outcome.detail:
+                print(f"{outcome.path}: lazy {', '.join(outcome.detail)}")
+        summarize(outcomes, dry_run=args.dry_run)
+    return 1 if any(outcome.error for outcome in outcomes) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
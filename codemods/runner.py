@@ -0,0 +1,209 @@
+import argparse
+import contextlib
+import difflib
+import glob
+import importlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from .cache import Cache, fingerprint
+from .fileio import FileChangedError, edit
+
+# Parallel codemod runner.
+#
+# A transform is any picklable callable taking the file content and returning
+# either the new content or a (new_content, detail) tuple; `detail` is handed
+# back in the Outcome (the manifest uses it for per-step hit counts). Files
+# are sharded across a process pool and each one goes through fileio.edit(),
+# so unchanged files are never written. With a cache.Cache, files whose
+# content was already seen by the same transform are not transformed again.
+# With diff=True each Outcome also carries a unified diff of the change and
+# the number of bytes added and removed, computed in the worker so only the
+# diff travels back.
+
+# Below this many files a process pool costs more than it saves
+MIN_PARALLEL_FILES = 16
+
+
+@dataclass
+class Outcome:
+    path: str
+    changed: bool = False
+    detail: object = None
+    error: str = None
+    cached: bool = False
+    diff: str = None
+    added: int = 0
+    removed: int = 0
+
+
+class TransformError(Exception):
+    # Raised by a transform to fail one file without stopping the run
+    pass
+
+
+def expand(pattern, root='.'):
+    # Glob relative to `root`; `**` matches any number of directories
+    if not glob.has_magic(pattern):
+        return [pattern]
+    return sorted(
+        os.path.normpath(path)
+        for path in glob.glob(pattern, root_dir=root, recursive=True)
+        if os.path.isfile(os.path.join(root, path))
+    )
+
+
+def unified_diff(path, original, content):
+    # Returns (diff, bytes_added, bytes_removed)
+    lines = list(difflib.unified_diff(
+        original.splitlines(True), content.splitlines(True), f'a/{path}', f'b/{path}'
+    ))
+    added = removed = 0
+    for index, line in enumerate(lines):
+        if index >= 2 and line[0] == '+':
+            added += len(line[1:].encode('utf-8'))
+        elif index >= 2 and line[0] == '-':
+            removed += len(line[1:].encode('utf-8'))
+        if not line.endswith('\n'):
+            lines[index] = line + '\n\\ No newline at end of file\n'
+    return ''.join(lines), added, removed
+
+
+def _run_one(task):
+    path, transform, root, write, cache, transform_fingerprint, diff = task
+    detail = None
+    cached = False
+
+    def apply(content):
+        nonlocal detail, cached
+        if cache is not None:
+            key = cache.key(transform_fingerprint, content)
+            entry = cache.get(key)
+            if entry is not None:
+                cached = True
+                output, detail = entry
+                return content if output is None else output
+
+        result = transform(content)
+        if isinstance(result, tuple):
+            result, detail = result
+
+        if cache is not None:
+            cache.put(key, None if result == content else result, detail)
+        return result
+
+    try:
+        original, content = edit(os.path.join(root, path), apply, write=write)
+    except (OSError, UnicodeDecodeError, FileChangedError, TransformError) as e:
+        return Outcome(path, error=str(e))
+
+    outcome = Outcome(path, changed=content != original, detail=detail, cached=cached)
+    if diff and outcome.changed:
+        outcome.diff, outcome.added, outcome.removed = unified_diff(path, original, content)
+    return outcome
+
+
+def iter_tasks(tasks, root='.', write=True, jobs=None, cache=None, diff=False):
+    # Run (path, transform) pairs and yield one Outcome per pair, in order
+    fingerprints = {}
+    work = []
+    for path, transform in tasks:
+        transform_fingerprint = None
+        if cache is not None:
+            if id(transform) not in fingerprints:
+                fingerprints[id(transform)] = fingerprint(transform)
+            transform_fingerprint = fingerprints[id(transform)]
+        work.append((path, transform, root, write, cache, transform_fingerprint, diff))
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(work) < MIN_PARALLEL_FILES:
+        for task in work:
+            yield _run_one(task)
+        return
+
+    # A few chunks per worker keeps them busy when file sizes are uneven
+    chunksize = max(1, len(work) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(_run_one, work, chunksize=chunksize)
+
+
+def run_tasks(tasks, root='.', write=True, jobs=None, cache=None, diff=False):
+    return list(iter_tasks(tasks, root, write, jobs, cache, diff))
+
+
+def run(pattern, transform, root='.', write=True, jobs=None, cache=None, diff=False):
+    return run_tasks([(path, transform) for path in expand(pattern, root)], root, write, jobs, cache, diff)
+
+
+def stream_diffs(outcomes, out=sys.stdout):
+    # Write each outcome's diff as it arrives and drop it; returns the
+    # outcomes without their diffs
+    kept = []
+    for outcome in outcomes:
+        if outcome.diff:
+            out.write(outcome.diff)
+            out.flush()
+            outcome.diff = None
+        kept.append(outcome)
+    return kept
+
+
+def summarize(outcomes, dry_run=False):
+    verb = 'Would update' if dry_run else 'Updated'
+    for outcome in outcomes:
+        if outcome.error:
+            print(f"Skipped {outcome.path}: {outcome.error}")
+        elif outcome.changed:
+            stats = f" (+{outcome.added} -{outcome.removed} bytes)" if dry_run else ''
+            print(f"{verb} {outcome.path}{stats}")
+
+    changed = sum(outcome.changed for outcome in outcomes)
+    failed = sum(outcome.error is not None for outcome in outcomes)
+    cached = sum(outcome.cached for outcome in outcomes)
+    print(f"{len(outcomes)} files, {changed} {'would change' if dry_run else 'changed'}, "
+          f"{failed} skipped, {cached} from cache")
+    if dry_run:
+        added = sum(outcome.added for outcome in outcomes)
+        removed = sum(outcome.removed for outcome in outcomes)
+        print(f"+{added} -{removed} bytes")
+
+
+def _load_transform(spec):
+    module_name, _, attribute = spec.partition(':')
+    if not attribute:
+        raise SystemExit(f"Transform must look like module:function, got '{spec}'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a transform over every file matching a glob.')
+    parser.add_argument('pattern', help="file glob relative to --root, e.g. 'src/**/*.tsx'")
+    parser.add_argument('transform', help='module:function taking and returning the file content')
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--jobs', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--cache-dir', default=None, help='cache directory (default: $CODEMODS_CACHE_DIR or .codemods-cache)')
+    parser.add_argument('--no-cache', action='store_true')
+    parser.add_argument('--dry-run', action='store_true', help='print a unified diff instead of writing')
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.getcwd())
+    cache = None if args.no_cache else Cache(args.cache_dir)
+    transform = _load_transform(args.transform)
+    tasks = [(path, transform) for path in expand(args.pattern, args.root)]
+    outcomes = iter_tasks(tasks, args.root, not args.dry_run, args.jobs, cache, diff=args.dry_run)
+    if args.dry_run:
+        # Diffs go to stdout so they can be piped into `git apply`; the
+        # summary goes to stderr
+        outcomes = stream_diffs(outcomes)
+        with contextlib.redirect_stdout(sys.stderr):
+            summarize(outcomes, dry_run=True)
+    else:
+        outcomes = list(outcomes)
+        summarize(outcomes)
+    return 1 if any(outcome.error for outcome in outcomes) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
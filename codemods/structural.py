@@ -0,0 +1,161 @@
+import bisect
+import re
+import signal
+import threading
+
+from .runner import TransformError
+from .tsx import bracket_pairs
+
+# Structural edits that don't rely on `[\s\S]*?` regexes.
+#
+# A block is selected by a literal `start` anchor and runs to the bracket
+# that balances the first `opener` found at or after `start` (or after the
+# optional `through` anchor, for blocks whose interesting bracket comes
+# later). Brackets are matched with codemods.tsx, so braces inside strings,
+# comments, template literals and JSX text are ignored. Everything is a single
+# tokenize pass plus literal searches, so a drifted file costs the same as a
+# matching one instead of backtracking.
+#
+# For the regexes that stay, bounded_subn() runs them under a time budget.
+
+# Seconds a single regex step may run before it is abandoned
+REGEX_BUDGET = 2.0
+
+
+class RegexBudgetExceeded(TransformError):
+    pass
+
+
+class _Selector:
+    def __init__(self, text, jsx=True):
+        self.text = text
+        self.pairs = bracket_pairs(text, jsx)
+        self._openers = {}
+
+    def _openers_of(self, opener):
+        if opener not in self._openers:
+            self._openers[opener] = sorted(
+                offset for offset in self.pairs if self.text[offset] == opener
+            )
+        return self._openers[opener]
+
+    def find(self, start, through=None, opener='{', trailing='', position=0):
+        # Return (begin, end) of the first block at or after `position`
+        begin = self.text.find(start, position)
+        if begin == -1:
+            return None
+
+        search_from = begin
+        if through:
+            search_from = self.text.find(through, begin + len(start))
+            if search_from == -1:
+                return None
+
+        openers = self._openers_of(opener)
+        index = bisect.bisect_left(openers, search_from)
+        if index == len(openers):
+            return None
+
+        end = self.pairs[openers[index]] + 1
+        if trailing and self.text.startswith(trailing, end):
+            end += len(trailing)
+        return begin, end
+
+    def find_all(self, start, through=None, opener='{', trailing=''):
+        spans = []
+        position = 0
+        while True:
+            span = self.find(start, through, opener, trailing, position)
+            if span is None:
+                return spans
+            spans.append(span)
+            position = span[1]
+
+
+def find_block(text, start, through=None, opener='{', trailing='', jsx=True):
+    return _Selector(text, jsx).find(start, through, opener, trailing)
+
+
+def _splice(text, spans, replacement):
+    pieces = []
+    cursor = 0
+    for begin, end in spans:
+        pieces.append(text[cursor:begin])
+        pieces.append(replacement)
+        cursor = end
+    pieces.append(text[cursor:])
+    return ''.join(pieces)
+
+
+def delete_block(text, start, through=None, opener='{', trailing='', jsx=True):
+    # Delete every selected block. Returns (new_text, count).
+    spans = _Selector(text, jsx).find_all(start, through, opener, trailing)
+    if not spans:
+        return text, 0
+    return _splice(text, spans, ''), len(spans)
+
+
+def whole_lines(text, start, end):
+    # Widen a span to its full lines (through the newline) when nothing but
+    # indentation shares those lines with it
+    line_start = text.rfind('\n', 0, start) + 1
+    line_end = text.find('\n', end)
+    line_end = len(text) if line_end == -1 else line_end + 1
+    if text[line_start:start].strip() or text[end:line_end].strip():
+        return start, end
+    return line_start, line_end
+
+
+def replace_between(text, start, end, new):
+    # Replace every span from `start` through the next `end` with `new`.
+    # Returns (new_text, count).
+    spans = []
+    position = 0
+    while True:
+        begin = text.find(start, position)
+        if begin == -1:
+            break
+        stop = text.find(end, begin + len(start))
+        if stop == -1:
+            break
+        spans.append((begin, stop + len(end)))
+        position = stop + len(end)
+
+    if not spans:
+        return text, 0
+    return _splice(text, spans, new), len(spans)
+
+
+def _bounded(call, pattern, budget):
+    # The regex engine checks for signals while matching, so an interval
+    # timer can interrupt a runaway backtrack. Where timers are unavailable
+    # (Windows, non-main threads) the call runs unbounded.
+    if not budget or not hasattr(signal, 'setitimer') or threading.current_thread() is not threading.main_thread():
+        return call()
+
+    def expire(signum, frame):
+        raise RegexBudgetExceeded(f'regex ran longer than {budget}s: {pattern[:60]!r}')
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        return call()
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def bounded_subn(pattern, repl, text, flags=0, budget=REGEX_BUDGET):
+    # re.subn() that gives up after `budget` seconds
+    compiled = re.compile(pattern, flags)
+    return _bounded(lambda: compiled.subn(repl, text), pattern, budget)
+
+
+def bounded_search(pattern, text, flags=0, budget=REGEX_BUDGET):
+    compiled = re.compile(pattern, flags)
+    return _bounded(lambda: compiled.search(text), pattern, budget)
+
+
+def bounded_count(pattern, text, flags=0, budget=REGEX_BUDGET):
+    compiled = re.compile(pattern, flags)
+    return _bounded(lambda: sum(1 for _ in compiled.finditer(text)), pattern, budget)
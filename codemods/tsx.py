@@ -0,0 +1,240 @@
+import re
+from collections import namedtuple
+
+# Linear-time TS/TSX tokenizer.
+#
+# Good enough to tell code from strings, comments, template literals, regex
+# literals and JSX text, which is what the structural patch operations need:
+# a brace inside a string or a JSX text node must never be mistaken for a
+# block boundary. It is not a parser and does not validate anything; on
+# malformed input it keeps going rather than raising.
+#
+# Token kinds:
+#   name, number, string, regex, comment, punct
+#   open / close          ( ) [ ] { } in code, `${`/`}` in templates and
+#                         `{`/`}` around JSX expressions (offset of the bracket)
+#   template              literal text of a template string (backticks
+#                         included), split around `${...}`
+#   jsx_tag_open          `<Name` of an opening tag
+#   jsx_tag_end           `>` ending an opening tag
+#   jsx_self_close        `/>`
+#   jsx_closing_tag       `</Name>`
+#   jsx_attr_string       quoted attribute value
+#   jsx_text              text between tags
+
+Token = namedtuple('Token', 'kind start end')
+
+_CODE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))
+  | (?P<string>'(?:[^'\\\n]|\\[\s\S])*'?|"(?:[^"\\\n]|\\[\s\S])*"?)
+  | (?P<name>[A-Za-z_$\u0080-\uffff][\w$\u0080-\uffff]*)
+  | (?P<number>\.?\d[\w.]*)
+  | (?P<punct>[^\s\w])
+''', re.VERBOSE)
+
+_REGEX = re.compile(r'/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\]?)+/[A-Za-z]*')
+# A lone backslash at the end of the input is text, so a chunk always advances
+_TEMPLATE_CHUNK = re.compile(r'(?:[^`\\$]|\\[\s\S]?|\$(?!\{))*')
+_JSX_NAME = re.compile(r'[\w$.:-]*')
+_JSX_ATTR = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<string>"[^"]*"?|'[^']*'?)
+  | (?P<name>[^\s{}"'/>=]+)
+  | (?P<punct>[^\s])
+''', re.VERBOSE)
+_JSX_TEXT = re.compile(r'[^{<]+')
+_JSX_CLOSING = re.compile(r'</\s*[\w$.:-]*\s*>?')
+_GENERIC_PARAMETER = re.compile(r'\s*(?:,|extends\b)')
+
+_OPENERS = {'(': 'paren', '[': 'bracket', '{': 'brace'}
+_CLOSERS = {')': 'paren', ']': 'bracket', '}': 'brace'}
+
+# A `/` or `<` right after one of these starts a regex literal or JSX element
+# rather than being a division or comparison
+_EXPRESSION_START = set('([{,;:=!&|?+-*%~^<>}') | {'', 'return', 'typeof', 'case', 'yield', 'await',
+                                                   'else', 'in', 'of', 'new', 'do', 'void', 'delete',
+                                                   'throw', 'instanceof', 'default', '=>'}
+
+_CODE_FRAMES = {'base', 'paren', 'bracket', 'brace', 'template_expr', 'jsx_expr'}
+
+
+def tokenize(text, jsx=True):
+    # Yield Tokens for `text`. Pass jsx=False for plain .ts files so generic
+    # arrow functions like `<T>(x: T) => x` are not read as JSX.
+    frames = ['base']
+    previous = ''
+    # Offset of an opening backtick, so the first template token includes it
+    template_start = None
+    position = 0
+    length = len(text)
+
+    while position < length:
+        frame = frames[-1]
+
+        if frame in _CODE_FRAMES:
+            char = text[position]
+
+            if char == '`':
+                frames.append('template')
+                template_start = position
+                position += 1
+                continue
+
+            if char == '/' and previous in _EXPRESSION_START:
+                match = _REGEX.match(text, position)
+                if match and not text.startswith(('//', '/*'), position):
+                    yield Token('regex', position, match.end())
+                    position = match.end()
+                    previous = 'value'
+                    continue
+
+            if (
+                char == '<' and jsx and previous in _EXPRESSION_START
+                and position + 1 < length and (text[position + 1].isalpha() or text[position + 1] in '_$>')
+            ):
+                name = _JSX_NAME.match(text, position + 1)
+                # `<T,>` and `<T extends X>` are generic arrow functions
+                if not _GENERIC_PARAMETER.match(text, name.end()):
+                    frames.append('jsx_open')
+                    yield Token('jsx_tag_open', position, name.end())
+                    position = name.end()
+                    continue
+
+            if char in _OPENERS:
+                frames.append(_OPENERS[char])
+                yield Token('open', position, position + 1)
+                position += 1
+                previous = char
+                continue
+
+            if char in _CLOSERS:
+                yield Token('close', position, position + 1)
+                position += 1
+                wanted = _CLOSERS[char]
+                # Pop until the matching frame; a stray closer is tolerated
+                for depth in range(len(frames) - 1, 0, -1):
+                    kind = frames[depth]
+                    if kind == wanted or (char == '}' and kind in ('template_expr', 'jsx_expr')):
+                        del frames[depth:]
+                        break
+                    if kind not in _CODE_FRAMES:
+                        break
+                previous = char if frames[-1] in _CODE_FRAMES else 'value'
+                continue
+
+            match = _CODE.match(text, position)
+            kind = match.lastgroup
+            end = match.end()
+            if kind == 'name':
+                word = text[position:end]
+                previous = word if word in _EXPRESSION_START else 'value'
+            elif kind == 'number' or kind == 'string':
+                previous = 'value'
+            elif kind == 'punct':
+                if char == '>' and previous == '=':
+                    previous = '=>'
+                elif char == '.' and text.startswith('..', position + 1):
+                    end = position + 3
+                    previous = '...'
+                else:
+                    previous = char
+            if kind != 'ws':
+                yield Token(kind, position, end)
+            position = end
+            continue
+
+        if frame == 'template':
+            if text.startswith('${', position):
+                if template_start is not None:
+                    yield Token('template', template_start, position)
+                    template_start = None
+                frames.append('template_expr')
+                yield Token('open', position + 1, position + 2)
+                position += 2
+                previous = '{'
+                continue
+            match = _TEMPLATE_CHUNK.match(text, position)
+            end = match.end()
+            if end < length and text[end] == '`':
+                frames.pop()
+                end += 1
+                previous = 'value'
+            start = position if template_start is None else template_start
+            template_start = None
+            yield Token('template', start, end)
+            position = end
+            continue
+
+        if frame == 'jsx_open':
+            if text.startswith('/>', position):
+                frames.pop()
+                yield Token('jsx_self_close', position, position + 2)
+                position += 2
+                previous = 'value'
+                continue
+            char = text[position]
+            if char == '>':
+                frames[-1] = 'jsx_children'
+                yield Token('jsx_tag_end', position, position + 1)
+                position += 1
+                continue
+            if char == '{':
+                frames.append('jsx_expr')
+                yield Token('open', position, position + 1)
+                position += 1
+                previous = '{'
+                continue
+            match = _JSX_ATTR.match(text, position)
+            kind = match.lastgroup
+            if kind == 'string':
+                yield Token('jsx_attr_string', position, match.end())
+            elif kind != 'ws':
+                yield Token(kind, position, match.end())
+            position = match.end()
+            continue
+
+        if frame == 'jsx_children':
+            char = text[position]
+            if char == '{':
+                frames.append('jsx_expr')
+                yield Token('open', position, position + 1)
+                position += 1
+                previous = '{'
+                continue
+            if text.startswith('</', position):
+                match = _JSX_CLOSING.match(text, position)
+                frames.pop()
+                yield Token('jsx_closing_tag', position, match.end())
+                position = match.end()
+                previous = 'value'
+                continue
+            if char == '<':
+                name = _JSX_NAME.match(text, position + 1)
+                frames.append('jsx_open')
+                yield Token('jsx_tag_open', position, name.end())
+                position = name.end()
+                continue
+            match = _JSX_TEXT.match(text, position)
+            yield Token('jsx_text', position, match.end())
+            position = match.end()
+            continue
+
+
+def bracket_pairs(text, jsx=True):
+    # Map the offset of every code-level opening bracket to the offset of its
+    # matching closer. Unclosed brackets are left out.
+    pairs = {}
+    stack = []
+    for token in tokenize(text, jsx):
+        if token.kind == 'open':
+            stack.append(token.start)
+        elif token.kind == 'close':
+            char = text[token.start]
+            opener = {')': '(', ']': '[', '}': '{'}[char]
+            while stack:
+                start = stack.pop()
+                if text[start] == opener:
+                    pairs[start] = token.start
+                    break
+    return pairs
@@ -0,0 +1,523 @@
+import argparse
+import contextlib
+import json
+import re
+import sys
+from dataclasses import asdict, dataclass, field
+from functools import partial
+
+from .index import build_index
+from .runner import expand, iter_tasks, stream_diffs, summarize
+
+# Serial awaits in async functions: round trips that could run concurrently.
+#
+# Every async function under src/ (async function declarations, async
+# arrows, async methods; so also the loaders inside useEffect) is split into
+# statements, block by block. Consecutive statements that await something
+# form a run:
+#
+#   const { getUsers } = await import('../services/usersApi');      1
+#   const { getProjects } = await import('../services/projectsApi'); 1
+#   const [users, projects] = await Promise.all([getUsers(), ...]);  2
+#
+# Each await gets a level: one more than the highest level of the awaits
+# whose bindings it uses. A run of n awaits needs as many round trips as its
+# highest level; the rest could overlap. Some awaits are ordered, and
+# everything after them waits for them as well:
+#
+#   effects     `await save(...)`, `x = await ...`: they bind nothing or
+#               reassign, so their order may be the point
+#   mutations   calls matching MUTATING (createTask, updateUser, ...): a read
+#               after a write has to see the write
+#   others      anything but a call or import(), e.g. `await new Promise(...)`
+#
+# An await inside a loop body is reported on its own: it costs a round trip
+# per iteration.
+#
+# With --write, each group of consecutive declarations (all `const` or all
+# `let`) awaiting calls that don't use one another's bindings becomes one
+# Promise.all:
+#
+#   const { getTasks } = await import('../services/tasksApi');
+#   const { getCurrentUser } = await import('../services/usersApi');
+#
+# becomes
+#
+#   const [{ getTasks }, { getCurrentUser }] = await Promise.all([
+#     import('../services/tasksApi'),
+#     import('../services/usersApi'),
+#   ]);
+#
+# Declarations with a type annotation, awaits that are not a plain call
+# (`await f() + 1`, `await f() as T`) and groups with comments between them
+# are left alone. The requests then start together: when one of them fails
+# the others still run, where they used to never start.
+#
+#   python -m codemods.waterfall                      report
+#   python -m codemods.waterfall --write --dry-run
+#   python -m codemods.waterfall --write
+
+PATTERNS = ['src/**/*.ts', 'src/**/*.tsx']
+MUTATING = re.compile(
+    r'(?:create|update|delete|remove|save|add|set|post|put|patch|send|submit|'
+    r'approve|deny|reject|move|assign|upload|dismiss|clear|mark|login|logout)(?:[A-Z_\d]|$)'
+)
+
+DECLARE = 'declare'
+ASSIGN = 'assign'
+EFFECT = 'effect'
+
+_BLOCK_KEYWORDS = ('try', 'else', 'finally', 'do')
+_BLOCK_HEADERS = ('if', 'for', 'while', 'catch', 'switch')
+_LOOPS = ('for', 'while', 'do')
+_TYPE_PUNCT = (':', '|', '&', ',')
+
+
+@dataclass
+class Step:
+    line: int
+    kind: str
+    source: str                 # the statement, on one line
+    binds: list
+    uses: list                  # names bound earlier in the run
+    level: int = 1
+    ordered: bool = False
+    # Spans for the rewrite: keyword, pattern and awaited expression sources
+    keyword: str = None
+    pattern: str = None
+    expression: str = None
+    mergeable: bool = False
+    start: int = 0
+    end: int = 0
+
+
+@dataclass
+class Run:
+    path: str
+    function: str
+    line: int
+    steps: list = field(default_factory=list)
+    groups: list = field(default_factory=list)      # (first, last) step indexes to merge
+
+    @property
+    def round_trips(self):
+        return max(step.level for step in self.steps)
+
+    @property
+    def saved(self):
+        return len(self.steps) - self.round_trips
+
+
+@dataclass
+class Loop:
+    path: str
+    function: str
+    line: int
+    awaits: list                # lines of the awaits in its body
+
+
+class File:
+    # The async functions of one file and the await runs in them
+    def __init__(self, path, text):
+        self.path = path
+        self.text = text
+        self.index = build_index(text, jsx=path.endswith(('x', '.js')))
+        self.runs = []
+        self.loops = []
+        for start, body, name in self._async_functions():
+            self._block(body, self.index.closers[body], name, None)
+
+    # Functions
+
+    def _async_functions(self):
+        index = self.index
+        for k, token in enumerate(index.tokens):
+            if token.kind == 'name' and index._value(k) == 'async':
+                body = self._async_body(k)
+                if body is not None:
+                    yield k, body, self._function_name(k)
+
+    def _async_body(self, k):
+        # Token index of the `{` opening the body of the async function at k
+        index = self.index
+        j = k + 1
+        if index._value(j) == 'function':
+            j += 1
+            if index._value(j) == '*':
+                j += 1
+            if index._kind(j) == 'name':
+                j += 1
+            return self._body_after_parameters(j)
+        if index._kind(j) == 'name' and index._value(j + 1) in ('(', '<'):
+            # A method, async load() { ... }
+            return self._body_after_parameters(j + 1)
+        if index._kind(j) == 'name' and index._is_arrow(j + 2):
+            j += 3
+        elif index._value(j) in ('(', '<'):
+            while j < len(index.tokens) and not index._is_arrow(j):
+                if index._value(j) == '<':
+                    j = index._skip_generic(j)
+                    continue
+                if index._value(j) in (';', '{') and not (index._value(j) == '{' and index._value(j - 1) in _TYPE_PUNCT):
+                    return None
+                j = index.closers.get(j, j) + 1
+            j += 1
+        else:
+            return None
+        return j if index._value(j) == '{' and j in index.closers else None
+
+    def _body_after_parameters(self, j):
+        index = self.index
+        if index._value(j) == '<':
+            j = index._skip_generic(j)
+        if index._value(j) != '(' or j not in index.closers:
+            return None
+        j = index.closers[j] + 1
+        while j < len(index.tokens):
+            value = index._value(j)
+            if value == '<':
+                j = index._skip_generic(j)
+                continue
+            if value == ';' or index._is_arrow(j):
+                return None
+            if value == '{' and j in index.closers and index._value(j - 1) not in _TYPE_PUNCT:
+                return j
+            j = index.closers.get(j, j) + 1
+        return None
+
+    def _function_name(self, k):
+        # loadData, or the call it is passed to (useEffect), or '(anonymous)'
+        index = self.index
+        if index._value(k + 1) == 'function' and index._kind(k + 2) == 'name':
+            name = index._value(k + 2)
+        elif index._kind(k + 1) == 'name' and index._value(k + 2) in ('(', '<'):
+            name = index._value(k + 1)
+        elif index._value(k - 1) in ('=', ':') and index._kind(k - 2) == 'name' and not index._is_arrow(k - 1):
+            name = index._value(k - 2)
+        else:
+            name = None
+        call = self._enclosing_call(k)
+        if name and call:
+            return f'{name} in {call}'
+        return name or (f'{call} callback' if call else '(anonymous)')
+
+    def _enclosing_call(self, k):
+        # The innermost hook call (useEffect, useCallback, ...) around token k
+        index = self.index
+        best = None
+        for opener, closer in index.closers.items():
+            if opener < k < closer and index._value(opener) == '(' and re.match(r'use[A-Z]\w*$', index._value(opener - 1) or ''):
+                if best is None or opener > best:
+                    best = opener
+        return index._value(best - 1) if best is not None else None
+
+    # Statements
+
+    def _statements(self, opener):
+        index = self.index
+        i, last = opener + 1, index.closers[opener] - 1
+        while i <= last:
+            end = min(index._statement_end(i), last)
+            yield i, end
+            i = end + 1
+
+    def _block(self, opener, closer, function, loop):
+        run = []
+        for start, end in self._statements(opener):
+            step = self._step(start, end)
+            if step is None:
+                self._close(run, function)
+                run = []
+                self._nested(start, end, function, loop)
+                continue
+            if loop is not None:
+                loop.awaits.append(step.line)
+            run.append(step)
+        self._close(run, function)
+
+    def _nested(self, start, end, function, loop):
+        # Recurse into the statement blocks of a statement, skipping nested
+        # functions (async ones are analyzed on their own)
+        index = self.index
+        i = start
+        while i <= end:
+            value = index._value(i)
+            if value == '{' and i in index.closers:
+                closer = index.closers[i]
+                header = self._block_header(i)
+                if header is not None:
+                    inner = loop
+                    if header in _LOOPS and not (header == 'for' and index._value(i - 1) == ')' and index._value(index.openers[i - 1] - 1) == 'await'):
+                        inner = Loop(self.path, function, self.line(i), [])
+                    self._block(i, closer, function, inner)
+                    if inner is not loop and inner.awaits:
+                        self.loops.append(inner)
+                i = closer + 1
+                continue
+            if value in ('(', '[') and i in index.closers:
+                i = index.closers[i] + 1
+                continue
+            i += 1
+
+    def _block_header(self, i):
+        # 'if', 'for', 'try', ... for a statement block at token i, else None
+        index = self.index
+        before = index._value(i - 1)
+        if before in _BLOCK_KEYWORDS:
+            return before
+        if before == ')' and i - 1 in index.openers:
+            keyword = index._value(index.openers[i - 1] - 1)
+            if keyword == 'await':
+                keyword = index._value(index.openers[i - 1] - 2)
+            if keyword in _BLOCK_HEADERS:
+                return keyword
+        return None
+
+    def _step(self, start, end):
+        # A Step for a statement that awaits, or None
+        index = self.index
+        last = end - 1 if index._value(end) == ';' else end
+        first = index._value(start)
+        step = None
+        if first in ('const', 'let', 'var'):
+            j = start + 1
+            if index._kind(j) == 'name':
+                pattern_end = j
+            elif index._value(j) in ('{', '[') and j in index.closers:
+                pattern_end = index.closers[j]
+            else:
+                return None
+            j = pattern_end + 1
+            annotated = index._value(j) == ':'
+            while j <= last and not (index._value(j) == '=' and not index._is_arrow(j + 1)):
+                if index._value(j) == '<':
+                    j = index._skip_generic(j)
+                    continue
+                j = index.closers.get(j, j) + 1
+            if index._value(j + 1) != 'await' or self._has_comma(j + 2, last):
+                return None
+            step = self._make(DECLARE, start, end, j + 2, last, self._bound(start + 1, pattern_end))
+            step.keyword = first
+            step.pattern = ' '.join(self.source(start + 1, pattern_end).split())
+            step.mergeable = step.mergeable and not annotated
+        elif first == 'await' and index._value(start + 1) != 'for':
+            step = self._make(EFFECT, start, end, start + 1, last, [])
+        elif index._kind(start) == 'name' and index._value(start + 1) == '=' and index._value(start + 2) == 'await':
+            step = self._make(ASSIGN, start, end, start + 3, last, [first])
+        return step
+
+    def _make(self, kind, start, end, first, last, binds):
+        index = self.index
+        step = Step(
+            self.line(start), kind, ' '.join(self.source(start, end).split()), binds, [],
+            start=index.tokens[start].start, end=index.tokens[end].end,
+        )
+        step.expression = self.source(first, last)
+        callee, plain = self._callee(first, last)
+        step.ordered = kind != DECLARE or callee is None or bool(MUTATING.match(callee))
+        step.mergeable = kind == DECLARE and not step.ordered and plain
+        step.uses = sorted({
+            index._value(i) for i in range(first, last + 1)
+            if index._kind(i) == 'name' and index._value(i - 1) != '.'
+        })
+        return step
+
+    def _callee(self, first, last):
+        # (name of the function awaited, whether the expression is nothing but
+        # a chain of calls and member accesses); (None, False) unless it is a
+        # call or an import()
+        index = self.index
+        i = first
+        callee = None
+        while i <= last and (index._kind(i) == 'name' or index._value(i) in ('.', '?')):
+            if index._kind(i) == 'name':
+                callee = index._value(i)
+            i += 1
+        if index._value(i) == '<':
+            i = index._skip_generic(i)
+        if callee is None or index._value(i) != '(' or i > last:
+            return None, False
+        # What follows the call has to keep it a single operand
+        i = index.closers.get(i, i) + 1
+        while i <= last:
+            value = index._value(i)
+            if value in ('(', '[') and i in index.closers:
+                i = index.closers[i] + 1
+            elif value in ('.', '?') or (index._kind(i) == 'name' and index._value(i - 1) in ('.', '?')):
+                i += 1
+            elif value == '<':
+                i = index._skip_generic(i)
+            else:
+                return callee, False
+        return callee, True
+
+    def _has_comma(self, first, last):
+        index = self.index
+        i = first
+        while i <= last:
+            if index._value(i) == ',':
+                return True
+            i = index.closers.get(i, i) + 1
+        return False
+
+    def _bound(self, first, last):
+        # Names a declaration's pattern binds; keys of `{ key: name }` excluded
+        index = self.index
+        return [
+            index._value(i) for i in range(first, last + 1)
+            if index._kind(i) == 'name' and index._value(i + 1) != ':' and index._value(i - 1) != '.'
+        ]
+
+    def _close(self, steps, function):
+        if len(steps) < 2:
+            return
+        bound = {}          # name -> index of the step binding it
+        barrier = 0
+        for number, step in enumerate(steps):
+            step.uses = [name for name in step.uses if name in bound]
+            depends = {bound[name] for name in step.uses}
+            step.level = 1 + max([barrier, *(steps[other].level for other in depends)])
+            if step.ordered:
+                barrier = step.level
+            for name in step.binds:
+                bound[name] = number
+        run = Run(self.path, function, steps[0].line, steps)
+        run.groups = self._groups(steps)
+        self.runs.append(run)
+
+    def _groups(self, steps):
+        groups = []
+        first = None
+        names = set()
+        for number, step in enumerate(steps + [None]):
+            joins = (
+                step is not None and step.mergeable and first is not None
+                and step.keyword == steps[first].keyword and not names & set(step.uses)
+                and not self._comment_between(steps[number - 1].end, step.start)
+            )
+            if joins:
+                names.update(step.binds)
+                continue
+            if first is not None and number - first > 1:
+                groups.append((first, number - 1))
+            first, names = (number, set(step.binds)) if step is not None and step.mergeable else (None, set())
+        return groups
+
+    def _comment_between(self, start, end):
+        return '/' in self.text[start:end]
+
+    # Helpers
+
+    def line(self, i):
+        return self.text.count('\n', 0, self.index.tokens[i].start) + 1
+
+    def source(self, first, last):
+        tokens = self.index.tokens
+        return self.text[tokens[first].start:tokens[last].end] if first <= last else ''
+
+
+def _indent(text, offset):
+    line_start = text.rfind('\n', 0, offset) + 1
+    return text[line_start:offset] if not text[line_start:offset].strip() else ''
+
+
+def merged(text, steps, indent):
+    # One `const [...] = await Promise.all([...]);` for a group of steps
+    patterns = ', '.join(step.pattern for step in steps)
+    lines = [f'{steps[0].keyword} [{patterns}] = await Promise.all([']
+    for step in steps:
+        expression = step.expression.replace('\n', '\n  ')
+        lines.append(f'{indent}  {expression},')
+    lines.append(f'{indent}]);')
+    return '\n'.join(lines)
+
+
+def merge(content, path):
+    # Transform: merge every mergeable group of awaits in one file
+    source = File(path, content)
+    edits = []
+    for run in source.runs:
+        for first, last in run.groups:
+            steps = run.steps[first:last + 1]
+            edits.append((steps[0].start, steps[-1].end, merged(content, steps, _indent(content, steps[0].start))))
+    for start, end, replacement in sorted(edits, reverse=True):
+        content = content[:start] + replacement + content[end:]
+    return content, len(edits)
+
+
+def analyze(root='.', patterns=PATTERNS):
+    runs = []
+    loops = []
+    for pattern in patterns:
+        for path in expand(pattern, root):
+            try:
+                with open(f'{root}/{path}', encoding='utf-8') as f:
+                    text = f.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            if 'await' not in text:
+                continue
+            source = File(path, text)
+            runs.extend(source.runs)
+            loops.extend(source.loops)
+    return runs, loops
+
+
+def report(runs, loops, verbose=False):
+    shown = [run for run in runs if verbose or run.saved]
+    for run in sorted(shown, key=lambda run: (-run.saved, run.path, run.line)):
+        print(f'{run.path}:{run.line} {run.function}: {len(run.steps)} awaits in a row, '
+              f"{run.round_trips} round trip{'s' if run.round_trips > 1 else ''} needed")
+        merged_lines = {step for first, last in run.groups for step in range(first, last + 1)}
+        for number, step in enumerate(run.steps):
+            notes = []
+            if step.uses:
+                notes.append('after ' + ', '.join(step.uses))
+            if step.ordered:
+                notes.append('ordered')
+            if number in merged_lines:
+                notes.append('merge')
+            text = step.source if len(step.source) <= 72 else step.source[:69] + '...'
+            print(f"  {step.line:5d}  {step.level}  {text}{'  (' + '; '.join(notes) + ')' if notes else ''}")
+    for loop in loops:
+        print(f'{loop.path}:{loop.line} {loop.function}: {len(loop.awaits)} awaits per loop iteration '
+              f"(lines {', '.join(map(str, loop.awaits))})")
+    awaits = sum(len(run.steps) for run in runs)
+    saved = sum(run.saved for run in runs)
+    groups = sum(len(run.groups) for run in runs)
+    grouped = sum(last - first + 1 for run in runs for first, last in run.groups)
+    print(f'{len(runs)} runs of serial awaits: {awaits} awaits, {awaits - saved} round trips needed, '
+          f'{saved} could overlap; {groups} groups of {grouped} awaits can be merged into Promise.all; '
+          f'{len(loops)} loops await per iteration')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Find serial awaits that could run concurrently and merge them into Promise.all.')
+    parser.add_argument('--root', default='.')
+    parser.add_argument('--write', action='store_true', help='merge independent awaits (default: only report)')
+    parser.add_argument('--dry-run', action='store_true', help='with --write, print a unified diff instead')
+    parser.add_argument('--verbose', action='store_true', help='also list runs with nothing to overlap')
+    parser.add_argument('--json', action='store_true')
+    args = parser.parse_args(argv)
+
+    runs, loops = analyze(args.root)
+    if args.json:
+        json.dump({'runs': [asdict(run) for run in runs], 'loops': [asdict(loop) for loop in loops]}, sys.stdout, indent=1)
+        print()
+        return 0
+    if not args.write:
+        report(runs, loops, args.verbose)
+        return 0
+
+    paths = sorted({run.path for run in runs if run.groups})
+    outcomes = iter_tasks([(path, partial(merge, path=path)) for path in paths], args.root, not args.dry_run, jobs=1, diff=args.dry_run)
+    if args.dry_run:
+        outcomes = stream_diffs(outcomes)
+    with contextlib.redirect_stdout(sys.stderr if args.dry_run else sys.stdout):
+        outcomes = list(outcomes)
+        summarize(outcomes, dry_run=args.dry_run)
+    return 1 if any(outcome.error for outcome in outcomes) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,30 +0,0 @@
-const fs = require('fs');
-const path = require('path');
-
-function fixImportsInFile(filePath) {
-  const content = fs.readFileSync(filePath, 'utf8');
-  const fixed = content.replace(/@[0-9]+\.[0-9]+\.[0-9]+(['"])/g, '$1');
-
-  if (content !== fixed) {
-    fs.writeFileSync(filePath, fixed, 'utf8');
-    console.log(`Fixed: ${filePath}`);
-  }
-}
-
-function walkDir(dir) {
-  const files = fs.readdirSync(dir);
-
-  files.forEach(file => {
-    const filePath = path.join(dir, file);
-    const stat = fs.statSync(filePath);
-
-    if (stat.isDirectory()) {
-      walkDir(filePath);
-    } else if (filePath.endsWith('.tsx') || filePath.endsWith('.ts')) {
-      fixImportsInFile(filePath);
-    }
-  });
-}
-
-walkDir('./src');
-console.log('Done fixing imports!');
@@ -0,0 +1,5 @@
+from codemods.manifest import run_script
+
+# Strip version suffixes from import specifiers across src/.
+# The patches themselves are declared in patches.toml.
+run_script('fix_imports.py')
@@ -1,19 +1,5 @@
-import time
+from codemods.manifest import run_script
 
-time.sleep(0.5)
-
-# Read the settings-categories file
-with open('src/data/settings-categories.ts', 'r', encoding='utf-8') as f:
-    content = f.read()
-
-# Update the import paths
-content = content.replace(
-    "from '../components/settings/",
-    "from '../pages/Settings/"
-)
-
-# Write back
-with open('src/data/settings-categories.ts', 'w', encoding='utf-8') as f:
-    f.write(content)
-
-print("Updated settings-categories.ts import paths!")
+# Update settings-categories.ts import paths.
+# The patches themselves are declared in patches.toml.
+run_script('fix_settings_paths.py')
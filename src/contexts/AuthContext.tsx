@@ -11,6 +11,7 @@ import {
   handleOAuthCallback,
   isAuthenticated as checkIsAuthenticated,
 } from '../services/authService';
+import { invalidateApiCache } from '../services/apiClient';
 
 interface AuthContextType {
   user: User | null;
@@ -114,6 +115,7 @@ export function AuthProvider({ children }: AuthProviderProps) {
 
   const logout = useCallback(() => {
     authLogout();
+    invalidateApiCache();
     setUser(null);
     setToken(null);
     setError(null);
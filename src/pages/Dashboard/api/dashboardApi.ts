@@ -4,6 +4,7 @@
  */
 
 import { getAuthHeaders } from '../../../services/authService';
+import { withApiCache } from '../../../services/apiClient';
 const API_URL = import.meta.env.VITE_API_URL || 'https://api.workdeck.com';
 
 // Response wrapper type
@@ -274,9 +275,15 @@ export interface User {
 const API_TIMEOUT = 15000;
 
 /**
- * Generic API fetch wrapper with auth and timeout
+ * Generic API fetch wrapper with auth and timeout. Goes through the response
+ * cache in services/apiClient.ts, so the dashboard and the service modules
+ * share their GETs.
  */
 async function apiFetch<T>(endpoint: string, options?: RequestInit & { timeout?: number }): Promise<T> {
+  return withApiCache(endpoint, options, () => fetchDashboardApi<T>(endpoint, options));
+}
+
+async function fetchDashboardApi<T>(endpoint: string, options?: RequestInit & { timeout?: number }): Promise<T> {
   const timeout = options?.timeout ?? API_TIMEOUT;
 
   // Create abort controller for timeout
@@ -337,9 +344,10 @@ async function apiFetch<T>(endpoint: string, options?: RequestInit & { timeout?:
       return data.result as T;
     }
 
-    // Check for API-level errors (200 HTTP but status: "ERROR" in body)
-    if (data.status === 'ERROR') {
-      const errorMessage = data.result?.message || data.result?.code || data.message || 'API returned error status';
+    // Check for API-level errors (200 HTTP but status: "ERROR" or "KO" in body)
+    if (data.status === 'ERROR' || data.status === 'KO') {
+      const errorMessage = (typeof data.result === 'string' ? data.result : data.result?.message || data.result?.code) ||
+        data.message || 'API returned error status';
       console.error(`[apiFetch ${requestId}] API Error:`, data);
       throw new Error(errorMessage);
     }
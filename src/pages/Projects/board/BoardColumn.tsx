@@ -5,6 +5,7 @@ import { SortableContext, verticalListSortingStrategy, useSortable } from '@dnd-
 import { CSS } from '@dnd-kit/utilities';
 import { ImprovedTaskCard } from './ImprovedTaskCard';
 import { Column, Task } from './ProjectBoard';
+import { shallowEqual } from '../../../utils/shallowEqual';
 
 interface BoardColumnProps {
   column: Column;
@@ -12,7 +13,7 @@ interface BoardColumnProps {
   showDescription: boolean;
   showParticipants: boolean;
   onDeleteColumn: (columnId: string) => void;
-  onEditColumn: () => void;
+  onEditColumn: (columnId: string) => void;
   onDeleteTask: (columnId: string, taskId: string) => void;
   onMarkAsDone: (columnId: string, taskId: string) => void;
   onUpdateTask?: (columnId: string, taskId: string, updates: any) => void;
@@ -20,7 +21,25 @@ interface BoardColumnProps {
   onTagClick?: (tagId: string, tagName: string) => void;
 }
 
-export function BoardColumn({
+// Re-render only when a prop changes; `column` is compared field by field,
+// so an equal copy doesn't count
+function areBoardColumnPropsEqual(prev: BoardColumnProps, next: BoardColumnProps) {
+  return (
+    shallowEqual(prev.column, next.column) &&
+    prev.cardSize === next.cardSize &&
+    prev.showDescription === next.showDescription &&
+    prev.showParticipants === next.showParticipants &&
+    prev.onDeleteColumn === next.onDeleteColumn &&
+    prev.onEditColumn === next.onEditColumn &&
+    prev.onDeleteTask === next.onDeleteTask &&
+    prev.onMarkAsDone === next.onMarkAsDone &&
+    prev.onUpdateTask === next.onUpdateTask &&
+    prev.onTaskClick === next.onTaskClick &&
+    prev.onTagClick === next.onTagClick
+  );
+}
+
+export const BoardColumn = React.memo(function BoardColumn({
   column,
   cardSize,
   showDescription,
@@ -173,7 +192,7 @@ export function BoardColumn({
                 }}>
                   <button
                     onClick={() => {
-                      onEditColumn();
+                      onEditColumn(column.id);
                       setShowMenu(false);
                     }}
                     style={{
@@ -333,4 +352,4 @@ export function BoardColumn({
       </div>
     </div>
   );
-}
+}, areBoardColumnPropsEqual);
@@ -4,6 +4,7 @@ import { useSortable } from '@dnd-kit/sortable';
 import { CSS } from '@dnd-kit/utilities';
 import { Task } from './ProjectBoard';
 import { BlockedModal } from './BlockedModal';
+import { shallowEqual } from '../../../utils/shallowEqual';
 
 interface ImprovedTaskCardProps {
   task: Task;
@@ -21,7 +22,27 @@ interface ImprovedTaskCardProps {
   onToggleSelect?: (taskId: string) => void;
 }
 
-export function ImprovedTaskCard({
+// Re-render only when a prop changes; `task` is compared field by field,
+// so an equal copy doesn't count
+function areImprovedTaskCardPropsEqual(prev: ImprovedTaskCardProps, next: ImprovedTaskCardProps) {
+  return (
+    shallowEqual(prev.task, next.task) &&
+    prev.columnId === next.columnId &&
+    prev.size === next.size &&
+    prev.showDescription === next.showDescription &&
+    prev.showParticipants === next.showParticipants &&
+    prev.showProjectReference === next.showProjectReference &&
+    prev.onTaskClick === next.onTaskClick &&
+    prev.onDelete === next.onDelete &&
+    prev.onMarkAsDone === next.onMarkAsDone &&
+    prev.onUpdateTask === next.onUpdateTask &&
+    prev.onTagClick === next.onTagClick &&
+    prev.isSelected === next.isSelected &&
+    prev.onToggleSelect === next.onToggleSelect
+  );
+}
+
+export const ImprovedTaskCard = React.memo(function ImprovedTaskCard({
   task,
   columnId,
   size,
@@ -883,4 +904,4 @@ export function ImprovedTaskCard({
       </div>
     </div>
   );
-}
\ No newline at end of file
+}, areImprovedTaskCardPropsEqual);
\ No newline at end of file
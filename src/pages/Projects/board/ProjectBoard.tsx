@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useRef } from 'react';
+import React, { useState, useEffect, useRef, useCallback } from 'react';
 import { Search, Plus, Settings, X, ChevronLeft, MoreVertical, Tag, Filter, Users, ZoomIn, ZoomOut } from 'lucide-react';
 import {
   DndContext,
@@ -23,9 +23,197 @@ import { ImprovedTaskCard } from './ImprovedTaskCard';
 import { TaskDetailModal } from '../gantt/TaskDetailModal';
 import { GanttTask } from '../gantt/types';
 import { BoardLegend } from './BoardLegend';
-// LocalStorage keys
+// LocalStorage persistence: the whole board lives under one key per project.
+// Saves are debounced and run when the browser is idle, so a drag doesn't
+// serialize the board on every move, and columns that haven't changed since
+// the last save reuse their serialized JSON.
+//
+// Format 2 stores columns as ordered task id lists and the tasks in one
+// dictionary, without the fields derived on load: a task's `id` is its key
+// and its `color` is its column's unless it differs. codemods/boardformat.py
+// reads and writes the same format.
 const STORAGE_PREFIX = 'workdeck_board_';
-const getStorageKey = (projectName: string, key: string) => `${STORAGE_PREFIX}${projectName}_${key}`;
+const STORAGE_VERSION = 2;
+const SAVE_DELAY_MS = 300;
+const SAVE_IDLE_TIMEOUT_MS = 2000;
+const getStorageKey = (projectName: string) => `${STORAGE_PREFIX}${projectName}`;
+// Earlier formats: 1 kept full task objects under a versioned key, and
+// before that every field had a key of its own
+const getV1StorageKey = (projectName: string) => `${STORAGE_PREFIX}v1_${projectName}`;
+const LEGACY_FIELDS = ['columns', 'labels', 'views', 'cardSize'] as const;
+const getLegacyStorageKey = (projectName: string, key: string) => `${STORAGE_PREFIX}${projectName}_${key}`;
+const getPreviousStorageKeys = (projectName: string) =>
+  [getV1StorageKey(projectName), ...LEGACY_FIELDS.map((field) => getLegacyStorageKey(projectName, field))];
+
+interface PersistedBoard {
+  columns: Column[];
+  labels: Array<{ id: string; name: string; color: string }>;
+  views: any[];
+  cardSize: 'small' | 'medium' | 'large';
+}
+
+type StoredTask = Omit<Task, 'id' | 'color'> & { color?: string };
+type StoredColumn = Omit<Column, 'tasks'> & { taskIds: string[] };
+
+const decodeColumns = (columns: StoredColumn[], tasks: Record<string, StoredTask>): Column[] =>
+  columns.map(({ taskIds, ...column }) => ({
+    ...column,
+    tasks: taskIds
+      .filter((id) => id in tasks)
+      .map((id) => ({ ...tasks[id], id, color: tasks[id].color ?? column.color })),
+  }));
+
+const loadBoard = (projectName: string): Partial<PersistedBoard> | null => {
+  const saved = localStorage.getItem(getStorageKey(projectName)) ?? localStorage.getItem(getV1StorageKey(projectName));
+  if (saved) {
+    try {
+      const parsed = JSON.parse(saved);
+      if (parsed.version === STORAGE_VERSION) {
+        return { ...parsed, columns: decodeColumns(parsed.columns, parsed.tasks) };
+      }
+      if (parsed.version === 1) {
+        return parsed;
+      }
+    } catch (e) {
+      console.error('Failed to parse saved board:', e);
+    }
+    return null;
+  }
+
+  const legacy: Partial<PersistedBoard> = {};
+  let found = false;
+  for (const field of LEGACY_FIELDS) {
+    const value = localStorage.getItem(getLegacyStorageKey(projectName, field));
+    if (value === null) continue;
+    found = true;
+    try {
+      legacy[field] = field === 'cardSize' ? value : JSON.parse(value);
+    } catch (e) {
+      console.error(`Failed to parse saved ${field}:`, e);
+    }
+  }
+  return found ? legacy : null;
+};
+
+// Serialized form of each column by object identity: its entry in `columns`
+// and its tasks' entries in `tasks`. Board updates replace only the columns
+// they touch, so the others are found here instead of re-serialized.
+const columnJson = new WeakMap<Column, { column: string; tasks: string }>();
+
+const encodeColumn = (column: Column) => {
+  let json = columnJson.get(column);
+  if (json === undefined) {
+    const { tasks, ...rest } = column;
+    const entries = tasks.map(({ id, color, ...task }) =>
+      `${JSON.stringify(id)}:${JSON.stringify(color === column.color ? task : { ...task, color })}`);
+    json = { column: JSON.stringify({ ...rest, taskIds: tasks.map((task) => task.id) }), tasks: entries.join(',') };
+    columnJson.set(column, json);
+  }
+  return json;
+};
+
+const hasDuplicateTaskIds = (columns: Column[]) => {
+  const seen = new Set<string>();
+  for (const column of columns) {
+    for (const task of column.tasks) {
+      if (seen.has(task.id)) return true;
+      seen.add(task.id);
+    }
+  }
+  return false;
+};
+
+const serializeBoard = (board: PersistedBoard) => {
+  // Format 2 keys tasks by id alone, so a board with an id in two columns
+  // would lose one of the tasks; it is saved whole in format 1 instead
+  if (hasDuplicateTaskIds(board.columns)) {
+    return JSON.stringify({ version: 1, columns: board.columns, labels: board.labels, views: board.views, cardSize: board.cardSize });
+  }
+  const columns = board.columns.map(encodeColumn);
+  const customViews = board.views.filter((v: any) => !v.isSystem);
+  return `{"version":${STORAGE_VERSION},"columns":[${columns.map((json) => json.column).join(',')}],` +
+    `"tasks":{${columns.map((json) => json.tasks).filter(Boolean).join(',')}},` +
+    `"labels":${JSON.stringify(board.labels)},"views":${JSON.stringify(customViews)},"cardSize":${JSON.stringify(board.cardSize)}}`;
+};
+
+// Restores the saved board once per project, then saves every change in the
+// background. Pending saves are flushed when the page is hidden or the board
+// unmounts. Nothing is saved until the restored board has rendered: in the
+// commit that loads it the board is still the generated default, and saving
+// that (StrictMode's simulated unmount flushes right away) would overwrite
+// the saved board and drop the keys of the formats it was migrated from.
+function useBoardPersistence(
+  projectName: string,
+  board: PersistedBoard,
+  restore: (saved: Partial<PersistedBoard>) => void
+) {
+  const latest = useRef(board);
+  latest.current = board;
+  const loadedProject = useRef<string | null>(null);
+  const pending = useRef<{ projectName: string; timer: number; idle?: number } | null>(null);
+  const written = useRef<string | null>(null);
+  // Set by the load effect, cleared by the save effect of the same commit
+  const restoring = useRef(false);
+
+  const flush = useCallback(() => {
+    const save = pending.current;
+    if (!save) return;
+    pending.current = null;
+    window.clearTimeout(save.timer);
+    if (save.idle !== undefined) {
+      window.cancelIdleCallback(save.idle);
+    }
+    const json = serializeBoard(latest.current);
+    if (json === written.current) return;
+    try {
+      localStorage.setItem(getStorageKey(save.projectName), json);
+      written.current = json;
+      getPreviousStorageKeys(save.projectName).forEach((key) => localStorage.removeItem(key));
+    } catch (e) {
+      console.error('Failed to save board:', e);
+    }
+  }, []);
+
+  useEffect(() => {
+    const saved = loadBoard(projectName);
+    if (saved) {
+      restore(saved);
+    }
+    loadedProject.current = projectName;
+    restoring.current = true;
+    written.current = null;
+    return flush;
+  }, [projectName]);
+
+  useEffect(() => {
+    if (loadedProject.current !== projectName) return;
+    if (restoring.current) {
+      restoring.current = false;
+      return;
+    }
+    const previous = pending.current;
+    if (previous) {
+      window.clearTimeout(previous.timer);
+      if (previous.idle !== undefined) {
+        window.cancelIdleCallback(previous.idle);
+      }
+    }
+    const save: { projectName: string; timer: number; idle?: number } = { projectName, timer: 0 };
+    save.timer = window.setTimeout(() => {
+      if ('requestIdleCallback' in window) {
+        save.idle = window.requestIdleCallback(flush, { timeout: SAVE_IDLE_TIMEOUT_MS });
+      } else {
+        flush();
+      }
+    }, SAVE_DELAY_MS);
+    pending.current = save;
+  }, [board.columns, board.labels, board.views, board.cardSize, projectName]);
+
+  useEffect(() => {
+    window.addEventListener('pagehide', flush);
+    return () => window.removeEventListener('pagehide', flush);
+  }, [flush]);
+}
 
 
 interface ProjectBoardProps {
@@ -61,7 +249,6 @@ export interface Column {
 }
 
 export function ProjectBoard({ onClose, projectName = 'BIOGEMSE' }: ProjectBoardProps) {
-  const isInitialMount = useRef(true);
   const [boardExists, setBoardExists] = useState(true);
   const [showCreateDialog, setShowCreateDialog] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
@@ -293,83 +480,30 @@ export function ProjectBoard({ onClose, projectName = 'BIOGEMSE' }: ProjectBoard
     }
   ]);
 
-  // Load board data from localStorage on mount
-  useEffect(() => {
-    const savedColumns = localStorage.getItem(getStorageKey(projectName, 'columns'));
-    const savedLabels = localStorage.getItem(getStorageKey(projectName, 'labels'));
-    const savedViews = localStorage.getItem(getStorageKey(projectName, 'views'));
-    const savedCardSize = localStorage.getItem(getStorageKey(projectName, 'cardSize'));
-
-    if (savedColumns) {
-      try {
-        const parsed = JSON.parse(savedColumns);
-        setColumns(parsed);
-      } catch (e) {
-        console.error('Failed to parse saved columns:', e);
+  // Load board data from localStorage on mount; changes are saved in the background
+  useBoardPersistence(
+    projectName,
+    { columns, labels: boardLabels, views: savedViews, cardSize },
+    (saved) => {
+      if (saved.columns) {
+        setColumns(saved.columns);
       }
-    }
-
-    if (savedLabels) {
-      try {
-        const parsed = JSON.parse(savedLabels);
-        setBoardLabels(parsed);
-      } catch (e) {
-        console.error('Failed to parse saved labels:', e);
+      if (saved.labels) {
+        setBoardLabels(saved.labels);
       }
-    }
-
-    if (savedViews) {
-      try {
-        const parsed = JSON.parse(savedViews);
+      if (saved.views) {
         // Only load custom views, keep existing system views from initial state
-        const customViews = parsed.filter((v: any) => !v.isSystem);
+        const customViews = saved.views.filter((v: any) => !v.isSystem);
         setSavedViews((current) => {
           const systemViews = current.filter(v => v.isSystem);
           return [...systemViews, ...customViews];
         });
-      } catch (e) {
-        console.error('Failed to parse saved views:', e);
+      }
+      if (saved.cardSize) {
+        setCardSize(saved.cardSize);
       }
     }
-
-    if (savedCardSize) {
-      setCardSize(savedCardSize as 'small' | 'medium' | 'large');
-    }
-
-    // Mark that initial load is complete
-    isInitialMount.current = false;
-  }, [projectName]);
-
-  // Save columns to localStorage whenever they change (skip initial mount)
-  useEffect(() => {
-    if (!isInitialMount.current) {
-      localStorage.setItem(getStorageKey(projectName, 'columns'), JSON.stringify(columns));
-    }
-  }, [columns, projectName]);
-
-  // Save labels to localStorage whenever they change (skip initial mount)
-  useEffect(() => {
-    if (!isInitialMount.current) {
-      localStorage.setItem(getStorageKey(projectName, 'labels'), JSON.stringify(boardLabels));
-    }
-  }, [boardLabels, projectName]);
-
-  // Save views to localStorage whenever they change (only custom views, skip initial mount)
-  useEffect(() => {
-    if (!isInitialMount.current) {
-      const customViews = savedViews.filter(v => !v.isSystem);
-      localStorage.setItem(getStorageKey(projectName, 'views'), JSON.stringify(customViews));
-    }
-  }, [savedViews, projectName]);
-
-  // Save card size preference (skip initial mount)
-  useEffect(() => {
-    if (!isInitialMount.current) {
-      localStorage.setItem(getStorageKey(projectName, 'cardSize'), cardSize);
-    }
-  }, [cardSize, projectName]);
-
-
+  );
 
   const handleCreateBoard = () => {
     setBoardExists(true);
@@ -436,23 +570,27 @@ export function ProjectBoard({ onClose, projectName = 'BIOGEMSE' }: ProjectBoard
       );
       if (!targetCol) return prevColumns;
 
-      // Remove from source column
-      sourceCol.tasks = sourceCol.tasks.filter(t => t.id !== activeId);
-
       // Update task color to match target column
       const updatedTask = { ...taskToMove, color: targetCol.color };
 
-      // Insert into target column
-      if (targetCol.tasks.some(t => t.id === overId)) {
-        // Dropped on a specific task - insert before it
-        const overIndex = targetCol.tasks.findIndex(t => t.id === overId);
-        targetCol.tasks.splice(overIndex, 0, updatedTask);
-      } else {
-        // Dropped on empty column - append to end
-        targetCol.tasks.push(updatedTask);
-      }
-
-      return newColumns;
+      // Copy the columns that change so memoized BoardColumns see new props
+      return newColumns.map(col => {
+        if (col !== sourceCol && col !== targetCol) return col;
+        // Remove from source column
+        const tasks = col.tasks.filter(t => t.id !== activeId);
+        if (col !== targetCol) return { ...col, tasks };
+
+        // Insert into target column
+        const overIndex = tasks.findIndex(t => t.id === overId);
+        if (overIndex !== -1) {
+          // Dropped on a specific task - insert before it
+          tasks.splice(overIndex, 0, updatedTask);
+        } else {
+          // Dropped on empty column - append to end
+          tasks.push(updatedTask);
+        }
+        return { ...col, tasks };
+      });
     });
   };
 
@@ -472,8 +610,14 @@ export function ProjectBoard({ onClose, projectName = 'BIOGEMSE' }: ProjectBoard
     });
   };
 
-  const handleDeleteColumn = (columnId: string) => {
-    const column = columns.find(c => c.id === columnId);
+  // The handlers below are passed to every column and card, so they keep one
+  // identity: they update through setColumns(prev => ...) instead of closing
+  // over `columns`, which changes on every drag and edit
+  const renderedColumns = useRef(columns);
+  renderedColumns.current = columns;
+
+  const handleDeleteColumn = useCallback((columnId: string) => {
+    const column = renderedColumns.current.find(c => c.id === columnId);
     if (!column) return;
     
     if (column.id === 'open' || column.id === 'completed') {
@@ -486,8 +630,12 @@ export function ProjectBoard({ onClose, projectName = 'BIOGEMSE' }: ProjectBoard
       return;
     }
 
-    setColumns(prev => prev.filter(col => col.id !== columnId));
-  };
+    setColumns(prev => prev.filter(col => col.id !== columnId || col.tasks.length > 0));
+  }, []);
+
+  const handleEditColumn = useCallback((columnId: string) => {
+    setShowColumnSettings(columnId);
+  }, []);
 
   const handleUpdateColumn = (columnId: string, updates: Partial<Column>) => {
     setColumns(prev => prev.map(col => 
@@ -496,34 +644,31 @@ export function ProjectBoard({ onClose, projectName = 'BIOGEMSE' }: ProjectBoard
     setShowColumnSettings(null);
   };
 
-  const handleDeleteTask = (columnId: string, taskId: string) => {
+  const handleDeleteTask = useCallback((columnId: string, taskId: string) => {
     setColumns(prev => prev.map(col => 
       col.id === columnId 
         ? { ...col, tasks: col.tasks.filter(t => t.id !== taskId) }
         : col
     ));
-  };
-
-  const handleMarkAsDone = (columnId: string, taskId: string) => {
-    const task = columns.find(col => col.id === columnId)?.tasks.find(t => t.id === taskId);
-    if (!task) return;
+  }, []);
 
+  const handleMarkAsDone = useCallback((columnId: string, taskId: string) => {
     setColumns(prev => {
-      const newColumns = [...prev];
-      const fromColumn = newColumns.find(col => col.id === columnId);
-      const completedColumn = newColumns.find(col => col.isCompleted);
-
-      if (fromColumn && completedColumn) {
-        fromColumn.tasks = fromColumn.tasks.filter(t => t.id !== taskId);
-        const updatedTask = { ...task, color: completedColumn.color };
-        completedColumn.tasks.unshift(updatedTask);
-      }
-
-      return newColumns;
+      const fromColumn = prev.find(col => col.id === columnId);
+      const completedColumn = prev.find(col => col.isCompleted);
+      const task = fromColumn?.tasks.find(t => t.id === taskId);
+      if (!fromColumn || !completedColumn || !task) return prev;
+
+      const updatedTask = { ...task, color: completedColumn.color };
+      return prev.map(col => {
+        if (col !== fromColumn && col !== completedColumn) return col;
+        const tasks = col.tasks.filter(t => t.id !== taskId);
+        return { ...col, tasks: col === completedColumn ? [updatedTask, ...tasks] : tasks };
+      });
     });
-  };
+  }, []);
 
-  const handleCardUpdateTask = (columnId: string, taskId: string, updates: any) => {
+  const handleCardUpdateTask = useCallback((columnId: string, taskId: string, updates: any) => {
     setColumns(prev => prev.map(col => 
       col.id === columnId 
         ? { 
@@ -536,9 +681,9 @@ export function ProjectBoard({ onClose, projectName = 'BIOGEMSE' }: ProjectBoard
           }
         : col
     ));
-  };
+  }, []);
 
-  const handleTaskClick = (task: Task) => {
+  const handleTaskClick = useCallback((task: Task) => {
     // Convert Task to GanttTask format for the modal
     const ganttTask: GanttTask = {
       id: task.id,
@@ -554,22 +699,24 @@ export function ProjectBoard({ onClose, projectName = 'BIOGEMSE' }: ProjectBoard
       dependencies: []
     };
     setSelectedTask(ganttTask);
-  };
+  }, []);
 
-  const handleTagClick = (tagId: string, tagName: string) => {
+  // The filters as rendered, for the same reason as renderedColumns
+  const renderedFilters = useRef(activeFilters);
+  renderedFilters.current = activeFilters;
+
+  const handleTagClick = useCallback((tagId: string, tagName: string) => {
     // Check if tag is already in filters
-    const existingFilter = activeFilters.find(f => f.type === 'tag' && f.value === tagId);
-
-    if (!existingFilter) {
-      // Add tag to filters
-      setActiveFilters([...activeFilters, {
-        type: 'tag',
-        value: tagId,
-        label: tagName
-      }]);
-      setShowFilterBar(true);
-    }
-  };
+    if (renderedFilters.current.some(f => f.type === 'tag' && f.value === tagId)) return;
+
+    // Add tag to filters
+    setActiveFilters(prev => [...prev, {
+      type: 'tag',
+      value: tagId,
+      label: tagName
+    }]);
+    setShowFilterBar(true);
+  }, []);
 
   const handleUpdateTask = (taskId: string, updates: Partial<GanttTask>) => {
     // Update the task in the columns
@@ -1142,7 +1289,7 @@ export function ProjectBoard({ onClose, projectName = 'BIOGEMSE' }: ProjectBoard
                   showDescription={showDescription}
                   showParticipants={showParticipants}
                   onDeleteColumn={handleDeleteColumn}
-                  onEditColumn={() => setShowColumnSettings(column.id)}
+                  onEditColumn={handleEditColumn}
                   onDeleteTask={handleDeleteTask}
                   onMarkAsDone={handleMarkAsDone}
                   onUpdateTask={handleCardUpdateTask}
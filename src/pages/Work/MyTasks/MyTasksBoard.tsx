@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useMemo } from 'react';
+import React, { useState, useEffect, useMemo, useCallback } from 'react';
 import { ArrowLeft, Filter, Search, Settings, ChevronDown, Clock, Eye } from 'lucide-react';
 import { DndContext, DragOverlay, closestCorners, PointerSensor, useSensor, useSensors, DragStartEvent, DragEndEvent } from '@dnd-kit/core';
 import { SortableContext, horizontalListSortingStrategy, arrayMove } from '@dnd-kit/sortable';
@@ -201,7 +201,7 @@ export function MyTasksBoard({ onStartTimer: onStartTimerProp }: MyTasksBoardPro
   }, [focusMode, hideDone, showKeyboardShortcuts]);
 
   // Timer functions
-  const startTimer = (taskId: string) => {
+  const startTimer = useCallback((taskId: string) => {
     const task = myTasks[taskId];
     if (!task) return;
 
@@ -214,7 +214,7 @@ export function MyTasksBoard({ onStartTimer: onStartTimerProp }: MyTasksBoardPro
     // Otherwise use local timer
     setPendingTimerTaskId(taskId);
     setShowSetDuration(true);
-  };
+  }, [myTasks, onStartTimerProp]);
 
   const handleStartTimerWithDuration = (durationMinutes: number) => {
     if (!pendingTimerTaskId) return;
@@ -231,31 +231,32 @@ export function MyTasksBoard({ onStartTimer: onStartTimerProp }: MyTasksBoardPro
     toast.success(`Timer started - ${durationMinutes} min`);
   };
 
-  const pauseTimer = () => {
-    if (timerState.taskId && timerState.startTime && !timerState.isPaused) {
-      const elapsed = Date.now() - timerState.startTime;
-      setTimerState({
-        ...timerState,
-        pausedTime: timerState.pausedTime + elapsed,
+  const pauseTimer = useCallback(() => {
+    setTimerState(prev => {
+      if (!prev.taskId || !prev.startTime || prev.isPaused) return prev;
+      return {
+        ...prev,
+        pausedTime: prev.pausedTime + Date.now() - prev.startTime,
         isPaused: true,
         startTime: null,
-      });
-    }
-  };
+      };
+    });
+  }, []);
 
-  const resumeTimer = () => {
-    if (timerState.taskId && timerState.isPaused) {
-      setTimerState({
-        ...timerState,
+  const resumeTimer = useCallback(() => {
+    setTimerState(prev => {
+      if (!prev.taskId || !prev.isPaused) return prev;
+      return {
+        ...prev,
         startTime: Date.now(),
         isPaused: false,
-      });
-    }
-  };
+      };
+    });
+  }, []);
 
-  const stopTimer = () => {
+  const stopTimer = useCallback(() => {
     setShowSaveTimeEntry(true);
-  };
+  }, []);
 
   const handleSaveTimeEntry = () => {
     setTimerState({
@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { Calendar, MessageSquare, Play, AlertCircle, Pause, Square, Clock, CheckSquare } from 'lucide-react';
 import { useDraggable } from '@dnd-kit/core';
+import { shallowEqual } from '../../../utils/shallowEqual';
 
 interface Task {
   id: string;
@@ -35,7 +36,23 @@ interface TaskCardProps {
   elapsedTime?: number;
 }
 
-export function TaskCard({
+// Re-render only when a prop changes; `task` is compared field by field,
+// so an equal copy doesn't count
+function areTaskCardPropsEqual(prev: TaskCardProps, next: TaskCardProps) {
+  return (
+    shallowEqual(prev.task, next.task) &&
+    prev.cardSize === next.cardSize &&
+    prev.onStartTimer === next.onStartTimer &&
+    prev.onPauseTimer === next.onPauseTimer &&
+    prev.onStopTimer === next.onStopTimer &&
+    prev.onTaskClick === next.onTaskClick &&
+    prev.isTimerActive === next.isTimerActive &&
+    prev.isPaused === next.isPaused &&
+    prev.elapsedTime === next.elapsedTime
+  );
+}
+
+export const TaskCard = React.memo(function TaskCard({
   task,
   cardSize,
   onStartTimer,
@@ -1002,4 +1019,4 @@ export function TaskCard({
       `}</style>
     </div>
   );
-}
+}, areTaskCardPropsEqual);
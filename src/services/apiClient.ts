@@ -30,12 +30,157 @@ export interface ApiError {
 export interface ApiRequestOptions extends RequestInit {
   timeout?: number;
   skipAuth?: boolean;
+  /** Milliseconds a cached GET response is reused; 0 always refetches */
+  cacheTtl?: number;
+}
+
+// ==================== Response Cache ====================
+//
+// Concurrent GETs for the same endpoint share one request, and a response is
+// reused for its endpoint's `ttl`, then served stale for up to `stale` more
+// while a background request refreshes it. Mutations drop the cached queries
+// they affect, or everything when no rule matches. Only what a request
+// resolves to is cached, so request functions must throw on KO and ERROR
+// envelopes rather than return them. Callers share the cached objects, so
+// they must not mutate them.
+
+interface CachePolicy {
+  ttl: number;
+  stale: number;
+}
+
+const DEFAULT_CACHE_POLICY: CachePolicy = { ttl: 5_000, stale: 0 };
+
+// First match wins; endpoints are matched without their query string
+const CACHE_POLICIES: Array<[RegExp, CachePolicy]> = [
+  // Reference data, which only changes through settings
+  [/^\/queries\/(users-summary|users|departments|offices|staff-categories|skills|leave-types|currencies|cost-types|task-stages)$/, { ttl: 300_000, stale: 1_800_000 }],
+  [/^\/queries\/me$/, { ttl: 60_000, stale: 600_000 }],
+  [/^\/queries\/(projects|projects-summary|milestones-summary)$/, { ttl: 30_000, stale: 300_000 }],
+  // Streams and suggestions are always fetched
+  [/^\/queries\/(timesheet-stream|expense-stream|events\/recommend-time)/, { ttl: 0, stale: 0 }],
+  [/^\/queries\//, { ttl: 10_000, stale: 60_000 }],
+];
+
+// Mutation endpoint -> prefixes of the queries it makes stale; every
+// matching rule applies
+const INVALIDATIONS: Array<[RegExp, string[]]> = [
+  [/whats-new/, ['/queries/whats-new']],
+  [/widget/, ['/queries/me/widgets']],
+  [/\/user\/(update|delete|clear-completed)-checklist/, ['/queries/me/checklist']],
+  [/event/, ['/queries/events', '/queries/whats-new', '/queries/whats-pending']],
+  [/expense/, ['/queries/expenses', '/queries/widget-expenses', '/queries/widget-purchases', '/queries/whats-pending']],
+  [/leave/, ['/queries/leave-requests', '/queries/me/leave-requests', '/queries/leave-working-days', '/queries/who-is-where', '/queries/whats-pending']],
+  [/timesheet/, ['/queries/timesheets', '/queries/me/timesheets', '/queries/time-entries', '/queries/whats-pending']],
+  [/comment/, ['/queries/comments', '/queries/tasks']],
+  [/task|activity|milestone|dependency|participant/, ['/queries/tasks', '/queries/gantt', '/queries/milestones', '/queries/projects', '/queries/widget-task-count', '/queries/widget-red-zone', '/queries/widget-milestones', '/queries/whats-new']],
+  [/project|budget|member/, ['/queries/projects', '/queries/gantt', '/queries/widget-portfolio', '/queries/widget-red-zone', '/queries/widget-milestones']],
+  [/file|upload/, ['/queries/files']],
+];
+
+interface CacheEntry {
+  data: unknown;
+  fetchedAt: number;
+}
+
+const responseCache = new Map<string, CacheEntry>();
+const inFlight = new Map<string, Promise<unknown>>();
+// Auth headers the cached responses were fetched with
+let cacheOwner: string | undefined;
+// Bumped on every invalidation, so a GET that started before a mutation
+// doesn't cache what it read
+let cacheGeneration = 0;
+
+function cachePolicy(endpoint: string): CachePolicy {
+  const path = endpoint.split('?')[0];
+  return CACHE_POLICIES.find(([pattern]) => pattern.test(path))?.[1] ?? DEFAULT_CACHE_POLICY;
+}
+
+/**
+ * Forget cached and in-flight GETs whose endpoint starts with one of the
+ * prefixes, or all of them. AuthContext clears everything on logout.
+ */
+export function invalidateApiCache(prefixes?: string[]): void {
+  cacheGeneration++;
+  for (const cache of [responseCache, inFlight]) {
+    for (const key of Array.from(cache.keys())) {
+      if (!prefixes || prefixes.some((prefix) => key.startsWith(prefix))) {
+        cache.delete(key);
+      }
+    }
+  }
+}
+
+function fetchShared<T>(key: string, request: () => Promise<T>): Promise<T> {
+  const pending = inFlight.get(key);
+  if (pending) {
+    return pending as Promise<T>;
+  }
+  const generation = cacheGeneration;
+  const promise = request()
+    .then((data) => {
+      if (generation === cacheGeneration) {
+        responseCache.set(key, { data, fetchedAt: Date.now() });
+      }
+      return data;
+    })
+    .finally(() => {
+      if (inFlight.get(key) === promise) {
+        inFlight.delete(key);
+      }
+    });
+  inFlight.set(key, promise);
+  return promise;
+}
+
+/**
+ * Run `request` for `endpoint` through the response cache: GETs are shared
+ * and cached by endpoint, other methods invalidate what they affect once
+ * they finish. Exported for API modules with a fetch wrapper of their own.
+ */
+export function withApiCache<T>(
+  endpoint: string,
+  options: ApiRequestOptions | undefined,
+  request: () => Promise<T>
+): Promise<T> {
+  const owner = JSON.stringify(getAuthHeaders());
+  if (owner !== cacheOwner) {
+    // Logged in as someone else, or out: nothing cached is theirs
+    invalidateApiCache();
+    cacheOwner = owner;
+  }
+
+  if ((options?.method || 'GET').toUpperCase() !== 'GET') {
+    const affected = INVALIDATIONS.filter(([pattern]) => pattern.test(endpoint)).flatMap(([, prefixes]) => prefixes);
+    return request().finally(() => invalidateApiCache(affected.length ? affected : undefined));
+  }
+
+  const policy = cachePolicy(endpoint);
+  const ttl = options?.cacheTtl ?? policy.ttl;
+  const cached = responseCache.get(endpoint);
+  const age = cached ? Date.now() - cached.fetchedAt : Infinity;
+  if (cached && age < ttl) {
+    return Promise.resolve(cached.data as T);
+  }
+  if (cached && ttl > 0 && age < ttl + policy.stale) {
+    fetchShared(endpoint, request).catch(() => undefined);
+    return Promise.resolve(cached.data as T);
+  }
+  return fetchShared(endpoint, request);
+}
+
+/**
+ * Generic API fetch wrapper with auth, timeout, and response unwrapping.
+ * GETs go through the response cache above.
+ */
+export async function apiFetch<T>(endpoint: string, options?: ApiRequestOptions): Promise<T> {
+  return withApiCache(endpoint, options, () => fetchApi<T>(endpoint, options));
 }
 
 /**
- * Generic API fetch wrapper with auth, timeout, and response unwrapping
+ * The request itself, without the cache
  */
-export async function apiFetch<T>(
+async function fetchApi<T>(
   endpoint: string,
   options?: ApiRequestOptions
 ): Promise<T> {
@@ -0,0 +1,8 @@
+// Same keys with Object.is-equal values; the comparators of memoized components
+// use it for object props
+export const shallowEqual = (a: object | undefined, b: object | undefined) => {
+  if (a === b) return true;
+  if (!a || !b) return false;
+  const keys = Object.keys(a);
+  return keys.length === Object.keys(b).length && keys.every((key) => Object.is((a as any)[key], (b as any)[key]));
+};
@@ -0,0 +1,2 @@
+var a="😀";var b=2;
+//# sourceMappingURL=index-abcdefgh.js.map
@@ -0,0 +1,72 @@
+import pytest
+
+from codemods import boardformat
+
+BOARD = {
+    'columns': [
+        {'id': 'todo', 'name': 'To do', 'color': '#3B82F6', 'tasks': [
+            {'id': 't1', 'title': 'Write spec', 'color': '#3B82F6'},
+            {'id': 't2', 'title': 'Review', 'color': '#EF4444'},
+            {'id': 't3', 'title': 'No color'},
+        ]},
+        {'id': 'done', 'name': 'Done', 'color': '#10B981', 'tasks': [
+            {'id': 't4', 'title': 'Ship', 'color': '#10B981'},
+        ]},
+    ],
+    'labels': [{'id': 'l1', 'name': 'Bug', 'color': '#EF4444'}],
+    'views': [{'id': 'all', 'isSystem': True}, {'id': 'mine', 'isSystem': False}],
+    'cardSize': 'medium',
+}
+
+
+def test_encode_leaves_out_derived_fields():
+    stored = boardformat.encode(BOARD)
+
+    assert stored['version'] == boardformat.STORAGE_VERSION
+    assert [column['taskIds'] for column in stored['columns']] == [['t1', 't2', 't3'], ['t4']]
+    assert stored['tasks'] == {
+        't1': {'title': 'Write spec'},
+        't2': {'title': 'Review', 'color': '#EF4444'},
+        't3': {'title': 'No color'},
+        't4': {'title': 'Ship'},
+    }
+    assert stored['views'] == [{'id': 'mine', 'isSystem': False}]
+    assert 'null' not in boardformat.serialize(stored)
+    assert boardformat.validate(stored) == []
+
+
+def test_round_trip():
+    stored = boardformat.encode(BOARD)
+    board = boardformat.decode(stored)
+
+    assert board['columns'][0]['tasks'][2] == {'id': 't3', 'title': 'No color', 'color': '#3B82F6'}
+    assert boardformat._expanded(board) == boardformat._expanded(BOARD)
+
+
+def test_encoding_is_idempotent():
+    stored = boardformat.encode(BOARD)
+    again = boardformat.encode(boardformat.decode(stored))
+
+    assert boardformat.serialize(again) == boardformat.serialize(stored)
+
+
+def test_duplicate_task_ids_are_rejected():
+    board = {'columns': [
+        {'id': 'a', 'name': 'A', 'color': '#000', 'tasks': [{'id': 't1'}]},
+        {'id': 'b', 'name': 'B', 'color': '#fff', 'tasks': [{'id': 't1'}]},
+    ]}
+    with pytest.raises(boardformat.FormatError, match="'t1' is in columns 'a' and 'b'"):
+        boardformat.encode(board)
+
+
+@pytest.mark.parametrize('payload, source', [
+    ({'version': 1, **BOARD}, 'v1'),
+    ({key: BOARD[key] for key in boardformat.LEGACY_FIELDS}, 'legacy'),
+])
+def test_migrates_earlier_formats(payload, source):
+    measurement, stored = boardformat.measure('board', payload, repeat=1)
+
+    assert measurement.source_format == source
+    assert measurement.problems == []
+    assert measurement.sizes['v2'] < measurement.sizes['v1']
+    assert stored == boardformat.encode(BOARD)
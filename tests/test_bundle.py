@@ -0,0 +1,45 @@
+import os
+
+from codemods import bundle
+
+FIXTURE = os.path.join(os.path.dirname(__file__), 'fixtures', 'bundle')
+DIST = os.path.join(FIXTURE, 'dist')
+
+
+def test_attributes_bytes_to_modules_and_packages():
+    result = bundle.analyze(DIST, FIXTURE)
+    chunks = {chunk['name']: chunk for chunk in result['chunks']}
+    script = chunks['assets/index.js']
+
+    assert script['file'] == 'assets/index-abcdefgh.js'
+    assert script['mapped']
+    # `var a="😀";` is 13 bytes but 11 UTF-16 units, where the map starts react
+    assert script['sources'] == {
+        'src/a.ts': 13,
+        'node_modules/react': 9,
+        bundle.UNMAPPED: len('//# sourceMappingURL=index-abcdefgh.js.map\n'),
+    }
+    assert sum(script['sources'].values()) == script['size']
+
+
+def test_files_without_a_map_count_as_dist():
+    result = bundle.analyze(DIST, FIXTURE)
+    chunks = {chunk['name']: chunk for chunk in result['chunks']}
+    style = chunks['assets/style.css']
+
+    assert not style['mapped']
+    assert style['sources'] == {'(dist)/assets/style.css': style['size']}
+    assert result['size'] == sum(chunk['size'] for chunk in result['chunks'])
+
+
+def test_decode_mappings():
+    assert bundle.decode_mappings('AAAA,WCAA;;A') == [[(0, 0), (11, 1)], [], [(0, None)]]
+
+
+def test_compare_reports_changed_sources():
+    old = bundle.analyze(DIST, FIXTURE)
+    new = {**old, 'sources': {**old['sources'], 'src/a.ts': 20}}
+    chunks, sources = bundle.compare(old, new)
+
+    assert chunks == []
+    assert sources == [('src/a.ts', 13, 20)]
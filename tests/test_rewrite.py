@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from codemods.rewrite import Rewriter, compile_sequential, rewrite
+
+
+def chained(text, replacements):
+    counts = []
+    for old, new in replacements:
+        counts.append(text.count(old))
+        text = text.replace(old, new)
+    return text, counts
+
+
+@pytest.mark.parametrize('text, replacements', [
+    ('useState(0); useState(1);', [('useState', 'React.useState')]),
+    # b's replacement creates a match for the next pair
+    ('abc', [('b', 'x'), ('ax', 'y')]),
+    # a deletion joins its neighbours
+    ('a-b', [('-', ''), ('ab', 'c')]),
+    ('aaaa', [('aa', 'a'), ('a', 'b')]),
+    ('<div>{x}</div>', [('div', 'span'), ('{x}', '{y}'), ('span', 'p')]),
+    ('', [('a', 'b')]),
+])
+def test_matches_chained_replace(text, replacements):
+    assert rewrite(text, replacements) == chained(text, replacements)
+
+
+def test_matches_chained_replace_on_random_input():
+    rng = random.Random(7)
+    for _ in range(500):
+        text = ''.join(rng.choice('abc-') for _ in range(rng.randint(0, 30)))
+        replacements = [
+            (''.join(rng.choice('abc-') for _ in range(rng.randint(1, 3))),
+             ''.join(rng.choice('abc-') for _ in range(rng.randint(0, 3))))
+            for _ in range(rng.randint(1, 4))
+        ]
+        assert rewrite(text, replacements) == chained(text, replacements), (text, replacements)
+
+
+def test_round_trip():
+    text = "import React from 'react';\nconst [a, setA] = useState(0);\n"
+    replacements = [("from 'react'", "from 'preact/compat'"), ('useState(0)', 'useState(1)')]
+    changed, counts = rewrite(text, replacements)
+    restored, _ = rewrite(changed, [(new, old) for old, new in reversed(replacements)])
+
+    assert counts == [1, 1]
+    assert restored == text
+
+
+def test_idempotent_once_applied():
+    replacements = [('var ', 'let '), ('==', '===')]
+    once, _ = rewrite('var a = b == c;', [('===', '==')] + replacements)
+    twice, _ = rewrite(once, [('===', '==')] + replacements)
+
+    assert once == 'let a = b === c;'
+    assert twice == once
+
+
+def test_independent_replacements_compile_to_one_stage():
+    stages = compile_sequential([('foo', 'bar'), ('qux', 'quux'), ('zed', 'zap')])
+
+    assert len(stages) == 1
+    assert stages[0].origin == (0, 1, 2)
+
+
+def test_cascading_replacements_start_a_new_stage():
+    stages = compile_sequential([('b', 'x'), ('ax', 'y'), ('z', 'w')])
+
+    assert [stage.origin for stage in stages] == [(0,), (1, 2)]
+
+
+def test_overlap_rules():
+    rewriter = Rewriter([('ab', '1'), ('abc', '2'), ('ab', '3'), ('bc', '4')])
+    text, counts = rewriter.apply('abcab')
+
+    # longest at a position wins, then the first declaration of a string
+    assert text == '21'
+    assert counts == [1, 1, 0, 0]
+    assert rewriter.count('abcab') == [2, 1, 2, 1]
+
+
+def test_empty_search_string_is_rejected():
+    with pytest.raises(ValueError):
+        Rewriter([('', 'x')])
@@ -0,0 +1,89 @@
+import pytest
+
+from codemods.structural import (
+    RegexBudgetExceeded, bounded_subn, delete_block, find_block, replace_between, whole_lines,
+)
+from codemods.tsx import tokenize
+
+SOURCE = '''const Board = () => {
+  const style = { color: "}" };
+  // a stray } in a comment
+  return <div title="{">{`${1}}`}</div>;
+};
+
+useEffect(() => {
+  save();
+}, []);
+
+useEffect(() => {
+  load();
+}, []);
+'''
+
+
+def test_find_block_ignores_brackets_in_strings_comments_and_jsx():
+    begin, end = find_block(SOURCE, 'const Board')
+
+    assert SOURCE[begin:end].endswith('</div>;\n}')
+    assert SOURCE[end:end + 2] == ';\n'
+
+
+def test_find_block_through_and_trailing():
+    # The block starts at `start` but balances the first brace after `through`
+    begin, end = find_block(SOURCE, 'useEffect', through='=>', trailing=', []);')
+
+    assert SOURCE[begin:end] == 'useEffect(() => {\n  save();\n}, []);'
+
+
+def test_find_block_missing_anchor():
+    assert find_block(SOURCE, 'useMemo') is None
+    assert find_block(SOURCE, 'const Board', through='nowhere') is None
+
+
+def test_delete_block_is_idempotent():
+    once, count = delete_block(SOURCE, 'useEffect(() => {', opener='(', trailing=';')
+    twice, again = delete_block(once, 'useEffect(() => {', opener='(', trailing=';')
+
+    assert count == 2
+    assert 'useEffect' not in once
+    assert (twice, again) == (once, 0)
+
+
+def test_replace_between_round_trip():
+    changed, count = replace_between(SOURCE, 'save();', '}, []);', 'save();\n}, [board]);')
+    restored, _ = replace_between(changed, 'save();', '}, [board]);', 'save();\n}, []);')
+
+    assert count == 1
+    assert restored == SOURCE
+
+
+def test_replace_between_is_idempotent():
+    new = 'load();\n}, [project]);'
+    once, _ = replace_between(SOURCE, 'load();', '}, []);', new)
+    twice, count = replace_between(once, 'load();', '}, []);', new)
+
+    assert count == 0
+    assert twice == once
+
+
+@pytest.mark.parametrize('text', ['const a = `abc\\', 'const a = `\\', 'const a = `${b}\\'])
+def test_unterminated_template_ending_in_a_backslash(text):
+    # Malformed input still tokenizes to the end instead of looping
+    tokens = list(tokenize(text))
+
+    assert tokens[-1].kind == 'template'
+    assert tokens[-1].end == len(text)
+
+
+def test_whole_lines():
+    text = 'a\n  block();\nb'
+    start = text.index('block')
+
+    assert whole_lines(text, start, start + len('block();')) == (2, len('a\n  block();\n'))
+    assert whole_lines(text, start, start + len('block')) == (start, start + len('block'))
+
+
+def test_bounded_subn_gives_up():
+    with pytest.raises(RegexBudgetExceeded):
+        bounded_subn(r'(a+)+$', '', 'a' * 40 + 'b', budget=0.1)
+    assert bounded_subn(r'a+', 'x', 'baab', budget=1) == ('bxb', 1)